@@ -0,0 +1,127 @@
+"""
+Compares the binary layer cache with the old indented JSON cache.
+
+Builds a seeded synthetic catalogue shaped like real fetcher output (ArcGIS
+service layers sharing service descriptions and field lists, and unique
+GeoJSON feature records), writes it both ways in a temporary directory and
+prints sizes and save/load times (best of --repeat runs). Exits with an
+error if the binary cache is not at least --min-speedup times faster to
+save and to load than the old JSON cache.
+
+    python benchmarks/cache_size.py [--layers 40000] [--seed 0] [--repeat 3] [--min-speedup 1.5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dsca_explorer import cache  # noqa: E402
+
+WORDS = ("flood hazard zone boundary parcel county state federal emergency shelter road bridge "
+         "river levee storm surge inundation evacuation route hospital school census tract "
+         "wildfire perimeter smoke earthquake fault volcano ash advisory warning watch").split()
+FIELD_TYPES = ("esriFieldTypeString", "esriFieldTypeInteger", "esriFieldTypeDouble", "esriFieldTypeDate")
+
+
+def _text(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+def _service(rng, idx):
+    fields = [{"name": f"{rng.choice(WORDS).upper()}_{i}", "type": rng.choice(FIELD_TYPES),
+               "alias": _text(rng, 2).title(), "length": rng.choice((None, 50, 255))}
+              for i in range(rng.randint(8, 40))]
+    return {"url": f"https://hazards.example.gov/arcgis/rest/services/Svc{idx}/MapServer",
+            "description": _text(rng, rng.randint(40, 200)), "fields": fields}
+
+def synthetic_layers(count, seed=0):
+    """`count` layers: 70% ArcGIS service layers (10-60 per service), 30% unique feature records."""
+    rng = random.Random(seed)
+    layers, services = [], []
+    for i in range(count):
+        if rng.random() < 0.7:
+            if not services or rng.random() < 1 / 30:
+                services.append(_service(rng, len(services)))
+            svc = rng.choice(services[-5:])
+            lyr_id = rng.randint(0, 500)
+            name = f"{_text(rng, 3).title()} {i}"
+            layers.append({
+                "name": name, "type": "MapServer", "endpoint": svc["url"], "formats": "JSON",
+                "properties": {"id": lyr_id, "name": name, "type": "Feature Layer",
+                               "geometryType": "esriGeometryPolygon", "minScale": 0, "maxScale": 0,
+                               "extent": {"xmin": rng.uniform(-180, 0), "ymin": rng.uniform(0, 60),
+                                          "xmax": rng.uniform(0, 180), "ymax": rng.uniform(60, 90)},
+                               "fields": svc["fields"]},
+                "description": svc["description"], "url": f"{svc['url']}/{lyr_id}",
+                "series": name.split()[0], "source": rng.choice(("FEMA", "HIFLD", "EPA")),
+            })
+        else:
+            place = f"{rng.randint(1, 200)} km {rng.choice('NSEW')} of {_text(rng, 2).title()}"
+            url = f"https://earthquake.example.gov/eventpage/ev{i:08d}"
+            props = {"mag": round(rng.uniform(5, 8), 1), "place": place, "time": rng.randint(1.6e12, 1.8e12),
+                     "updated": rng.randint(1.6e12, 1.8e12), "url": url, "felt": rng.randint(0, 5000),
+                     "cdi": round(rng.uniform(0, 9), 1), "alert": rng.choice(("green", "yellow", None)),
+                     "status": "reviewed", "tsunami": rng.randint(0, 1), "sig": rng.randint(0, 2000),
+                     "net": "us", "code": f"{rng.getrandbits(32):08x}", "type": "earthquake",
+                     "title": f"M {rng.uniform(5, 8):.1f} - {place}"}
+            layers.append({"name": place, "type": "USGS Earthquake", "endpoint": url, "formats": "GeoJSON",
+                           "properties": props, "description": props["title"], "url": url,
+                           "series": "Earthquakes", "source": "USGS"})
+    return {cache.layer_key(layer): layer for layer in layers}
+
+def _timed(fn, repeat=1):
+    """fn()'s result and its best wall time over `repeat` runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--layers", type=int, default=40000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-speedup", type=float, default=1.5)
+    args = parser.parse_args()
+    layers = synthetic_layers(args.layers, args.seed)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # lock and side files land here too
+        cache.CACHE_FILE = Path(tmp) / "dsca_layer_cache.bin"
+        legacy = Path(tmp) / "dsca_layer_cache.json"
+
+        def save_legacy():
+            with open(legacy, "w") as f:
+                json.dump(layers, f, indent=2)
+
+        def load_legacy():
+            with open(legacy) as f:
+                return json.load(f)
+
+        _, legacy_save = _timed(save_legacy, args.repeat)
+        _, legacy_load = _timed(load_legacy, args.repeat)
+        _, bin_save = _timed(lambda: cache.save_cache(layers), args.repeat)
+        loaded, bin_load = _timed(lambda: dict(cache.load_cached_data()), args.repeat)
+        assert loaded == layers, "binary cache did not round-trip"
+        old, new = legacy.stat().st_size, cache.CACHE_FILE.stat().st_size
+        os.chdir(cwd)
+    save_speedup, load_speedup = legacy_save / bin_save, legacy_load / bin_load
+    print(f"{len(layers):,} layers")
+    print(f"  old JSON  {old / 1e6:8.1f} MB  save {legacy_save:.2f}s  load {legacy_load:.2f}s")
+    print(f"  binary    {new / 1e6:8.1f} MB  save {bin_save:.2f}s  load {bin_load:.2f}s")
+    print(f"  {old / new:.1f}x smaller, save {save_speedup:.1f}x faster, load {load_speedup:.1f}x faster")
+    if min(save_speedup, load_speedup) < args.min_speedup:
+        sys.exit(f"binary cache is less than {args.min_speedup}x faster than the old JSON cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+================================================================================
+DSCA Explorer Attribute Sampling Module - Change Log
+================================================================================
+
+NEW:
+----
+- Moved ensure_url_scheme, robust_get and query_feature_attributes here from
+  export.py (export.py still re-exports them).
+- Added sample_feature_attributes, which samples many endpoints concurrently:
+    - Requests fan out over a thread pool, with at most
+      ATTRIBUTE_HOST_CONCURRENCY requests in flight per host.
+    - Each worker thread reuses its own requests.Session.
+    - Endpoints of the same service layer share one request.
+- Added a persistent TTL cache (dsca_attribute_cache.json) keyed by
+  service/layer id. It is written atomically under a FileLock and merged
+  with what other processes wrote.
+- Added prefetch_feature_attributes, which warms the cache in a background
+  thread after a fetch so exports only wait on file writing.
+- Added read_attribute_entries / merge_attribute_entries so snapshot bundles
+  can carry cache entries with their original fetch times.
+
+================================================================================
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+
+from .fetchers.utils import get_optimal_workers
+from .storage import FileLock, atomic_write
+
+# Suppress only if verify=False is used
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+ATTRIBUTE_CACHE_FILE = Path("dsca_attribute_cache.json")
+ATTRIBUTE_CACHE_TTL = 24 * 3600  # seconds
+ATTRIBUTE_HOST_CONCURRENCY = 4
+
+_thread_state = threading.local()
+_host_limits: Dict[str, threading.BoundedSemaphore] = {}
+_host_limits_guard = threading.Lock()
+
+
+def ensure_url_scheme(endpoint):
+    """Ensure the endpoint starts with http(s)://"""
+    if not endpoint:
+        return ""
+    if endpoint.startswith("http://") or endpoint.startswith("https://"):
+        return endpoint
+    return "https://" + endpoint.lstrip("/")
+
+def robust_get(url, params=None, timeout=15, session=None):
+    """Try to fetch with SSL verification, fallback to verify=False if needed."""
+    getter = session.get if session is not None else requests.get
+    try:
+        return getter(url, params=params, timeout=timeout)
+    except requests.exceptions.SSLError:
+        print(f"SSL error for {url}, retrying without verification (not secure)...")
+        return getter(url, params=params, timeout=timeout, verify=False)
+    except Exception as e:
+        print(f"Request error for {url}: {e}")
+        return None
+
+def attribute_key(endpoint) -> Optional[Tuple[str, str]]:
+    """Returns (service_root, layer_id) for an endpoint, or None if it is empty."""
+    endpoint = ensure_url_scheme(endpoint)
+    if not endpoint:
+        return None
+    match = re.search(r'(.*(?:MapServer|FeatureServer))/(\d+)', endpoint)
+    if match:
+        return match.group(1), match.group(2)
+    # If not found, try to use as is
+    return endpoint, "0"
+
+def _fields_to_attributes(data):
+    return {f["name"]: f.get("alias", f["name"]) for f in data["fields"]}
+
+def _query_attributes(service_root, layer_id, session=None) -> Optional[dict]:
+    """
+    Samples one feature's attributes from an ArcGIS layer, falling back to its
+    field list. Returns None if a request failed, returned an error or could
+    not be decoded (so the result is not cached), or {} if the service
+    answered without attributes.
+    """
+    query_url = f"{service_root}/{layer_id}/query"
+    params = {
+        "where": "1=1",
+        "outFields": "*",
+        "returnGeometry": "false",
+        "resultRecordCount": 1,
+        "f": "json"
+    }
+    try:
+        resp = robust_get(query_url, params=params, session=session)
+        if resp is None:
+            return None
+        if resp.status_code == 200:
+            data = resp.json()
+            if "features" in data and data["features"]:
+                attrs = data["features"][0].get("attributes", {})
+                if attrs:
+                    return attrs
+            # Fallback to fields if no features
+            if "fields" in data:
+                return _fields_to_attributes(data)
+        # Fallback: try to get fields from layer metadata
+        layer_url = f"{service_root}/{layer_id}"
+        resp = robust_get(layer_url, params={"f": "json"}, session=session)
+        if resp is None:
+            return None
+        if resp.status_code != 200:
+            return None
+        data = resp.json()
+        if "fields" in data:
+            return _fields_to_attributes(data)
+        # ArcGIS reports errors as a 200 response with an "error" object
+        return None if "error" in data else {}
+    except Exception as e:
+        print(f"Error querying features: {e}")
+        return None
+
+def query_feature_attributes(endpoint):
+    """Query an ArcGIS endpoint to get actual feature attributes."""
+    key = attribute_key(endpoint)
+    if not key:
+        return {}
+    return _query_attributes(*key) or {}
+
+# --- Persistent TTL cache ---
+
+def _cache_id(key: Tuple[str, str]) -> str:
+    return f"{key[0]}/{key[1]}"
+
+def read_attribute_entries() -> Dict[str, dict]:
+    """Returns the raw cache entries ({service/layer id: {"fetched", "attributes"}})."""
+    if not ATTRIBUTE_CACHE_FILE.exists():
+        return {}
+    try:
+        with open(ATTRIBUTE_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: could not read attribute cache {ATTRIBUTE_CACHE_FILE}: {e}")
+        return {}
+
+def load_attribute_cache(ttl: float = ATTRIBUTE_CACHE_TTL) -> Dict[str, dict]:
+    """Returns {service/layer id: attributes} for entries younger than ttl."""
+    entries = read_attribute_entries()
+    cutoff = time.time() - ttl
+    return {k: v["attributes"] for k, v in entries.items() if v.get("fetched", 0) >= cutoff}
+
+def merge_attribute_entries(entries: Dict[str, dict]):
+    """Merges raw cache entries into the attribute cache file; the newer fetch wins."""
+    if not entries:
+        return
+    with FileLock(ATTRIBUTE_CACHE_FILE):
+        merged = read_attribute_entries()
+        cutoff = time.time() - ATTRIBUTE_CACHE_TTL
+        for cache_id, entry in entries.items():
+            if entry.get("fetched", 0) > merged.get(cache_id, {}).get("fetched", 0):
+                merged[cache_id] = entry
+        merged = {k: v for k, v in merged.items() if v.get("fetched", 0) >= cutoff}
+        with atomic_write(ATTRIBUTE_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(merged, f, separators=(",", ":"), ensure_ascii=False)
+
+def save_attribute_samples(samples: Dict[str, dict]):
+    """Merges new samples into the attribute cache file, dropping expired entries."""
+    if not samples:
+        return
+    now = time.time()
+    with FileLock(ATTRIBUTE_CACHE_FILE):
+        entries = read_attribute_entries()
+        cutoff = now - ATTRIBUTE_CACHE_TTL
+        entries = {k: v for k, v in entries.items() if v.get("fetched", 0) >= cutoff}
+        for cache_id, attrs in samples.items():
+            entries[cache_id] = {"fetched": now, "attributes": attrs}
+        with atomic_write(ATTRIBUTE_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(entries, f, separators=(",", ":"), ensure_ascii=False)
+
+# --- Concurrent sampling ---
+
+def _session():
+    session = getattr(_thread_state, "session", None)
+    if session is None:
+        session = _thread_state.session = requests.Session()
+    return session
+
+def _host_limit(url) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc
+    with _host_limits_guard:
+        limit = _host_limits.get(host)
+        if limit is None:
+            limit = _host_limits[host] = threading.BoundedSemaphore(ATTRIBUTE_HOST_CONCURRENCY)
+        return limit
+
+def _sample_one(key):
+    with _host_limit(key[0]):
+        return _query_attributes(key[0], key[1], session=_session())
+
+def sample_feature_attributes(
+    endpoints: Iterable[str],
+    max_workers: Optional[int] = None,
+    ttl: float = ATTRIBUTE_CACHE_TTL,
+    progress_cb=None,
+    cancel=None,
+) -> Dict[str, dict]:
+    """
+    Samples feature attributes for many endpoints at once.
+    Returns {endpoint: attributes}; endpoints that cannot be sampled map to {}.
+    Cached samples younger than ttl are reused and new ones are persisted.
+    If the `cancel` event is set, pending requests are dropped and the
+    samples gathered so far are returned.
+    """
+    keys = {}
+    for endpoint in endpoints:
+        if endpoint and endpoint not in keys:
+            keys[endpoint] = attribute_key(endpoint)
+    cached = load_attribute_cache(ttl)
+    samples = {}
+    missing = set()
+    for key in keys.values():
+        if key is None:
+            continue
+        cache_id = _cache_id(key)
+        if cache_id in cached:
+            samples[cache_id] = cached[cache_id]
+        else:
+            missing.add(key)
+
+    fetched = {}
+    if missing:
+        total = len(missing)
+        with ThreadPoolExecutor(max_workers=max_workers or get_optimal_workers()) as executor:
+            futures = {executor.submit(_sample_one, key): key for key in missing}
+            for idx, future in enumerate(as_completed(futures)):
+                if cancel is not None and cancel.is_set():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                attrs = future.result()
+                cache_id = _cache_id(futures[future])
+                samples[cache_id] = attrs or {}
+                if attrs is not None:
+                    fetched[cache_id] = attrs
+                if progress_cb:
+                    progress_cb(int(((idx+1)/total)*100), f"Attributes: {idx+1}/{total} layers")
+        try:
+            save_attribute_samples(fetched)
+        except Exception as e:
+            print(f"Warning: could not save attribute cache: {e}")
+
+    return {endpoint: samples.get(_cache_id(key), {}) if key else {} for endpoint, key in keys.items()}
+
+def prefetch_feature_attributes(layers, progress_cb=None) -> threading.Thread:
+    """
+    Warms the attribute cache for the ArcGIS service layers among `layers` in a
+    background thread, so a later export finds its samples already cached.
+    """
+    endpoints = [
+        l.get("endpoint", "") for l in layers
+        if "/MapServer" in l.get("endpoint", "") or "/FeatureServer" in l.get("endpoint", "")
+    ]
+    thread = threading.Thread(
+        target=sample_feature_attributes, args=(endpoints,), kwargs={"progress_cb": progress_cb}, daemon=True
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,258 @@
+"""
+================================================================================
+DSCA Explorer Snapshot Bundle Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added export_bundle / import_bundle, which move a node's warm state to
+  another node in one file: the layer cache, the change journal, the
+  attribute-sample cache and the derived-field cache.
+    - A bundle is a zip archive with a manifest. Every member is listed with
+      its SHA-256 and size, and import verifies all of them before touching
+      any local file.
+    - Snapshots are identified by snapshot_id, a digest over the cache's
+      (layer key, content digest) pairs, so nodes holding the same layers
+      agree on the id without coordinating.
+    - A full bundle carries the binary layer cache as-is (it is already
+      compressed); importing it replaces the local cache atomically.
+    - A delta bundle is built against a previous bundle and carries only the
+      layers added or changed since then, the removed keys, and journal and
+      attribute entries newer than the base. Importing it requires the local
+      cache to be at the base snapshot and checks that the result matches
+      the delta's snapshot id.
+    - Import checks the base, applies the layers and checks the resulting
+      snapshot id under one cache_lock(). The result is verified before the
+      cache file is replaced: a delta's resulting (key, digest) table is
+      computed up front, and a full bundle's cache is checked as a temp file.
+      A mismatch leaves the local cache untouched.
+    - Journal entries already in the local journal (same layer_id,
+      change_type and detection_time) are not appended again.
+    - Bundles carry the source status file (last refresh per source). A full
+      import replaces the local one; a delta keeps the newer time per source.
+
+================================================================================
+"""
+
+import hashlib
+import json
+import shutil
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from .attributes import merge_attribute_entries, read_attribute_entries
+from .cache import (CACHE_FILE, append_change_journal, apply_cache_delta, cache_lock, layer_digest,
+                    load_source_status, open_cache, read_change_journal, save_source_status)
+from .derived import load_derived_cache, save_derived_fields
+from .storage import atomic_write
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+_COPY_CHUNK = 1 << 20
+
+
+class BundleError(ValueError):
+    """Raised when a bundle is malformed, fails its checksums or does not fit the local cache."""
+
+
+def cache_table(index=None) -> Dict[str, str]:
+    """{layer key: content digest} for every cached layer."""
+    index = index if index is not None else open_cache()
+    table = {}
+    for source in index.sources():
+        table.update(zip(index.source_keys(source), index.source_digests(source)))
+    return table
+
+def snapshot_id(table: Dict[str, str]) -> str:
+    """Identifies a cache state by its (layer key, content digest) pairs."""
+    h = hashlib.blake2b(digest_size=16)
+    for key in sorted(table):
+        h.update(key.encode("utf-8"))
+        h.update(b"\0")
+        h.update(table[key].encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+# --- Writing ---
+
+def _sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_COPY_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class _BundleWriter:
+    def __init__(self, zf: zipfile.ZipFile):
+        self.zf = zf
+        self.files: Dict[str, dict] = {}
+
+    def add_bytes(self, name: str, data: bytes, compress: bool = True):
+        self.zf.writestr(name, data, zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+        self.files[name] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+    def add_json(self, name: str, value):
+        self.add_bytes(name, _ENCODER.encode(value).encode("utf-8"))
+
+    def add_file(self, name: str, path: Path, compress: bool = True):
+        self.zf.write(path, name, zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+        self.files[name] = {"sha256": _sha256_file(path), "size": path.stat().st_size}
+
+def _journal_lines(since: Optional[str] = None) -> bytes:
+    entries = read_change_journal()
+    if since is not None:
+        entries = (e for e in entries if e.get("detection_time", "") > since)
+    return "".join(_ENCODER.encode(e) + "\n" for e in entries).encode("utf-8")
+
+def export_bundle(output_path, base=None) -> dict:
+    """
+    Writes a snapshot bundle and returns its manifest. With `base` (the path
+    of an earlier bundle) a delta against that bundle's snapshot is written.
+    The cache is read under cache_lock() so the bundle is consistent.
+    """
+    output_path = Path(output_path)
+    base_manifest = base_table = None
+    if base is not None:
+        with zipfile.ZipFile(base) as zf:
+            base_manifest = _read_manifest(zf)
+            base_table = _read_json(zf, base_manifest, "index.json")
+
+    created = datetime.utcnow().isoformat()
+    with cache_lock():
+        index = open_cache(strict=True)
+        table = cache_table(index)
+        if not table:
+            raise BundleError("The layer cache is empty; fetch layers before exporting a bundle")
+        manifest = {
+            "format": BUNDLE_FORMAT_VERSION,
+            "kind": "full" if base is None else "delta",
+            "snapshot_id": snapshot_id(table),
+            "created": created,
+            "layers": len(table),
+        }
+        with atomic_write(output_path, "wb") as f, zipfile.ZipFile(f, "w") as zf:
+            writer = _BundleWriter(zf)
+            writer.add_json("index.json", table)
+            derived = load_derived_cache()
+            attributes = read_attribute_entries()
+            if base is None:
+                # The binary cache is already zlib-compressed
+                writer.add_file("layer_cache.bin", CACHE_FILE, compress=False)
+                writer.add_bytes("journal.jsonl", _journal_lines())
+                writer.add_json("derived.json", {d: derived[d] for d in set(table.values()) if d in derived})
+            else:
+                manifest["base_id"] = base_manifest["snapshot_id"]
+                changed = [key for key, digest in table.items() if base_table.get(key) != digest]
+                writer.add_json("layers.json", {key: index[key] for key in changed})
+                writer.add_json("removed.json", sorted(set(base_table) - set(table)))
+                writer.add_bytes("journal.jsonl", _journal_lines(since=base_manifest["created"]))
+                digests = {table[key] for key in changed}
+                writer.add_json("derived.json", {d: derived[d] for d in digests if d in derived})
+                # "created" is naive UTC, like journal detection times
+                since = datetime.fromisoformat(base_manifest["created"]).replace(tzinfo=timezone.utc).timestamp()
+                attributes = {k: v for k, v in attributes.items() if v.get("fetched", 0) > since}
+            writer.add_json("attributes.json", attributes)
+            writer.add_json("source_status.json", load_source_status())
+            manifest["files"] = writer.files
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2), zipfile.ZIP_DEFLATED)
+    return manifest
+
+# --- Reading ---
+
+def _read_manifest(zf: zipfile.ZipFile) -> dict:
+    try:
+        manifest = json.loads(zf.read(MANIFEST_NAME))
+    except KeyError:
+        raise BundleError("Not a DSCA snapshot bundle (no manifest)")
+    if manifest.get("format") != BUNDLE_FORMAT_VERSION:
+        raise BundleError(f"Unsupported bundle format: {manifest.get('format')}")
+    return manifest
+
+def _read_member(zf: zipfile.ZipFile, manifest: dict, name: str) -> bytes:
+    data = zf.read(name)
+    if hashlib.sha256(data).hexdigest() != manifest["files"][name]["sha256"]:
+        raise BundleError(f"Checksum mismatch for {name}")
+    return data
+
+def _read_json(zf: zipfile.ZipFile, manifest: dict, name: str):
+    return json.loads(_read_member(zf, manifest, name))
+
+def verify_bundle(path) -> dict:
+    """Checks every member against the manifest; returns the manifest."""
+    with zipfile.ZipFile(path) as zf:
+        manifest = _read_manifest(zf)
+        for name, meta in manifest["files"].items():
+            h = hashlib.sha256()
+            with zf.open(name) as member:
+                for chunk in iter(lambda: member.read(_COPY_CHUNK), b""):
+                    h.update(chunk)
+            if h.hexdigest() != meta["sha256"]:
+                raise BundleError(f"Checksum mismatch for {name}")
+    return manifest
+
+def _journal_id(entry: dict) -> tuple:
+    return entry.get("layer_id"), entry.get("change_type"), entry.get("detection_time")
+
+def _merge_side_caches(zf: zipfile.ZipFile, manifest: dict):
+    journal = _read_member(zf, manifest, "journal.jsonl").decode("utf-8")
+    entries = [json.loads(line) for line in journal.splitlines() if line.strip()]
+    with cache_lock():
+        if entries:
+            seen = {_journal_id(e) for e in read_change_journal()}
+            new = []
+            for entry in entries:
+                if _journal_id(entry) not in seen:
+                    seen.add(_journal_id(entry))
+                    new.append(entry)
+            append_change_journal(new)
+        # Bundles written before the status file was included carry none
+        status = _read_json(zf, manifest, "source_status.json") if "source_status.json" in manifest["files"] else {}
+        if manifest["kind"] == "full":
+            save_source_status(status)
+        elif status:
+            merged = load_source_status()
+            for source, refreshed in status.items():
+                merged[source] = max(refreshed, merged.get(source, ""))
+            save_source_status(merged)
+    merge_attribute_entries(_read_json(zf, manifest, "attributes.json"))
+    save_derived_fields(_read_json(zf, manifest, "derived.json"))
+
+def import_bundle(path, force: bool = False) -> dict:
+    """
+    Verifies and applies a snapshot bundle; returns its manifest.
+    A full bundle replaces the local layer cache. A delta bundle is applied
+    on top of it and requires the local snapshot to be the delta's base
+    (unless `force`). Either way the result must match the bundle's snapshot
+    id (unless `force`), which is checked before the local cache is changed.
+    """
+    manifest = verify_bundle(path)
+
+    def check_result(table):
+        result_id = snapshot_id(table)
+        if result_id != manifest["snapshot_id"] and not force:
+            raise BundleError(f"Imported cache would be snapshot {result_id}, expected {manifest['snapshot_id']}")
+
+    with zipfile.ZipFile(path) as zf, cache_lock():
+        if manifest["kind"] == "full":
+            with zf.open("layer_cache.bin") as src, \
+                    atomic_write(CACHE_FILE, "wb", check=lambda tmp: check_result(cache_table(open_cache(tmp, strict=True)))) as dst:
+                shutil.copyfileobj(src, dst, _COPY_CHUNK)
+        else:
+            table = cache_table(open_cache(strict=True))
+            local_id = snapshot_id(table)
+            if local_id != manifest["base_id"] and not force:
+                raise BundleError(
+                    f"Delta bundle is based on snapshot {manifest['base_id']}, but the local cache is {local_id}"
+                )
+            upserts = _read_json(zf, manifest, "layers.json")
+            removed = _read_json(zf, manifest, "removed.json")
+            for key in removed:
+                table.pop(key, None)
+            table.update((key, layer_digest(layer)) for key, layer in upserts.items())
+            check_result(table)
+            apply_cache_delta(upserts, removed)
+        _merge_side_caches(zf, manifest)
+    return manifest
@@ -25,18 +25,123 @@ AFTER:
   entries (e.g., if old cache stored hashes as strings instead of dicts).
 - Ready for integration with export and CLI modules.
 
+UPDATED (v0.4.0):
+-----------------
+- Cache is now a compact binary file (dsca_layer_cache.bin): a versioned
+  header followed by one zlib-compressed frame of compact JSON per source.
+  Frames are written and read as streams and can be decoded independently.
+- The legacy pretty-printed JSON cache is still read (and migrated on the
+  next save) when no binary cache exists yet.
+- Cache writes go to a temp file that is atomically renamed into place, under
+  an advisory inter-process lock (cache_lock) with a timeout.
+- detect_new_or_updated_layers now does read-merge-write: only the sources
+  being refreshed are replaced, other sources' frames are carried over as-is.
+- Format v2 de-duplicates repeated values by content: each frame stores large
+  repeated values (descriptions, property blocks, duplicated dicts) once in a
+  blob table and layers reference them by index. On load, every reference to
+  the same blob resolves to one shared object, so memory tracks unique content
+  as well. Loaded layer values may therefore be shared and must be treated
+  read-only.
+- Format v3 adds a trailing index (layer key -> frame, block and content
+  digest). open_cache() reads only the index and returns a CacheIndex whose
+  layer bodies are decoded one block at a time on first access.
+- detect_new_or_updated_layers compares content digests against the index
+  and only reads cached bodies for layers whose digest changed.
+- Layers that disappear from a refreshed source are reported as REMOVED.
+- Added a bulk diff mode (automatic above BULK_DIFF_THRESHOLD layers) that
+  diffs key/digest tables with the columnar engine in diff.py.
+- Layer digests are now hashes of each layer's compact JSON, and only sources
+  with changes are re-encoded (optionally one process per source); unchanged
+  sources are copied raw.
+- Every detection appends compact entries to a change journal
+  (dsca_change_journal.jsonl): source, layer_id, change_type, detection time,
+  the layer's content digest and, for updates, the changed field names.
+- Added apply_cache_delta, which upserts/removes layers by key and
+  re-encodes only the sources they touch (used by snapshot bundle import).
+- Every detection records when each refreshed source was last fetched
+  (dsca_source_status.json, read with load_source_status), whether or not it
+  changed, so readers of the cache can tell how stale each source is.
+- Cache JSON is encoded and decoded with orjson (the json module remains the
+  fallback for values orjson rejects), and interning reduces each shared
+  object once per frame instead of once per layer referencing it. On load,
+  blob references are resolved in place and only within the levels where
+  they can occur, and whole blocks are decoded per source. Saving and
+  loading are several times faster than the old JSON cache (see
+  benchmarks/cache_size.py). The file format is unchanged.
+- Writers open the cache strictly: detect_new_or_updated_layers and
+  apply_cache_delta raise CacheCorruptError for an unreadable cache instead of
+  diffing against (and then merge-writing over) an empty one, which reported
+  every layer as NEW and dropped every other source. quarantine_cache() moves
+  the unreadable file aside so the next detection rebuilds the cache; readers
+  (open_cache(), load_cached_data) still see an unreadable cache as empty.
+
 ================================================================================
 """
 
 
 
+import hashlib
 import json
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import Dict, Tuple, Any, List, Literal
+from typing import Dict, Tuple, Any, List, Literal, Iterable, Iterator, Optional
 from datetime import datetime
 
-CACHE_FILE = Path("dsca_layer_cache.json")
+import orjson
+
+from .storage import FileLock, atomic_write
+
+CACHE_FILE = Path("dsca_layer_cache.bin")
+CHANGE_JOURNAL_FILE = Path("dsca_change_journal.jsonl")
+SOURCE_STATUS_FILE = Path("dsca_source_status.json")
+LEGACY_CACHE_FILE = Path("dsca_layer_cache.json")
+
+# Binary cache layout (all integers big-endian):
+#   header: MAGIC | u8 format version
+#   frame:  u16 name length | name (utf-8) | u64 payload length | payload
+#   index:  zlib stream of compact JSON {"frames": [frame entry, ...]}
+#   footer: u64 index offset | u64 index length | FOOTER_MAGIC
+# There is one frame per source. A frame payload is a run of independent zlib
+# streams of compact JSON: body blocks of up to CACHE_BLOCK_LAYERS layers
+# ({layer_key: layer}), then the frame's blob table ([[digest, value], ...]).
+# Any value inside a layer or blob may be replaced by {_REF_KEY: blob index};
+# only values that repeat within the frame become blobs, and the digest is a
+# content hash used to share one in-memory object across frames.
+# A frame entry in the index holds the frame's absolute offset and size, the
+# relative [offset, size] of each block and of the blob table, and the frame's
+# layer keys and content digests in block order.
+CACHE_MAGIC = b"DSCACACHE"
+CACHE_FORMAT_VERSION = 3
+COMPRESSION_LEVEL = 6
+CACHE_BLOCK_LAYERS = 256
+# Decoded body blocks kept in memory per CacheIndex.
+CACHE_BLOCK_LRU = 16
+_HEADER = struct.Struct(">B")
+_FRAME_NAME = struct.Struct(">H")
+_FRAME_SIZE = struct.Struct(">Q")
+_FOOTER = struct.Struct(">QQ")
+_FOOTER_MAGIC = b"DSCAIDX"
+_CHUNK_SIZE = 1 << 16
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+# Values whose compact JSON is at least this long are stored once per frame.
+INTERN_MIN_SIZE = 64
+# Layer fields are depth 1; values nested deeper than this are kept inline
+# inside their parent blob rather than interned on their own.
+INTERN_MAX_DEPTH = 2
+_REF_KEY = "\x00ref"
+
+# Refreshes with at least this many layers use the columnar bulk diff (diff.py).
+BULK_DIFF_THRESHOLD = 50_000
+
+# Seconds a writer waits for another process to finish updating the cache.
+CACHE_LOCK_TIMEOUT = 30.0
 
 """
 Changelog - 26MAY25
@@ -63,7 +168,7 @@ Includes a utility to serialize changes for export.
 class ChangeRecord:
     source: str
     layer_id: str
-    change_type: Literal["NEW", "UPDATED"]
+    change_type: Literal["NEW", "UPDATED", "REMOVED"]
     changed_fields: Dict[str, Tuple[Any, Any]]
     detection_time: datetime
 
@@ -72,18 +177,559 @@ class ChangeRecord:
         d["detection_time"] = self.detection_time.isoformat()
         return d
 
-def load_cached_data() -> Dict[str, dict]:
-    if CACHE_FILE.exists():
+class CacheFormatError(ValueError):
+    """Raised when a cache file is truncated or was written by an unknown format."""
+
+class CacheChangedError(CacheFormatError):
+    """Raised when a CacheIndex reads a body after the cache file was replaced."""
+
+class CacheCorruptError(CacheFormatError):
+    """Raised when the cache on disk cannot be read where an empty view would lose data; see quarantine_cache()."""
+
+
+def _layer_source(key: str, layer) -> str:
+    if isinstance(layer, dict) and layer.get("source"):
+        return layer["source"]
+    return key.split("|", 1)[0]
+
+def _group_by_source(cache: Dict[str, dict]) -> Dict[str, Dict[str, dict]]:
+    frames: Dict[str, Dict[str, dict]] = {}
+    for key, layer in cache.items():
+        frames.setdefault(_layer_source(key, layer), {})[key] = layer
+    return frames
+
+class _Ref:
+    __slots__ = ("digest",)
+
+    def __init__(self, digest: str):
+        self.digest = digest
+
+def _content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+def _dumps(value, default=None) -> bytes:
+    """
+    Compact UTF-8 JSON via orjson. Values orjson rejects (ints beyond 64 bits,
+    unknown types) fall back to the json module. orjson writes NaN and
+    infinities as null.
+    """
+    try:
+        return orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        encoder = _ENCODER if default is None else json.JSONEncoder(
+            separators=(",", ":"), ensure_ascii=False, default=default)
+        return encoder.encode(value).encode("utf-8")
+
+def _loads(data: bytes):
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity literals, which the json module writes but orjson does not read
+        return json.loads(data)
+
+def _ref_digest_json(ref: "_Ref"):
+    # Used only to compute content digests of values whose children are _Refs.
+    return {_REF_KEY: ref.digest}
+
+def _internable(value) -> bool:
+    cls = type(value)
+    return cls is dict or cls is list or (cls is str and len(value) >= INTERN_MIN_SIZE)
+
+class _Interner:
+    """
+    Content-addressed store for one frame. reduce() replaces every large value
+    with a _Ref to its content digest and counts repeats; dumps() then writes
+    values seen more than once as small numbered references and inlines the
+    rest, so unique values cost nothing extra.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.counts: Dict[str, int] = {}
+        self.ids: Dict[str, int] = {}
+        self.order: List[str] = []
+        # (id(value), depth) -> reduced value. Fetchers and cache loads share
+        # one object between many layers, so each is reduced (and encoded)
+        # once. Only valid while the reduced layers are alive; see done().
+        self._seen: Dict[Tuple[int, int], Any] = {}
+
+    def done(self):
+        """Drops the per-object memo once every layer of the frame is reduced."""
+        self._seen = {}
+
+    def reduce(self, value, depth: int = 1):
+        seen = self._seen.get((id(value), depth))
+        if seen is not None:
+            if type(seen) is _Ref:
+                self.counts[seen.digest] += 1
+            return seen
+        reduced = self._seen[(id(value), depth)] = self._reduce(value, depth)
+        return reduced
+
+    def _reduce(self, value, depth: int):
+        if depth >= INTERN_MAX_DEPTH:
+            nested = False
+        else:
+            nested = True
+            depth += 1
+        if isinstance(value, dict):
+            reduced = {k: self.reduce(v, depth) if nested and _internable(v) else v for k, v in value.items()}
+        elif isinstance(value, list):
+            reduced = [self.reduce(v, depth) if nested and _internable(v) else v for v in value]
+        elif _internable(value):
+            reduced = value
+        else:
+            return value
+        # Children are already reduced to refs, so each level encodes only a little.
+        # Containers encode to "{..." / "[...", so a '"' prefix keeps strings distinct.
+        text = b'"' + reduced.encode("utf-8") if isinstance(reduced, str) else _dumps(reduced, _ref_digest_json)
+        if len(text) < INTERN_MIN_SIZE:
+            return reduced
+        digest = _content_digest(text)
+        if digest in self.counts:
+            self.counts[digest] += 1
+        else:
+            self.counts[digest] = 1
+            self.values[digest] = reduced
+        return _Ref(digest)
+
+    def reduce_layer(self, layer):
+        if isinstance(layer, dict):
+            return {k: self.reduce(v) if _internable(v) else v for k, v in layer.items()}
+        return layer
+
+    def _ref_json(self, ref: _Ref):
+        """orjson default: a repeated blob as a numbered reference, a unique one inline."""
+        if self.counts[ref.digest] < 2:
+            return self.values[ref.digest]
+        blob_id = self.ids.get(ref.digest)
+        if blob_id is None:
+            blob_id = self.ids[ref.digest] = len(self.order)
+            self.order.append(ref.digest)
+        return {_REF_KEY: blob_id}
+
+    def dumps(self, value) -> bytes:
+        """Compact JSON of a reduced value, referencing repeated blobs by index."""
+        return _dumps(value, self._ref_json)
+
+def layer_digest(layer: dict) -> str:
+    """Content digest of a layer's compact JSON, as stored in the cache index."""
+    return _content_digest(_dumps(layer))
+
+def _resolve(value, blobs: List[Any], resolved: Dict[str, Any], levels: int = INTERN_MAX_DEPTH):
+    """
+    Expands blob references in a decoded value, in place. Blobs are resolved
+    by content digest, so every reference to the same content (in this frame
+    or any frame decoded with the same `resolved` dict) yields the same object.
+    References only occur in a layer's fields and their direct children
+    (INTERN_MAX_DEPTH levels, see _Interner), so `levels` bounds the walk and
+    the bulk of nested values is never visited.
+    """
+    cls = type(value)
+    if cls is dict:
+        if len(value) == 1 and _REF_KEY in value:
+            blob_id = value[_REF_KEY]
+            if not 0 <= blob_id < len(blobs):
+                raise CacheFormatError(f"Missing cache blob {blob_id}")
+            digest, raw = blobs[blob_id]
+            obj = resolved.get(digest)
+            if obj is None:
+                obj = resolved[digest] = _resolve(raw, blobs, resolved, levels)
+            return obj
+        if levels > 1:
+            for k, v in value.items():
+                if type(v) is dict or type(v) is list:
+                    value[k] = _resolve(v, blobs, resolved, levels - 1)
+    elif cls is list and levels > 1:
+        for i, v in enumerate(value):
+            if type(v) is dict or type(v) is list:
+                value[i] = _resolve(v, blobs, resolved, levels - 1)
+    return value
+
+def _resolve_block(block: Dict[str, Any], blobs: List[Any], resolved: Dict[str, Any]) -> Dict[str, Any]:
+    for layer in block.values():
+        if type(layer) is dict:
+            for k, v in layer.items():
+                if type(v) is dict or type(v) is list:
+                    layer[k] = _resolve(v, blobs, resolved)
+    return block
+
+def layer_key(layer: dict) -> str:
+    """Stable cache key of a layer: source|endpoint|name."""
+    return f"{layer.get('source','')}|{layer.get('endpoint','')}|{layer.get('name','')}"
+
+class _PreparedFrame:
+    """One source's layers reduced for writing, with their content digests."""
+
+    def __init__(self, layers: Dict[str, dict], digests: Optional[Dict[str, str]] = None):
+        self.interner = _Interner()
+        self.keys = list(layers)
+        self.reduced = [self.interner.reduce_layer(layers[key]) for key in self.keys]
+        self.interner.done()
+        if digests is None:
+            self.digests = [layer_digest(layers[key]) for key in self.keys]
+        else:
+            self.digests = [digests[key] for key in self.keys]
+
+def _write_stream(f, base: int, pieces: Iterable[bytes]) -> List[int]:
+    """Compresses JSON pieces (UTF-8 bytes) into one zlib stream; returns [offset - base, size]."""
+    start = f.tell()
+    compressor = zlib.compressobj(COMPRESSION_LEVEL)
+    buf = []
+    buffered = 0
+    for piece in pieces:
+        buf.append(piece)
+        buffered += len(piece)
+        if buffered >= _CHUNK_SIZE:
+            f.write(compressor.compress(b"".join(buf)))
+            buf, buffered = [], 0
+    f.write(compressor.compress(b"".join(buf)))
+    f.write(compressor.flush())
+    return [start - base, f.tell() - start]
+
+def _write_frame_header(f, name: str, size: int = 0) -> int:
+    name_bytes = name.encode("utf-8")
+    f.write(_FRAME_NAME.pack(len(name_bytes)))
+    f.write(name_bytes)
+    f.write(_FRAME_SIZE.pack(size))
+    return f.tell()
+
+def _write_frame(f, name: str, frame: _PreparedFrame) -> dict:
+    """Writes one source frame block by block and returns its index entry."""
+    base = _write_frame_header(f, name)
+    interner = frame.interner
+
+    def block_pieces(start):
+        yield b"{"
+        for idx in range(start, min(start + CACHE_BLOCK_LAYERS, len(frame.keys))):
+            if idx > start:
+                yield b","
+            yield _dumps(frame.keys[idx])
+            yield b":"
+            yield interner.dumps(frame.reduced[idx])
+        yield b"}"
+
+    def blob_pieces():
+        # Encoding a blob can reference further blobs, so interner.order may grow here.
+        yield b"["
+        idx = 0
+        while idx < len(interner.order):
+            digest = interner.order[idx]
+            yield b'%s["%s",' % (b"," if idx else b"", digest.encode("ascii"))
+            yield interner.dumps(interner.values[digest])
+            yield b"]"
+            idx += 1
+        yield b"]"
+
+    blocks = [_write_stream(f, base, block_pieces(start)) for start in range(0, len(frame.keys), CACHE_BLOCK_LAYERS)]
+    blobs = _write_stream(f, base, blob_pieces())
+    end = f.tell()
+    f.seek(base - _FRAME_SIZE.size)
+    f.write(_FRAME_SIZE.pack(end - base))
+    f.seek(end)
+    return {
+        "name": name, "offset": base, "size": end - base,
+        "blocks": blocks, "blobs": blobs, "keys": frame.keys, "digests": frame.digests,
+    }
+
+def _read_exact(f, n: int) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise CacheFormatError("Truncated cache file")
+    return data
+
+def _read_header(f):
+    magic = f.read(len(CACHE_MAGIC))
+    if magic != CACHE_MAGIC:
+        raise CacheFormatError("Not a DSCA cache file")
+    (version,) = _HEADER.unpack(_read_exact(f, _HEADER.size))
+    if version != CACHE_FORMAT_VERSION:
+        raise CacheFormatError(f"Unsupported cache format version: {version}")
+    return version
+
+def _read_stream(f, offset: int, size: int):
+    f.seek(offset)
+    decompressor = zlib.decompressobj()
+    parts = []
+    remaining = size
+    while remaining:
+        chunk = f.read(min(_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise CacheFormatError("Truncated cache stream")
+        remaining -= len(chunk)
+        parts.append(decompressor.decompress(chunk))
+    parts.append(decompressor.flush())
+    return _loads(b"".join(parts))
+
+def _read_index(f) -> List[dict]:
+    _read_header(f)
+    tail = _FOOTER.size + len(_FOOTER_MAGIC)
+    end = f.seek(0, os.SEEK_END)
+    if end < len(CACHE_MAGIC) + _HEADER.size + tail:
+        raise CacheFormatError("Truncated cache file")
+    f.seek(end - tail)
+    raw = _read_exact(f, tail)
+    if raw[_FOOTER.size:] != _FOOTER_MAGIC:
+        raise CacheFormatError("Cache index footer missing")
+    offset, size = _FOOTER.unpack(raw[:_FOOTER.size])
+    return _read_stream(f, offset, size)["frames"]
+
+def _file_identity(f) -> Tuple[int, int, int]:
+    st = os.fstat(f.fileno())
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+class CacheIndex(Mapping):
+    """
+    Read-only, lazily loaded view of a binary cache file.
+
+    Opening it reads only the header and the trailing index (layer keys,
+    content digests and block offsets). Layer bodies are decoded one block at a
+    time on first access and kept in a small LRU. No file handle is held
+    between reads; if the file has been replaced since the index was loaded,
+    body reads raise CacheChangedError and the caller should reopen the cache.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or CACHE_FILE)
+        self._frames: Dict[str, dict] = {}
+        self._locations: Dict[str, Tuple[str, int]] = {}
+        self._blocks: "OrderedDict[Tuple[str, int], Dict[str, dict]]" = OrderedDict()
+        self._blob_tables: Dict[str, List[Any]] = {}
+        self._resolved: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        with open(self.path, "rb") as f:
+            self._identity = _file_identity(f)
+            for entry in _read_index(f):
+                self._frames[entry["name"]] = entry
+                name = entry["name"]
+                for pos, key in enumerate(entry["keys"]):
+                    self._locations[key] = (name, pos)
+
+    def __getitem__(self, key: str):
+        name, pos = self._locations[key]
+        return self._block(name, pos // CACHE_BLOCK_LAYERS)[key]
+
+    def __iter__(self):
+        return iter(self._locations)
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __contains__(self, key):
+        return key in self._locations
+
+    def digest(self, key: str) -> Optional[str]:
+        """Stored content digest for key, or None if the key is not cached."""
+        location = self._locations.get(key)
+        if location is None:
+            return None
+        name, pos = location
+        return self._frames[name]["digests"][pos]
+
+    def sources(self) -> List[str]:
+        return list(self._frames)
+
+    def source_keys(self, source: str) -> List[str]:
+        entry = self._frames.get(source)
+        return list(entry["keys"]) if entry else []
+
+    def source_digests(self, source: str) -> List[str]:
+        """Content digests of a source's layers, in source_keys() order."""
+        entry = self._frames.get(source)
+        return list(entry["digests"]) if entry else []
+
+    def load_source(self, source: str) -> Dict[str, dict]:
+        entry = self._frames.get(source)
+        layers: Dict[str, dict] = {}
+        if entry:
+            for block_no in range(len(entry["blocks"])):
+                layers.update(self._block(source, block_no))
+        return layers
+
+    def _open(self):
+        f = open(self.path, "rb")
+        if _file_identity(f) != self._identity:
+            f.close()
+            raise CacheChangedError(f"{self.path} was replaced after its index was loaded")
+        return f
+
+    def _block(self, name: str, block_no: int) -> Dict[str, dict]:
+        with self._lock:
+            block = self._blocks.get((name, block_no))
+            if block is not None:
+                self._blocks.move_to_end((name, block_no))
+                return block
+            entry = self._frames[name]
+            with self._open() as f:
+                try:
+                    blobs = self._blob_tables.get(name)
+                    if blobs is None:
+                        rel, size = entry["blobs"]
+                        blobs = self._blob_tables[name] = _read_stream(f, entry["offset"] + rel, size)
+                    rel, size = entry["blocks"][block_no]
+                    block = _resolve_block(_read_stream(f, entry["offset"] + rel, size), blobs, self._resolved)
+                except (zlib.error, ValueError) as e:
+                    raise CacheCorruptError(f"Could not read {name!r} from {self.path}: {e}") from e
+            self._blocks[(name, block_no)] = block
+            if len(self._blocks) > CACHE_BLOCK_LRU:
+                self._blocks.popitem(last=False)
+            return block
+
+    def _copy_frame(self, name: str, dst) -> dict:
+        """Copies a frame's raw bytes into dst and returns its relocated index entry."""
+        entry = self._frames[name]
+        base = _write_frame_header(dst, name, entry["size"])
+        with self._open() as f:
+            f.seek(entry["offset"])
+            remaining = entry["size"]
+            while remaining:
+                chunk = _read_exact(f, min(_CHUNK_SIZE, remaining))
+                dst.write(chunk)
+                remaining -= len(chunk)
+        return dict(entry, offset=base)
+
+class _MemoryCache(Mapping):
+    """In-memory stand-in for CacheIndex, used for the legacy JSON cache and empty caches."""
+
+    def __init__(self, layers: Optional[Dict[str, dict]] = None):
+        self._layers = layers or {}
+        self._sources = _group_by_source(self._layers)
+
+    def __getitem__(self, key: str):
+        return self._layers[key]
+
+    def __iter__(self):
+        return iter(self._layers)
+
+    def __len__(self):
+        return len(self._layers)
+
+    def digest(self, key: str) -> Optional[str]:
+        return layer_digest(self._layers[key]) if key in self._layers else None
+
+    def sources(self) -> List[str]:
+        return list(self._sources)
+
+    def source_keys(self, source: str) -> List[str]:
+        return list(self._sources.get(source, {}))
+
+    def source_digests(self, source: str) -> List[str]:
+        return [layer_digest(layer) for layer in self._sources.get(source, {}).values()]
+
+    def load_source(self, source: str) -> Dict[str, dict]:
+        return dict(self._sources.get(source, {}))
+
+def _unreadable(path: Path, error: Exception, strict: bool):
+    if strict:
+        raise CacheCorruptError(
+            f"Could not read cache {path}: {error}. Move it aside with quarantine_cache() to rebuild it."
+        ) from error
+    print(f"Warning: could not read cache {path}: {error}")
+    return _MemoryCache()
+
+def open_cache(path: Path = None, strict: bool = False):
+    """
+    Opens the cache for reading. Returns a CacheIndex for the binary cache,
+    or an equivalent in-memory view of the legacy JSON cache (or of an empty
+    cache if there is none). Writers replace the file atomically, so no lock
+    is needed to read it.
+
+    An unreadable cache opens as empty, unless `strict`: then it raises
+    CacheCorruptError. Anything that writes the cache back must be strict.
+    """
+    path = Path(path or CACHE_FILE)
+    if path.exists():
         try:
-            with open(CACHE_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+            return CacheIndex(path)
+        except Exception as e:
+            return _unreadable(path, e, strict)
+    if path == CACHE_FILE and LEGACY_CACHE_FILE.exists():
+        try:
+            with open(LEGACY_CACHE_FILE, "r") as f:
+                return _MemoryCache(json.load(f))
+        except Exception as e:
+            return _unreadable(LEGACY_CACHE_FILE, e, strict)
+    return _MemoryCache()
+
+def quarantine_cache() -> Optional[Path]:
+    """
+    Moves an unreadable cache aside (to <name>.corrupt-<UTC time>) so the next
+    detection starts a new one; returns the new path, or None if there was no
+    cache file. Every source is reported as NEW on the next detection.
+    """
+    with cache_lock():
+        path = CACHE_FILE if CACHE_FILE.exists() else LEGACY_CACHE_FILE
+        if not path.exists():
+            return None
+        target = path.with_name(f"{path.name}.corrupt-{datetime.utcnow():%Y%m%dT%H%M%S}")
+        os.replace(path, target)
+        return target
+
+def iter_cache_frames(path: Path = None, sources: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Dict[str, dict]]]:
+    """
+    Yields (source, {layer_key: layer}) for each source in the cache.
+    If sources is given, other sources are skipped without decoding.
+    """
+    cache = open_cache(path)
+    wanted = set(sources) if sources is not None else None
+    for name in cache.sources():
+        if wanted is None or name in wanted:
+            yield name, cache.load_source(name)
+
+def load_cached_data(sources: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+    """
+    Loads the layer cache as {layer_key: layer}, optionally only for some
+    sources. Unreadable caches load as empty. Prefer open_cache() when only
+    some layers are needed.
+    """
+    try:
+        cache: Dict[str, dict] = {}
+        for _, frame in iter_cache_frames(CACHE_FILE, sources):
+            cache.update(frame)
+        return cache
+    except Exception as e:
+        print(f"Warning: could not read cache {CACHE_FILE}: {e}")
+        return {}
+
+def cache_lock(timeout: Optional[float] = None) -> FileLock:
+    """Advisory lock shared by every process that writes CACHE_FILE."""
+    return FileLock(CACHE_FILE, timeout=CACHE_LOCK_TIMEOUT if timeout is None else timeout)
+
+def _write_cache(frames: Dict[str, _PreparedFrame], replaced: Optional[Iterable[str]] = None, current=None):
+    """
+    Atomically rewrites CACHE_FILE with the given frames. If `replaced` is given,
+    sources outside it are carried over from `current` (default: the cache on
+    disk); binary frames are copied raw without being decoded. Otherwise the
+    cache is replaced whole. Callers must hold cache_lock().
+    """
+    kept: List[str] = []
+    if replaced is not None:
+        replaced = set(replaced)
+        current = current if current is not None else open_cache(strict=True)
+        for name in current.sources():
+            if name in replaced or name in frames:
+                continue
+            if isinstance(current, CacheIndex):
+                kept.append(name)
+            else:
+                frames[name] = _PreparedFrame(current.load_source(name))
+    entries = []
+    with atomic_write(CACHE_FILE, "wb") as f:
+        f.write(CACHE_MAGIC)
+        f.write(_HEADER.pack(CACHE_FORMAT_VERSION))
+        for name in sorted(set(frames) | set(kept)):
+            if name in frames:
+                entries.append(_write_frame(f, name, frames[name]))
+            else:
+                entries.append(current._copy_frame(name, f))
+        index_offset = f.tell()
+        _, index_size = _write_stream(f, index_offset, [_dumps({"frames": entries})])
+        f.write(_FOOTER.pack(index_offset, index_size))
+        f.write(_FOOTER_MAGIC)
 
 def save_cache(cache: Dict[str, dict]):
-    with open(CACHE_FILE, "w") as f:
-        json.dump(cache, f, indent=2)
+    with cache_lock():
+        _write_cache({source: _PreparedFrame(layers) for source, layers in _group_by_source(cache).items()})
 
 def field_level_diff(old_layer, new_layer):
     # If either is not a dict, treat as a full replacement
@@ -99,41 +745,233 @@ def field_level_diff(old_layer, new_layer):
     return changed
 
 
-def detect_new_or_updated_layers(layers: List[dict]) -> List[ChangeRecord]:
+def _prepare_frames(grouped: Dict[str, Dict[str, dict]], digests: Dict[str, str], processes: Optional[int] = None) -> Dict[str, _PreparedFrame]:
+    """Reduces each source's layers for writing, optionally one process per source."""
+    names = sorted(grouped)
+    if processes and processes > 1 and len(names) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        frame_digests = [{key: digests[key] for key in grouped[n]} for n in names]
+        with ProcessPoolExecutor(max_workers=min(processes, len(names))) as executor:
+            return dict(zip(names, executor.map(_PreparedFrame, [grouped[n] for n in names], frame_digests)))
+    return {name: _PreparedFrame(grouped[name], digests) for name in names}
+
+def _source_digests(layers: Dict[str, dict]) -> Dict[str, str]:
+    return {key: layer_digest(layer) for key, layer in layers.items()}
+
+def _compute_digests(grouped: Dict[str, Dict[str, dict]], processes: Optional[int] = None) -> Dict[str, str]:
+    """Content digests of every layer, optionally one process per source."""
+    digests: Dict[str, str] = {}
+    if processes and processes > 1 and len(grouped) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(processes, len(grouped))) as executor:
+            for part in executor.map(_source_digests, grouped.values()):
+                digests.update(part)
+    else:
+        for layers in grouped.values():
+            digests.update(_source_digests(layers))
+    return digests
+
+def _new_record(layer: dict, key: str, now: datetime) -> ChangeRecord:
+    return ChangeRecord(
+        source=layer.get('source', ''),
+        layer_id=key,
+        change_type="NEW",
+        changed_fields={k: (None, v) for k, v in layer.items()},
+        detection_time=now
+    )
+
+def _removed_record(layer, key: str, now: datetime) -> ChangeRecord:
+    fields = layer.items() if isinstance(layer, dict) else [("__all__", layer)]
+    return ChangeRecord(
+        source=_layer_source(key, layer),
+        layer_id=key,
+        change_type="REMOVED",
+        changed_fields={k: (v, None) for k, v in fields},
+        detection_time=now
+    )
+
+def _updated_record(old_layer, layer: dict, key: str, now: datetime) -> Optional[ChangeRecord]:
+    diff = field_level_diff(old_layer, layer)
+    if not diff:
+        return None
+    return ChangeRecord(
+        source=layer.get('source', ''),
+        layer_id=key,
+        change_type="UPDATED",
+        changed_fields=diff,
+        detection_time=now
+    )
+
+def _diff_per_layer(layers, new_cache, digests, cached_layers, refreshed, now) -> Tuple[List[ChangeRecord], set]:
+    changes: List[ChangeRecord] = []
+    dirty = set()
+    for l in layers:
+        key = layer_key(l)
+        cached_digest = cached_layers.digest(key)
+        if cached_digest is None:
+            changes.append(_new_record(l, key, now))
+            dirty.add(_layer_source(key, l))
+        elif cached_digest != digests[key] or new_cache[key] is not l:
+            dirty.add(_layer_source(key, l))
+            record = _updated_record(cached_layers[key], l, key, now)
+            if record:
+                changes.append(record)
+    for source in sorted(refreshed):
+        for key in cached_layers.source_keys(source):
+            if key not in new_cache:
+                changes.append(_removed_record(cached_layers[key], key, now))
+                dirty.add(source)
+    return changes, dirty
+
+def _diff_bulk(new_cache, digests, cached_layers, refreshed, now) -> Tuple[List[ChangeRecord], set]:
+    from .diff import diff_snapshots, snapshot_table
+
+    old_keys, old_digests = [], []
+    for source in sorted(refreshed):
+        old_keys.extend(cached_layers.source_keys(source))
+        old_digests.extend(cached_layers.source_digests(source))
+    added, removed, changed = diff_snapshots(
+        snapshot_table(old_keys, old_digests), snapshot_table(digests.keys(), digests.values())
+    )
+    changes = [_new_record(new_cache[key], key, now) for key in added]
+    for key in changed:
+        record = _updated_record(cached_layers[key], new_cache[key], key, now)
+        if record:
+            changes.append(record)
+    removed_records = [_removed_record(cached_layers[key], key, now) for key in removed]
+    changes.extend(removed_records)
+    dirty = {_layer_source(key, new_cache[key]) for key in added + changed}
+    dirty.update(c.source for c in removed_records)
+    return changes, dirty
+
+def apply_cache_delta(upserts: Dict[str, dict], removed: Iterable[str] = ()):
     """
-    Detects new or updated layers compared to the cache.
-    Returns a list of ChangeRecord objects.
+    Upserts layers (by layer key) into the cache and drops the `removed` keys,
+    re-encoding only the sources they touch. Other sources are copied raw.
     """
-    cached_layers = load_cached_data()
-    changes: List[ChangeRecord] = []
-    new_cache: Dict[str, dict] = {}
+    removed = set(removed)
+    with cache_lock():
+        current = open_cache(strict=True)
+        touched = {_layer_source(key, layer) for key, layer in upserts.items()}
+        touched |= {_layer_source(key, None) for key in removed}
+        grouped: Dict[str, Dict[str, dict]] = {}
+        digests: Dict[str, str] = {}
+        for source in touched:
+            layers = current.load_source(source)
+            digests.update(zip(current.source_keys(source), current.source_digests(source)))
+            grouped[source] = {key: layer for key, layer in layers.items() if key not in removed}
+        for key, layer in upserts.items():
+            grouped[_layer_source(key, layer)][key] = layer
+            digests[key] = layer_digest(layer)
+        frames = {source: _PreparedFrame(layers, digests) for source, layers in grouped.items() if layers}
+        _write_cache(frames, replaced=touched, current=current)
+
+def _journal_entry(c: ChangeRecord, digest: Optional[str]) -> dict:
+    entry = {
+        "source": c.source,
+        "layer_id": c.layer_id,
+        "change_type": c.change_type,
+        "detection_time": c.detection_time.isoformat(),
+        "digest": digest,
+    }
+    if c.change_type == "UPDATED":
+        entry["fields"] = sorted(c.changed_fields)
+    return entry
+
+def append_change_journal(entries: Iterable[dict]):
+    """Appends journal entries (one compact JSON object per line). Callers must hold cache_lock()."""
+    with open(CHANGE_JOURNAL_FILE, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(_ENCODER.encode(entry))
+            f.write("\n")
+
+def read_change_journal(path: Path = None) -> Iterator[dict]:
+    """Yields the change journal's entries, oldest first."""
+    path = Path(path or CHANGE_JOURNAL_FILE)
+    if not path.exists():
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def load_source_status(path: Path = None) -> Dict[str, str]:
+    """{source: time of its last refresh (naive UTC, ISO format)} for every source detected so far."""
+    path = Path(path or SOURCE_STATUS_FILE)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: could not read source status {path}: {e}")
+        return {}
+
+def save_source_status(status: Dict[str, str]):
+    """Replaces the source status file. Callers must hold cache_lock()."""
+    with atomic_write(SOURCE_STATUS_FILE, "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2, sort_keys=True)
 
+def _record_source_refresh(sources: Iterable[str], now: datetime):
+    """Stamps sources as refreshed at `now`. Callers must hold cache_lock()."""
+    status = load_source_status()
+    status.update({source: now.isoformat() for source in sources})
+    save_source_status(status)
+
+def detect_new_or_updated_layers(
+    layers: List[dict],
+    sources: Optional[Iterable[str]] = None,
+    bulk: Optional[bool] = None,
+    processes: Optional[int] = None,
+) -> List[ChangeRecord]:
+    """
+    Detects new, updated and removed layers compared to the cache.
+    Returns a list of ChangeRecord objects sharing one detection_time.
+
+    Only the sources being refreshed (by default, those present in `layers`)
+    are diffed; cached layers for every other source are kept, so workers
+    fetching different sources can share one cache. The read-diff-write cycle
+    runs under cache_lock() and the file is replaced atomically. Layers are
+    compared by content digest first, so cached bodies are only read for
+    layers that changed, and only sources with changes are re-encoded.
+
+    bulk selects the columnar diff (default: when len(layers) reaches
+    BULK_DIFF_THRESHOLD); processes > 1 digests and encodes each source in its
+    own process.
+
+    Raises CacheCorruptError, before anything is written, if the cache on disk
+    cannot be read; the caller decides whether to quarantine_cache() and run
+    again, which rebuilds the cache from this fetch alone.
+    """
+    refreshed = set(sources) if sources is not None else {l.get('source', '') for l in layers}
+    if bulk is None:
+        bulk = len(layers) >= BULK_DIFF_THRESHOLD
+    new_cache: Dict[str, dict] = {}
     for l in layers:
-        key = f"{l.get('source','')}|{l.get('endpoint','')}|{l.get('name','')}"
-        new_cache[key] = l
-        cached = cached_layers.get(key)
-        if not cached:
-            # New layer
-            changes.append(ChangeRecord(
-                source=l.get('source', ''),
-                layer_id=key,
-                change_type="NEW",
-                changed_fields={k: (None, v) for k, v in l.items()},
-                detection_time=datetime.utcnow()
-            ))
+        new_cache[layer_key(l)] = l
+    grouped = _group_by_source(new_cache)
+    digests = _compute_digests(grouped, processes)
+    # A source that has layers in this fetch is always refreshed.
+    refreshed |= set(grouped)
+    now = datetime.utcnow()
+
+    with cache_lock():
+        cached_layers = open_cache(strict=True)
+        if bulk:
+            changes, dirty = _diff_bulk(new_cache, digests, cached_layers, refreshed, now)
         else:
-            # Compare fields
-            diff = field_level_diff(cached, l)
-            if diff:
-                changes.append(ChangeRecord(
-                    source=l.get('source', ''),
-                    layer_id=key,
-                    change_type="UPDATED",
-                    changed_fields=diff,
-                    detection_time=datetime.utcnow()
-                ))
-
-    save_cache(new_cache)
+            changes, dirty = _diff_per_layer(layers, new_cache, digests, cached_layers, refreshed, now)
+        if dirty:
+            frames = _prepare_frames({s: grouped[s] for s in dirty if s in grouped}, digests, processes)
+            _write_cache(frames, replaced=dirty, current=cached_layers)
+        if changes:
+            append_change_journal(
+                _journal_entry(c, cached_layers.digest(c.layer_id) if c.change_type == "REMOVED" else digests.get(c.layer_id))
+                for c in changes
+            )
+        _record_source_refresh(refreshed, now)
     return changes
 
 def serialize_changes(changes: List[ChangeRecord]) -> List[dict]:
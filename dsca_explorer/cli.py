@@ -11,14 +11,22 @@ What this does:
   state using detect_new_or_updated_layers() from dsca_explorer.cache.
 - Lists detected changes (with field-level details) in the terminal.
 - Prompts the user to optionally export these changes in a chosen format
-  (csv, xlsx, json, txt, docx, pdf) using export_changes() from dsca_explorer.export.
+  (csv, xlsx, json, jsonl, txt, docx, pdf, parquet, feather) using export_changes() from dsca_explorer.export.
+- --compact exports NEW/REMOVED layers by digest with a per-source summary
+  (XLSX); --appendix adds the full layer contents as an extra XLSX sheet.
 - Saves the exported change log to a timestamped file in the specified directory.
+- If the cache cannot be read, nothing is written: the user is asked whether
+  to move it aside and rebuild it from this fetch (--rebuild-cache answers yes).
+- --export-bundle / --import-bundle write or apply a snapshot bundle (layer
+  cache, change journal, attribute samples) instead of fetching, so another
+  node can start warm. With --base, --export-bundle writes a delta against
+  an earlier bundle.
 
 Where it pulls its information:
 -------------------------------
 - Layer data is pulled from all sources via dsca_explorer.fetchers.fetch_all_layers(),
   which aggregates results from ArcGIS, GeoJSON, and WMS fetchers.
-- Change detection uses the cache file (dsca_layer_cache.json) managed by dsca_explorer.cache.
+- Change detection uses the cache file (dsca_layer_cache.bin) managed by dsca_explorer.cache.
 - Exported change logs are generated from the detected changes only (not all layers).
 
 ================================================================================
@@ -28,16 +36,41 @@ Where it pulls its information:
 import click
 from pathlib import Path
 from datetime import datetime
-from dsca_explorer.cache import detect_new_or_updated_layers
+from dsca_explorer.bundle import BundleError, export_bundle, import_bundle
+from dsca_explorer.cache import CacheCorruptError, detect_new_or_updated_layers, quarantine_cache
 from dsca_explorer.export import export_changes
 from dsca_explorer.fetchers import fetch_all_layers
 
 @click.command()
-@click.option("--format", default=None, help="Export format: csv, xlsx, json, txt, docx, pdf")
+@click.option("--format", default=None, help="Export format: csv, xlsx, json, jsonl, txt, docx, pdf, parquet, feather")
 @click.option("--output-dir", default=".", type=click.Path(), help="Directory to save the export file")
-def main(format, output_dir):
+@click.option("--compact", is_flag=True, help="Reference new/removed layers by digest and add a summary sheet (xlsx)")
+@click.option("--appendix", is_flag=True, help="With --compact and xlsx, add a sheet with full layer contents")
+@click.option("--export-bundle", "export_bundle_path", type=click.Path(dir_okay=False), help="Write a snapshot bundle of the local cache and exit")
+@click.option("--base", type=click.Path(exists=True, dir_okay=False), help="With --export-bundle, write a delta against this earlier bundle")
+@click.option("--import-bundle", "import_bundle_path", type=click.Path(exists=True, dir_okay=False), help="Apply a snapshot bundle to the local cache and exit")
+@click.option("--rebuild-cache", is_flag=True, help="If the cache cannot be read, move it aside and rebuild it without asking")
+def main(format, output_dir, compact, appendix, export_bundle_path, base, import_bundle_path, rebuild_cache):
+    if export_bundle_path or import_bundle_path:
+        try:
+            if import_bundle_path:
+                manifest = import_bundle(import_bundle_path)
+                click.echo(f"Imported {manifest['kind']} bundle, snapshot {manifest['snapshot_id']} ({manifest['layers']} layers)")
+            if export_bundle_path:
+                manifest = export_bundle(export_bundle_path, base=base)
+                click.echo(f"Wrote {manifest['kind']} bundle {export_bundle_path}, snapshot {manifest['snapshot_id']}")
+        except (BundleError, CacheCorruptError) as e:
+            raise click.ClickException(str(e))
+        return
     layers = fetch_all_layers()
-    changes = detect_new_or_updated_layers(layers)
+    try:
+        changes = detect_new_or_updated_layers(layers)
+    except CacheCorruptError as e:
+        click.echo(f"{e}\nNothing was written to the cache.", err=True)
+        if not (rebuild_cache or click.confirm("Move the cache aside and rebuild it from this fetch (every layer will be NEW)?")):
+            raise click.ClickException("Cache left untouched.")
+        click.echo(f"Moved the unreadable cache to {quarantine_cache()}")
+        changes = detect_new_or_updated_layers(layers)
     if not changes:
         click.echo("No changes detected.")
         return
@@ -49,13 +82,13 @@ def main(format, output_dir):
     if click.confirm("\nWould you like to export these changes?", default=True):
         if not format:
             format = click.prompt(
-                "Export format (csv, xlsx, json, txt, docx, pdf)", 
-                type=click.Choice(["csv", "xlsx", "json", "txt", "docx", "pdf"]), 
+                "Export format (csv, xlsx, json, jsonl, txt, docx, pdf, parquet, feather)", 
+                type=click.Choice(["csv", "xlsx", "json", "jsonl", "txt", "docx", "pdf", "parquet", "feather"]), 
                 default="csv"
             )
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = Path(output_dir) / f"changes_{timestamp}.{format}"
-        export_changes(changes, format, output_path)
+        export_changes(changes, format, output_path, compact=compact, appendix=appendix)
         click.echo(f"\nExported {len(changes)} changes to {output_path}")
     else:
         click.echo("No export performed.")
@@ -0,0 +1,203 @@
+"""
+================================================================================
+DSCA Explorer Columnar Export Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added Parquet (.parquet) and Feather (.feather, Arrow IPC) output for layer
+  and change-log exports, written in record batches as rows stream in.
+- Typed schemas:
+    - source/series/type/change_type (and other low-cardinality columns)
+      are dictionary-encoded.
+    - Properties are a map<string, string> column whose values are JSON.
+    - The property list is a list<string> column.
+    - changed_fields is a map of field -> {old, new} (JSON values).
+    - detection_time is a timestamp column.
+  Consumers no longer re-parse an "Example Properties" JSON blob per row.
+- Added readers (load_layer_snapshot, load_change_records) so the explorer can
+  reload an exported file as a layer snapshot or as ChangeRecords.
+
+================================================================================
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .cache import ChangeRecord
+
+COLUMNAR_FORMATS = ("parquet", "feather")
+BATCH_ROWS = 10_000
+COMPRESSION = "zstd"
+
+_DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+LAYER_SCHEMA = pa.schema([
+    ("Source", _DICT_STRING),
+    ("Series", _DICT_STRING),
+    ("Layer Name", pa.string()),
+    ("Type", _DICT_STRING),
+    ("Endpoint", pa.string()),
+    ("Domain", _DICT_STRING),
+    ("ArcGIS Compatible", _DICT_STRING),
+    ("Download URL", pa.string()),
+    ("Documentation", _DICT_STRING),
+    ("Description", pa.string()),
+    ("Formats", _DICT_STRING),
+    ("Property List", pa.list_(pa.string())),
+    ("Properties", pa.map_(pa.string(), pa.string())),
+])
+
+CHANGE_SCHEMA = pa.schema([
+    ("source", _DICT_STRING),
+    ("layer_id", pa.string()),
+    ("change_type", _DICT_STRING),
+    ("changed_fields", pa.map_(pa.string(), pa.struct([("old", pa.string()), ("new", pa.string())]))),
+    ("detection_time", pa.timestamp("us")),
+])
+
+
+def _json_value(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+def properties_map(properties) -> List[tuple]:
+    """Properties dict as map entries with JSON-encoded values."""
+    if not isinstance(properties, dict):
+        return []
+    return [(str(k), _json_value(v)) for k, v in properties.items()]
+
+def changed_fields_map(changed_fields) -> List[tuple]:
+    return [
+        (str(field), {"old": _json_value(old), "new": _json_value(new)})
+        for field, (old, new) in (changed_fields or {}).items()
+    ]
+
+
+class _BatchBuilder:
+    """
+    Builds record batches for a schema. Dictionary columns keep one growing
+    dictionary for the whole file, so every batch only appends to it (Arrow
+    IPC files reject dictionary replacement between batches).
+    """
+
+    def __init__(self, schema: pa.Schema):
+        self.schema = schema
+        self.dictionaries: Dict[str, Dict[Any, int]] = {
+            f.name: {} for f in schema if pa.types.is_dictionary(f.type)
+        }
+
+    def _dictionary_array(self, name, field_type, values):
+        lookup = self.dictionaries[name]
+        indices = []
+        for v in values:
+            if v is None:
+                indices.append(None)
+                continue
+            v = str(v)
+            idx = lookup.get(v)
+            if idx is None:
+                idx = lookup[v] = len(lookup)
+            indices.append(idx)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=field_type.index_type),
+            pa.array(list(lookup), type=field_type.value_type),
+        )
+
+    def build(self, rows: List[Dict[str, Any]]) -> pa.RecordBatch:
+        arrays = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in rows]
+            if field.name in self.dictionaries:
+                arrays.append(self._dictionary_array(field.name, field.type, values))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.record_batch(arrays, schema=self.schema)
+
+
+def _batches(rows: Iterable[Dict[str, Any]], schema: pa.Schema, batch_rows: int):
+    builder = _BatchBuilder(schema)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch_rows:
+            yield builder.build(chunk)
+            chunk = []
+    if chunk:
+        yield builder.build(chunk)
+
+def write_columnar(rows: Iterable[Dict[str, Any]], output_path, schema: pa.Schema, batch_rows: int = BATCH_ROWS):
+    """Writes rows to Parquet or Feather (chosen by extension) one batch at a time."""
+    ext = str(output_path).split('.')[-1].lower()
+    if ext == "parquet":
+        with pq.ParquetWriter(str(output_path), schema, compression=COMPRESSION) as writer:
+            for batch in _batches(rows, schema, batch_rows):
+                writer.write_batch(batch)
+    elif ext == "feather":
+        options = ipc.IpcWriteOptions(compression=COMPRESSION, emit_dictionary_deltas=True)
+        with ipc.new_file(str(output_path), schema, options=options) as writer:
+            for batch in _batches(rows, schema, batch_rows):
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"Unsupported columnar format: {ext}")
+
+def _iter_rows(path):
+    path = Path(path)
+    ext = path.suffix.lstrip(".").lower()
+    if ext == "parquet":
+        for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=BATCH_ROWS):
+            yield from batch.to_pylist()
+    elif ext == "feather":
+        with pa.memory_map(str(path)) as source:
+            reader = ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield from reader.get_batch(i).to_pylist()
+    else:
+        raise ValueError(f"Unsupported columnar format: {ext}")
+
+def _json_loads(text):
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return text
+
+def load_layer_snapshot(path) -> List[dict]:
+    """Reloads a columnar layer export as layer dicts (the shape fetchers produce)."""
+    layers = []
+    for row in _iter_rows(path):
+        endpoint = row.get("Endpoint") or ""
+        layers.append({
+            "source": row.get("Source") or "",
+            "series": row.get("Series") or "",
+            "name": row.get("Layer Name") or "",
+            "type": row.get("Type") or "",
+            "endpoint": endpoint,
+            "formats": row.get("Formats") or "",
+            "download_url": row.get("Download URL") or endpoint,
+            "documentation": row.get("Documentation") or "",
+            "description": row.get("Description") or "",
+            "properties": {k: _json_loads(v) for k, v in row.get("Properties") or []},
+        })
+    return layers
+
+def load_change_records(path) -> List[ChangeRecord]:
+    """Reloads a columnar change-log export as ChangeRecord objects."""
+    records = []
+    for row in _iter_rows(path):
+        changed = {
+            field: (_json_loads(v["old"]), _json_loads(v["new"]))
+            for field, v in row.get("changed_fields") or []
+        }
+        records.append(ChangeRecord(
+            source=row["source"],
+            layer_id=row["layer_id"],
+            change_type=row["change_type"],
+            changed_fields=changed,
+            detection_time=row["detection_time"] or datetime.utcnow(),
+        ))
+    return records
@@ -24,7 +24,7 @@ USGS_GEOJSON = "https://volcanoes.usgs.gov/feeds/vhp_volcano_info.geojson"
 EPA_BASE = "https://enviro.epa.gov/enviro/efservice"
 NASA_CMR = "https://cmr.earthdata.nasa.gov/search/collections.json"
 
-CACHE_FILE = "dsca_layer_cache.json"
+CACHE_FILE = "dsca_layer_cache.bin"
 
 DOC_URLS = {
     "USGS Earthquake": "https://earthquake.usgs.gov/fdsnws/event/1/",
@@ -0,0 +1,162 @@
+"""
+================================================================================
+DSCA Explorer Derived Fields Module - Change Log
+================================================================================
+
+NEW:
+----
+- Moved clean_html, get_domain, get_arcgis_compat and get_property_list here
+  from export.py (export.py still re-exports them).
+- Added normalize_layers, an ingest-time stage that computes each layer's
+  derived fields once (plain-text description, endpoint domain, ArcGIS
+  compatibility and property list) and attaches
+  them to the layer under DERIVED_KEY. Exports and the GUI read them from
+  there instead of parsing every row again.
+- Derived fields are memoized by layer content digest (cache.layer_digest)
+  and persisted next to the layer cache (dsca_derived_cache.bin, one zlib
+  stream of compact JSON). Entries are pruned to the digests still in the
+  layer cache whenever the file is rewritten (not while the layer cache is
+  unreadable).
+- Pretty-printed properties are no longer a derived field: they doubled the
+  memory and file size of every layer's properties and are cheap to render
+  when needed (properties_text). Entries persisted with them drop the text
+  on load.
+
+================================================================================
+"""
+
+import json
+import re
+import zlib
+from html import unescape
+from pathlib import Path
+from typing import Dict, Iterable
+from urllib.parse import urlparse
+
+from .cache import CACHE_FILE, CacheFormatError, layer_digest, open_cache
+from .storage import FileLock, atomic_write
+
+DERIVED_CACHE_FILE = CACHE_FILE.with_name("dsca_derived_cache.bin")
+# Layer key holding the derived fields. It is attached after change
+# detection and is not part of a layer's content.
+DERIVED_KEY = "_derived"
+# Keys added to layers for display only; ignored when digesting.
+_NON_CONTENT_KEYS = (DERIVED_KEY, "display_name")
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def clean_html(text):
+    """Remove HTML tags and decode entities from text."""
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]+>', '', text)
+    return unescape(text).strip()
+
+def get_domain(url):
+    try:
+        return urlparse(url).netloc
+    except Exception:
+        return ""
+
+def get_arcgis_compat(endpoint):
+    if not endpoint:
+        return ""
+    if "/MapServer" in endpoint or "/FeatureServer" in endpoint:
+        return "ArcGIS Service"
+    elif "arcgis.com" in endpoint:
+        return "ArcGIS REST API"
+    else:
+        return "REST API"
+
+def get_property_list(properties):
+    """Get a list of property names from a dict."""
+    if isinstance(properties, dict):
+        return ", ".join(sorted(properties.keys()))
+    return "No attributes found"
+
+def properties_text(properties) -> str:
+    return json.dumps(properties, indent=2, ensure_ascii=False)
+
+def derive_fields(layer: dict) -> Dict[str, str]:
+    """Computes a layer's derived fields (the work export and display used to repeat per row)."""
+    endpoint = layer.get("endpoint", "")
+    properties = layer.get("properties", {})
+    return {
+        "description": clean_html(layer.get("description", "")),
+        "domain": get_domain(endpoint),
+        "arcgis_compat": get_arcgis_compat(endpoint),
+        "property_list": get_property_list(properties),
+    }
+
+def derived_fields(layer: dict) -> Dict[str, str]:
+    """The layer's precomputed derived fields, computed on the spot if it was never normalized."""
+    derived = layer.get(DERIVED_KEY)
+    return derived if derived is not None else derive_fields(layer)
+
+def content_digest(layer: dict) -> str:
+    """layer_digest of the layer without display-only keys, so it matches the cache index."""
+    if any(k in layer for k in _NON_CONTENT_KEYS):
+        layer = {k: v for k, v in layer.items() if k not in _NON_CONTENT_KEYS}
+    return layer_digest(layer)
+
+# --- Persistence ---
+
+def _read_derived(path: Path) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "rb") as f:
+            entries = json.loads(zlib.decompress(f.read()))
+    except Exception as e:
+        print(f"Warning: could not read derived field cache {path}: {e}")
+        return {}
+    for fields in entries.values():
+        fields.pop("properties_text", None)  # persisted by earlier versions
+    return entries
+
+def load_derived_cache() -> Dict[str, dict]:
+    """Returns {layer digest: derived fields} from DERIVED_CACHE_FILE."""
+    return _read_derived(DERIVED_CACHE_FILE)
+
+def save_derived_fields(entries: Dict[str, dict]):
+    """
+    Merges new entries into DERIVED_CACHE_FILE, keeping only digests that are
+    in the layer cache (or among the new entries) so the file tracks the cache.
+    """
+    if not entries:
+        return
+    with FileLock(DERIVED_CACHE_FILE):
+        merged = _read_derived(DERIVED_CACHE_FILE)
+        merged.update(entries)
+        # An unreadable layer cache says nothing about which digests are live
+        try:
+            index = open_cache(strict=True)
+        except CacheFormatError:
+            index = None
+        if index is not None:
+            live = {d for source in index.sources() for d in index.source_digests(source)}
+            merged = {d: fields for d, fields in merged.items() if d in live or d in entries}
+        with atomic_write(DERIVED_CACHE_FILE, "wb") as f:
+            f.write(zlib.compress(_ENCODER.encode(merged).encode("utf-8"), 6))
+
+def normalize_layers(layers: Iterable[dict], persist: bool = True) -> int:
+    """
+    Attaches derived fields to every layer under DERIVED_KEY, reusing the
+    fields persisted for layers whose content digest was seen before.
+    Layers with equal content share one fields dict. Returns the number of
+    layers whose fields had to be computed.
+    """
+    memo = load_derived_cache()
+    computed: Dict[str, dict] = {}
+    for layer in layers:
+        digest = content_digest(layer)
+        fields = memo.get(digest)
+        if fields is None:
+            fields = memo[digest] = computed[digest] = derive_fields(layer)
+        layer[DERIVED_KEY] = fields
+    if persist:
+        try:
+            save_derived_fields(computed)
+        except Exception as e:
+            print(f"Warning: could not save derived field cache: {e}")
+    return len(computed)
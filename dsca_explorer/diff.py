@@ -0,0 +1,42 @@
+"""
+================================================================================
+DSCA Explorer Bulk Diff Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added a columnar diff engine for large refreshes. Old and new snapshots are
+  flattened into (key, digest) tables and compared with a single pandas
+  outer join, instead of a Python loop with a dict lookup and field-level
+  diff per layer.
+- diff_snapshots returns the keys of new, removed and changed layers. The
+  caller (cache.detect_new_or_updated_layers) builds ChangeRecords only for
+  those rows.
+
+================================================================================
+"""
+
+from typing import Iterable, List, Tuple
+
+import pandas as pd
+
+
+def snapshot_table(keys: Iterable[str], digests: Iterable[str]) -> pd.DataFrame:
+    """Flattens a snapshot into a (key, digest, pos) table; pos is the input order."""
+    keys = list(keys)
+    table = pd.DataFrame({"key": keys, "digest": list(digests), "pos": range(len(keys))})
+    # A key seen twice in one fetch keeps its last layer, as in the cache itself.
+    return table.drop_duplicates("key", keep="last")
+
+def diff_snapshots(old: pd.DataFrame, new: pd.DataFrame) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Compares two snapshot tables. Returns (added, removed, changed) key lists.
+    Added keys keep the order of `new`; removed and changed keys keep the order
+    of `old`, so their cached bodies can be read block by block.
+    """
+    merged = old.merge(new, on="key", how="outer", suffixes=("_old", "_new"), indicator=True)
+    side = merged["_merge"]
+    added = merged[side == "right_only"].sort_values("pos_new")["key"].tolist()
+    removed = merged[side == "left_only"].sort_values("pos_old")["key"].tolist()
+    changed = merged[(side == "both") & (merged["digest_new"] != merged["digest_old"])]
+    return added, removed, changed.sort_values("pos_old")["key"].tolist()
@@ -23,268 +23,488 @@ AFTER:
 - All necessary imports and dependencies included.
 - Ready for CLI and test integration.
 
+UPDATED (v0.4.0):
+-----------------
+- export_layers samples feature attributes for all layers up front through
+  attributes.sample_feature_attributes (concurrent, per-host limited, TTL
+  cached) instead of two blocking requests per layer in sequence.
+- ensure_url_scheme, robust_get and query_feature_attributes moved to
+  attributes.py and are re-exported here.
+- Exports stream: export_layers and export_changes produce rows from
+  generators, and each format writes them as they come (csv module,
+  incremental JSON array, openpyxl write-only workbook). No processed list
+  or DataFrame of the whole export is built, so memory stays flat.
+- Added JSON Lines (.jsonl) output to both exports.
+- Added Parquet and Feather output to both exports (see columnar.py), with
+  typed columns and properties kept as a map column.
+- Added GeoJSON-seq (.geojsons) and GeoPackage (.gpkg) layer exports with
+  the geometries retained by the fetchers (see geoexport.py). These use the
+  layers' own feature attributes, so they do not sample endpoints.
+- export_layers and export_changes accept progress_cb and cancel hooks. Rows
+  are tracked as they are written, and a set cancel event removes the
+  partial file and raises ExportCancelled (used by jobs.ExportJobManager).
+  The partial file is removed whenever an export fails, not only on cancel.
+- PDF and DOCX exports go through reports.write_report: chunked per source,
+  rendered in parallel processes and merged with a table of contents.
+- export_changes has a compact mode: NEW and REMOVED records carry the
+  layer's cache digest instead of its full body, and XLSX change logs get a
+  per-source/change-type Summary sheet and an optional Appendix sheet with
+  the full bodies (one row per field). XLSX cells are capped at Excel's
+  32,767 character limit.
+- clean_html, get_domain, get_arcgis_compat and get_property_list moved to
+  derived.py and are re-exported here. Layer rows take the description,
+  domain, ArcGIS compatibility and property list precomputed at ingest by
+  derived.normalize_layers; sampled properties are rendered once per endpoint.
+- XLSX layer exports have one sheet per source (or series), built in
+  parallel worker processes by workbook.write_workbook (in parts of
+  WORKBOOK_PART_ROWS rows, so progress and cancellation are per part) and
+  split at Excel's row limit.
+- export_layers and export_changes take `processes`, the worker budget of
+  their XLSX/PDF/DOCX process pools (jobs.ExportJobManager splits the CPUs
+  between concurrent jobs).
+
 ================================================================================
 """
 
 
-import pandas as pd
+import csv
 import json
+import textwrap
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Any
-from docx import Document
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from openpyxl import Workbook
 
-import requests
-import urllib3
-import re
-from html import unescape
-from urllib.parse import urlparse
+from .attributes import (  # noqa: F401 (re-exported for existing callers)
+    ensure_url_scheme,
+    query_feature_attributes,
+    robust_get,
+    sample_feature_attributes,
+)
+from .cache import layer_digest
+from .columnar import (CHANGE_SCHEMA, COLUMNAR_FORMATS, LAYER_SCHEMA,
+                       changed_fields_map, properties_map, write_columnar)
+from .derived import (  # noqa: F401 (re-exported for existing callers)
+    clean_html,
+    derived_fields,
+    get_arcgis_compat,
+    get_domain,
+    get_property_list,
+    properties_text,
+)
+from .geoexport import GEO_FORMATS, write_geojson_seq, write_geopackage
+from .reports import write_report
+from .workbook import WORKBOOK_PART_ROWS, XLSX_MAX_ROWS, truncate_cell, write_workbook
 
-# Suppress only if verify=False is used
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# --- Progress and cancellation ---
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its cancel event is set."""
 
-# --- Change Log Export ---
 
-def export_changes(change_records: List[Any], format: str, output_path: Path):
+def track_rows(items: Iterable[Any], total: int, progress_cb=None, cancel=None, label="Writing"):
     """
-    Export a list of ChangeRecord objects to the specified format.
-    Supported formats: csv, json, xlsx, txt, docx, pdf
+    Passes items through, reporting progress about once per percent and
+    checking the cancel event (anything with is_set()) at the same rate, so
+    a cross-process event is not polled for every row.
     """
-    # Convert ChangeRecord objects to dicts (assume .to_serializable() method)
-    rows = [c.to_serializable() for c in change_records]
-
-    columns = ["source", "layer_id", "change_type", "changed_fields", "detection_time"]
-
-    if format == "csv":
-        pd.DataFrame(rows)[columns].to_csv(output_path, index=False)
-    elif format == "xlsx":
-        pd.DataFrame(rows)[columns].to_excel(output_path, index=False)
-    elif format == "json":
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(rows, f, indent=2, ensure_ascii=False)
-    elif format == "txt":
-        with open(output_path, "w", encoding="utf-8") as f:
-            for row in rows:
-                for col in columns:
-                    f.write(f"{col}: {row.get(col, '')}\n")
-                f.write("\n")
-    elif format == "docx":
-        doc = Document()
-        doc.add_heading("DSCA Change Log Export", 0)
+    step = max(1, min(total // 100, 256)) if total else 256
+    for i, item in enumerate(items, 1):
+        yield item
+        if i % step == 0 or i == total:
+            if cancel is not None and cancel.is_set():
+                raise ExportCancelled()
+            if progress_cb:
+                if total:
+                    progress_cb(int(i * 100 / total), f"{label}: {i}/{total} rows")
+                else:
+                    progress_cb(0, f"{label}: {i} rows")
+
+@contextmanager
+def _remove_on_failure(output_path):
+    """Removes the partial output file if the export is cancelled or fails."""
+    try:
+        yield
+    except BaseException:
+        Path(output_path).unlink(missing_ok=True)
+        raise
+
+# --- Streaming writers ---
+
+CHANGE_COLUMNS = ["source", "layer_id", "change_type", "changed_fields", "detection_time"]
+CHANGE_FORMATS = ("csv", "xlsx", "json", "jsonl", "txt", "docx", "pdf") + COLUMNAR_FORMATS
+LAYER_FORMATS = CHANGE_FORMATS + GEO_FORMATS
+
+def _cell(value):
+    """Value as written to CSV/XLSX cells: scalars as-is, anything else as str()."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def _xlsx_cell(value):
+    value = _cell(value)
+    return truncate_cell(value) if isinstance(value, str) else value
+
+def write_csv(rows: Iterable[Dict[str, Any]], output_path, columns: List[str]):
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_cell(row.get(col)) for col in columns])
+
+def write_xlsx(rows: Iterable[Dict[str, Any]], output_path, columns: List[str], title="Sheet1"):
+    # Write-only workbooks flush rows to disk as they are appended
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append(columns)
+    for row in rows:
+        ws.append([_xlsx_cell(row.get(col)) for col in columns])
+    wb.save(str(output_path))
+
+def write_json(rows: Iterable[Dict[str, Any]], output_path):
+    """Writes a JSON array one element at a time (same layout as json.dump(..., indent=2))."""
+    with open(output_path, "w", encoding="utf-8") as f:
+        first = True
         for row in rows:
-            doc.add_heading(row.get('layer_id', ''), level=1)
-            for col in columns:
-                doc.add_paragraph(f"{col}: {row.get(col, '')}")
-        doc.save(str(output_path))
-    elif format == "pdf":
-        c = canvas.Canvas(str(output_path), pagesize=letter)
-        width, height = letter
-        y = height - 40
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(40, y, "DSCA Change Log Export")
-        y -= 30
-        c.setFont("Helvetica", 10)
+            f.write("[\n" if first else ",\n")
+            f.write(textwrap.indent(json.dumps(row, indent=2, ensure_ascii=False), "  "))
+            first = False
+        f.write("[]" if first else "\n]")
+
+def write_jsonl(rows: Iterable[Dict[str, Any]], output_path):
+    with open(output_path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write("\n")
+
+def write_txt(rows: Iterable[Dict[str, Any]], output_path, columns: List[str] = None):
+    with open(output_path, "w", encoding="utf-8") as f:
         for row in rows:
-            if y < 100:
-                c.showPage()
-                y = height - 40
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(40, y, row.get('layer_id', ''))
-            y -= 20
-            c.setFont("Helvetica", 10)
-            for col in columns:
-                if col == "layer_id":
-                    continue
-                if y < 60:
-                    c.showPage()
-                    y = height - 40
-                value_str = str(row.get(col, ''))
-                for line in value_str.splitlines():
-                    while len(line) > 100:
-                        c.drawString(60, y, line[:100])
-                        line = line[100:]
-                        y -= 12
-                    c.drawString(60, y, line)
-                    y -= 12
-            y -= 30
-        c.save()
-    else:
+            for col in columns or row.keys():
+                f.write(f"{col}: {row.get(col, '')}\n")
+            f.write("\n")
+
+# --- Change Log Export ---
+
+def change_rows(change_records: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """Yields ChangeRecord objects as dicts (assumes a .to_serializable() method)."""
+    for c in change_records:
+        yield c.to_serializable()
+
+# --- Compact change logs ---
+
+def _record_body(c):
+    """The full layer a NEW or REMOVED record carries, rebuilt from its changed_fields."""
+    if c.change_type == "NEW":
+        return {k: new for k, (_, new) in c.changed_fields.items()}
+    body = {k: old for k, (old, _) in c.changed_fields.items()}
+    # Legacy cache entries that were not dicts are recorded under "__all__"
+    return body["__all__"] if list(body) == ["__all__"] else body
+
+def compact_record(c):
+    """
+    Returns a NEW or REMOVED record with its layer body replaced by the
+    body's cache digest (cache.layer_digest), as changed_fields
+    {"layer_digest": (None, digest)} or {"layer_digest": (digest, None)}.
+    UPDATED records already hold only the changed fields and are returned as-is.
+    """
+    if c.change_type == "NEW":
+        return replace(c, changed_fields={"layer_digest": (None, layer_digest(_record_body(c)))})
+    if c.change_type == "REMOVED":
+        return replace(c, changed_fields={"layer_digest": (layer_digest(_record_body(c)), None)})
+    return c
+
+class ChangeSummary:
+    """Counts changes and changed fields per source and change type as records stream past."""
+
+    CHANGE_TYPES = ("NEW", "UPDATED", "REMOVED")
+    COLUMNS = ["source", *CHANGE_TYPES, "total", "fields_changed"]
+
+    def __init__(self):
+        self.counts = Counter()
+        self.fields = Counter()
+
+    def add(self, c):
+        self.counts[(c.source, c.change_type)] += 1
+        if c.change_type == "UPDATED":
+            self.fields[c.source] += len(c.changed_fields)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        totals = dict.fromkeys(self.COLUMNS[1:], 0)
+        for source in sorted({source for source, _ in self.counts}):
+            row = {"source": source}
+            for change_type in self.CHANGE_TYPES:
+                row[change_type] = self.counts[(source, change_type)]
+            row["total"] = sum(row[t] for t in self.CHANGE_TYPES)
+            row["fields_changed"] = self.fields[source]
+            for key in totals:
+                totals[key] += row[key]
+            yield row
+        yield {"source": "All sources", **totals}
+
+APPENDIX_COLUMNS = ["source", "layer_id", "change_type", "layer_digest", "field", "value"]
+
+def write_change_workbook(change_records: Iterable[Any], output_path, appendix: bool = False):
+    """
+    Writes a compact XLSX change log: a Summary sheet (per source and change
+    type), a Changes sheet of compact records and, if `appendix` is set, an
+    Appendix sheet with the full NEW/REMOVED bodies, one row per field.
+    """
+    summary = ChangeSummary()
+    wb = Workbook(write_only=True)
+    # Sheets keep creation order; the summary is filled in once all records are seen
+    summary_ws = wb.create_sheet("Summary")
+    changes_ws = wb.create_sheet("Changes")
+    changes_ws.append(CHANGE_COLUMNS)
+    appendix_ws = None
+    if appendix:
+        appendix_ws = wb.create_sheet("Appendix")
+        appendix_ws.append(APPENDIX_COLUMNS)
+    for c in change_records:
+        summary.add(c)
+        compact = compact_record(c)
+        row = compact.to_serializable()
+        changes_ws.append([_xlsx_cell(row.get(col)) for col in CHANGE_COLUMNS])
+        if appendix_ws is not None and compact is not c:
+            old, new = compact.changed_fields["layer_digest"]
+            body = _record_body(c)
+            items = body.items() if isinstance(body, dict) else [("__all__", body)]
+            for field, value in items:
+                appendix_ws.append([
+                    _xlsx_cell(v) for v in (c.source, c.layer_id, c.change_type, old or new, field, value)
+                ])
+    summary_ws.append(ChangeSummary.COLUMNS)
+    for row in summary.rows():
+        summary_ws.append([row[col] for col in ChangeSummary.COLUMNS])
+    wb.save(str(output_path))
+
+def export_changes(change_records: Iterable[Any], format: str, output_path: Path, progress_cb=None, cancel=None,
+                   compact: bool = False, appendix: bool = False, processes: Optional[int] = None):
+    """
+    Export ChangeRecord objects to the specified format, streaming row by row.
+    Supported formats: csv, json, jsonl, xlsx, txt, docx, pdf, parquet, feather
+    progress_cb(percent, message) is called as rows are written; setting the
+    `cancel` event stops the export, removes the partial file and raises ExportCancelled.
+    With `compact`, NEW and REMOVED records reference their layer digest
+    instead of embedding the layer (see compact_record), and XLSX output adds
+    a Summary sheet and, with `appendix`, an Appendix of the full bodies.
+    `processes` caps the worker processes of PDF/DOCX rendering.
+    """
+    if format not in CHANGE_FORMATS:
         raise ValueError(f"Unsupported export format: {format}")
+    total = len(change_records) if hasattr(change_records, "__len__") else 0
+    records = track_rows(change_records, total, progress_cb, cancel)
+    if compact and format == "xlsx":
+        with _remove_on_failure(output_path):
+            write_change_workbook(records, output_path, appendix)
+        return
+    if compact:
+        records = (compact_record(c) for c in records)
+    rows = change_rows(records)
+    columns = CHANGE_COLUMNS
 
-# --- Layer Export (unchanged) ---
+    with _remove_on_failure(output_path):
+        if format == "csv":
+            write_csv(rows, output_path, columns)
+        elif format == "xlsx":
+            write_xlsx(rows, output_path, columns)
+        elif format == "json":
+            write_json(rows, output_path)
+        elif format == "jsonl":
+            write_jsonl(rows, output_path)
+        elif format in COLUMNAR_FORMATS:
+            write_columnar(columnar_change_rows(records), output_path, CHANGE_SCHEMA)
+        elif format == "txt":
+            write_txt(rows, output_path, columns)
+        elif format == "docx":
+            write_report(rows, output_path, "docx", "DSCA Change Log Export", "layer_id", columns, group_key="source",
+                         processes=processes)
+        elif format == "pdf":
+            write_report(rows, output_path, "pdf", "DSCA Change Log Export", "layer_id", columns, group_key="source",
+                         processes=processes)
 
-def clean_html(text):
-    """Remove HTML tags and decode entities from text."""
-    if not text:
-        return ""
-    text = re.sub(r'<[^>]+>', '', text)
-    return unescape(text).strip()
+# --- Layer Export ---
 
-def get_domain(url):
-    try:
-        return urlparse(url).netloc
-    except Exception:
-        return ""
-
-def get_arcgis_compat(endpoint):
-    if not endpoint:
-        return ""
-    if "/MapServer" in endpoint or "/FeatureServer" in endpoint:
-        return "ArcGIS Service"
-    elif "arcgis.com" in endpoint:
-        return "ArcGIS REST API"
-    else:
-        return "REST API"
-
-def ensure_url_scheme(endpoint):
-    """Ensure the endpoint starts with http(s)://"""
-    if not endpoint:
-        return ""
-    if endpoint.startswith("http://") or endpoint.startswith("https://"):
-        return endpoint
-    return "https://" + endpoint.lstrip("/")
-
-def robust_get(url, params=None, timeout=15):
-    """Try to fetch with SSL verification, fallback to verify=False if needed."""
-    try:
-        return requests.get(url, params=params, timeout=timeout)
-    except requests.exceptions.SSLError:
-        print(f"SSL error for {url}, retrying without verification (not secure)...")
-        return requests.get(url, params=params, timeout=timeout, verify=False)
-    except Exception as e:
-        print(f"Request error for {url}: {e}")
-        return None
-
-def query_feature_attributes(endpoint):
-    """Query an ArcGIS endpoint to get actual feature attributes."""
-    endpoint = ensure_url_scheme(endpoint)
-    if not endpoint:
-        return {}
-
-    # Attempt to extract layer_id and service root
-    layer_id = None
-    service_root = endpoint
-    match = re.search(r'(.*(?:MapServer|FeatureServer))/(\d+)', endpoint)
-    if match:
-        service_root, layer_id = match.group(1), match.group(2)
-    else:
-        # If not found, try to use as is
-        layer_id = "0"
-
-    query_url = f"{service_root}/{layer_id}/query"
-    params = {
-        "where": "1=1",
-        "outFields": "*",
-        "returnGeometry": "false",
-        "resultRecordCount": 1,
-        "f": "json"
+LAYER_COLUMNS = [
+    "Source", "Series", "Layer Name", "Type", "Endpoint", "Domain", "ArcGIS Compatible",
+    "Download URL", "Documentation", "Description", "Property List", "Example Properties",
+]
+
+def _layer_fields(l, derived):
+    endpoint = l.get("endpoint", "")
+    return {
+        "Source": l.get("source", ""),
+        "Series": l.get("series", ""),
+        "Layer Name": l.get("name", ""),
+        "Type": l.get("type", ""),
+        "Endpoint": endpoint,
+        "Domain": derived["domain"],
+        "ArcGIS Compatible": derived["arcgis_compat"],
+        "Download URL": l.get("download_url", endpoint),
+        "Documentation": l.get("documentation", ""),
+        "Description": derived["description"],
     }
-    try:
-        resp = robust_get(query_url, params=params)
-        if resp and resp.status_code == 200:
-            data = resp.json()
-            if "features" in data and data["features"]:
-                attrs = data["features"][0].get("attributes", {})
-                if attrs:
-                    return attrs
-            # Fallback to fields if no features
-            if "fields" in data:
-                return {f["name"]: f.get("alias", f["name"]) for f in data["fields"]}
-        # Fallback: try to get fields from layer metadata
-        layer_url = f"{service_root}/{layer_id}"
-        resp = robust_get(layer_url, params={"f": "json"})
-        if resp and resp.status_code == 200:
-            data = resp.json()
-            if "fields" in data:
-                return {f["name"]: f.get("alias", f["name"]) for f in data["fields"]}
-        return {}
-    except Exception as e:
-        print(f"Error querying features: {e}")
-        return {}
-
-def get_property_list(properties):
-    """Get a list of property names from a dict."""
-    if isinstance(properties, dict):
-        return ", ".join(sorted(properties.keys()))
-    return "No attributes found"
-
-def export_layers(layers, file_path):
-    ext = file_path.split('.')[-1].lower()
-    processed_layers = []
+
+def _layer_properties(l, samples):
+    endpoint = l.get("endpoint", "")
+    return samples.get(endpoint, {}) if endpoint else l.get("properties", {})
+
+_NO_SAMPLE: Dict[str, Any] = {}
+
+def layer_rows(layers: Iterable[dict], samples: Dict[str, dict]) -> Iterator[Dict[str, Any]]:
+    """Yields one export row per layer; `samples` maps endpoint -> sampled attributes."""
+    # Layers of one service layer share an endpoint and its sample, so render
+    # each sample once. A layer's own properties are rendered per row.
+    rendered: Dict[str, tuple] = {}
+    for l in layers:
+        derived = derived_fields(l)
+        row = _layer_fields(l, derived)
+        endpoint = l.get("endpoint", "")
+        if endpoint:
+            text = rendered.get(endpoint)
+            if text is None:
+                properties = samples.get(endpoint, _NO_SAMPLE)
+                text = rendered[endpoint] = (get_property_list(properties), properties_text(properties))
+            row["Property List"], row["Example Properties"] = text
+        else:
+            row["Property List"] = derived["property_list"]
+            row["Example Properties"] = properties_text(l.get("properties", {}))
+        yield row
+
+def columnar_layer_rows(layers: Iterable[dict], samples: Dict[str, dict]) -> Iterator[Dict[str, Any]]:
+    """Like layer_rows, but with typed property columns for Parquet/Feather."""
+    for l in layers:
+        properties = _layer_properties(l, samples)
+        row = _layer_fields(l, derived_fields(l))
+        row["Formats"] = l.get("formats", "")
+        row["Property List"] = sorted(properties) if isinstance(properties, dict) else []
+        row["Properties"] = properties_map(properties)
+        yield row
+
+def geo_layer_rows(layers: Iterable[dict]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields {"properties", "geometry"} rows for geospatial exports. Properties
+    are the layer's own feature attributes, so nothing is sampled over the network.
+    """
     for l in layers:
         endpoint = l.get("endpoint", "")
-        # Query feature attributes (with fallback)
-        properties = query_feature_attributes(endpoint) if endpoint else l.get("properties", {})
-        processed = {
-            "Source": l.get("source", ""),
-            "Series": l.get("series", ""),
-            "Layer Name": l.get("name", ""),
-            "Type": l.get("type", ""),
-            "Endpoint": endpoint,
-            "Domain": get_domain(endpoint),
-            "ArcGIS Compatible": get_arcgis_compat(endpoint),
-            "Download URL": l.get("download_url", endpoint),
-            "Documentation": l.get("documentation", ""),
-            "Description": clean_html(l.get("description", "")),
-            "Property List": get_property_list(properties),
-            "Example Properties": json.dumps(properties, indent=2, ensure_ascii=False)
+        derived = derived_fields(l)
+        yield {
+            "geometry": l.get("geometry"),
+            "properties": {
+                "source": l.get("source", ""),
+                "series": l.get("series", ""),
+                "name": l.get("name", ""),
+                "type": l.get("type", ""),
+                "endpoint": endpoint,
+                "domain": derived["domain"],
+                "download_url": l.get("download_url", endpoint),
+                "documentation": l.get("documentation", ""),
+                "description": derived["description"],
+                "formats": l.get("formats", ""),
+                "properties": l.get("properties", {}),
+            },
         }
-        processed_layers.append(processed)
-
-    if ext == "csv":
-        pd.DataFrame(processed_layers).to_csv(file_path, index=False)
-    elif ext == "xlsx":
-        pd.DataFrame(processed_layers).to_excel(file_path, index=False)
-    elif ext == "json":
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(processed_layers, f, indent=2, ensure_ascii=False)
-    elif ext == "txt":
-        with open(file_path, "w", encoding="utf-8") as f:
-            for l in processed_layers:
-                for k, v in l.items():
-                    f.write(f"{k}: {v}\n")
-                f.write("\n")
-    elif ext == "docx":
-        doc = Document()
-        doc.add_heading("DSCA Layers Export", 0)
-        for l in processed_layers:
-            doc.add_heading(l['Layer Name'], level=1)
-            for k, v in l.items():
-                doc.add_paragraph(f"{k}: {v}")
-        doc.save(file_path)
-    elif ext == "pdf":
-        c = canvas.Canvas(file_path, pagesize=letter)
-        width, height = letter
-        y = height - 40
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(40, y, "DSCA Layers Export")
-        y -= 30
-        c.setFont("Helvetica", 10)
-        for l in processed_layers:
-            if y < 100:
-                c.showPage()
-                y = height - 40
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(40, y, l['Layer Name'])
-            y -= 20
-            c.setFont("Helvetica", 10)
-            for key, value in l.items():
-                if key == "Layer Name":
-                    continue
-                if y < 60:
-                    c.showPage()
-                    y = height - 40
-                # Wrap long lines
-                value_str = str(value)
-                for line in value_str.splitlines():
-                    while len(line) > 100:
-                        c.drawString(60, y, line[:100])
-                        line = line[100:]
-                        y -= 12
-                    c.drawString(60, y, line)
-                    y -= 12
-            y -= 30
-        c.save()
-    else:
+
+def columnar_change_rows(change_records: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    for c in change_records:
+        yield {
+            "source": c.source,
+            "layer_id": c.layer_id,
+            "change_type": c.change_type,
+            "changed_fields": changed_fields_map(c.changed_fields),
+            "detection_time": c.detection_time,
+        }
+
+def _layer_sheet_tasks(layers, samples: Dict[str, dict], partition: str):
+    """
+    One (name, row_fn, parts) sheet task per partition value, split at the
+    sheet row limit; each part is WORKBOOK_PART_ROWS layers.
+    """
+    groups: Dict[str, List[dict]] = {}
+    for l in layers:
+        groups.setdefault(l.get(partition) or "Other", []).append(l)
+    per_sheet = XLSX_MAX_ROWS - 1
+    for name in sorted(groups):
+        group = groups[name]
+        for sheet_start in range(0, len(group), per_sheet):
+            sheet = group[sheet_start:sheet_start + per_sheet]
+            parts = []
+            for start in range(0, len(sheet), WORKBOOK_PART_ROWS):
+                chunk = sheet[start:start + WORKBOOK_PART_ROWS]
+                # Ship each worker only the samples its layers use
+                chunk_samples = {
+                    l["endpoint"]: samples[l["endpoint"]] for l in chunk if l.get("endpoint") in samples
+                }
+                parts.append(((chunk, chunk_samples), len(chunk)))
+            yield name, layer_rows, parts
+
+def write_layer_workbook(layers, samples: Dict[str, dict], output_path, partition: str = "source",
+                         progress_cb=None, cancel=None, processes=None):
+    """
+    Writes layers as an XLSX workbook with one sheet per `partition` value
+    ("source" or "series"). Sheets are built in parts of WORKBOOK_PART_ROWS
+    rows by parallel worker processes; progress and the cancel event are
+    checked as each part completes, so one large source is both spread over
+    the workers and observable.
+    """
+    total = len(layers)
+    written = 0
+
+    def on_part(rows):
+        nonlocal written
+        written += rows
+        if cancel is not None and cancel.is_set():
+            raise ExportCancelled()
+        if progress_cb:
+            progress_cb(int(written * 100 / total) if total else 100, f"Writing: {written}/{total} rows")
+
+    write_workbook(_layer_sheet_tasks(layers, samples, partition), output_path, LAYER_COLUMNS,
+                   processes=processes, on_part=on_part)
+
+def export_layers(layers, file_path, progress_cb=None, cancel=None, processes=None):
+    """
+    Export layers to the format given by the file extension (see LAYER_FORMATS).
+    progress_cb(percent, message) reports attribute sampling and then rows
+    written; setting the `cancel` event stops the export, removes the partial
+    file and raises ExportCancelled. `processes` caps the worker processes
+    of XLSX, PDF and DOCX output (default: the CPU count).
+    """
+    ext = file_path.split('.')[-1].lower()
+    if ext not in LAYER_FORMATS:
         raise ValueError(f"Unsupported file extension: {ext}")
+    samples = {}
+    if ext not in GEO_FORMATS:
+        # Sample feature attributes for all endpoints at once (concurrent, cached)
+        samples = sample_feature_attributes(
+            (l.get("endpoint", "") for l in layers), progress_cb=progress_cb, cancel=cancel
+        )
+    tracked = track_rows(layers, len(layers), progress_cb, cancel)
+    rows = layer_rows(tracked, samples)
+
+    with _remove_on_failure(file_path):
+        if ext == "csv":
+            write_csv(rows, file_path, LAYER_COLUMNS)
+        elif ext == "xlsx":
+            write_layer_workbook(layers, samples, file_path, progress_cb=progress_cb, cancel=cancel,
+                                 processes=processes)
+        elif ext == "json":
+            write_json(rows, file_path)
+        elif ext == "jsonl":
+            write_jsonl(rows, file_path)
+        elif ext in COLUMNAR_FORMATS:
+            write_columnar(columnar_layer_rows(tracked, samples), file_path, LAYER_SCHEMA)
+        elif ext == "geojsons":
+            write_geojson_seq(geo_layer_rows(tracked), file_path)
+        elif ext == "gpkg":
+            write_geopackage(geo_layer_rows(tracked), file_path)
+        elif ext == "txt":
+            write_txt(rows, file_path)
+        elif ext == "docx":
+            write_report(rows, file_path, "docx", "DSCA Layers Export", "Layer Name", group_key="Source",
+                         processes=processes)
+        elif ext == "pdf":
+            write_report(rows, file_path, "pdf", "DSCA Layers Export", "Layer Name", group_key="Source",
+                         processes=processes)
@@ -0,0 +1,103 @@
+"""
+================================================================================
+DSCA Explorer Facet Index Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added FacetIndex, built once per fetch, for the source / format / type
+  filters:
+    - Each facet value maps to a sorted numpy array of layer ids (positions
+      in the indexed list). A layer's formats are parsed once, here.
+    - mask() turns a selection ({facet: value}) into a boolean mask over the
+      layers by intersecting the selected values' postings.
+    - counts() gives, for one facet, how many layers each value would match
+      under the other facets' selections (cross-filtering), by counting
+      each value's postings inside that mask.
+
+================================================================================
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+FACETS = ("source", "format", "type")
+
+
+def layer_formats(layer: dict) -> List[str]:
+    """A layer's formats as a list, whether stored as a comma-separated string or a list."""
+    fmt = layer.get("formats", "")
+    if isinstance(fmt, str):
+        values = fmt.split(",")
+    elif isinstance(fmt, list):
+        values = [str(f) for f in fmt]
+    else:
+        values = []
+    return [f.strip() for f in values if f.strip()]
+
+def _facet_values(layer: dict, facet: str) -> Iterable[str]:
+    if facet == "format":
+        return layer_formats(layer)
+    value = layer.get(facet, "")
+    return [value] if value else []
+
+
+class FacetIndex:
+    """
+    Postings of layer ids per facet value.
+
+    Usage:
+        facets = FacetIndex(layers)
+        facets.counts("type", {"source": "NOAA"})  # {type: layers matching}
+        ids = np.flatnonzero(facets.mask({"source": "NOAA", "format": "KML"}))
+    """
+
+    def __init__(self, layers: List[dict], facets: Iterable[str] = FACETS):
+        self.layers = layers
+        self.facets = tuple(facets)
+        self.postings: Dict[str, Dict[str, np.ndarray]] = {}
+        for facet in self.facets:
+            ids: Dict[str, List[int]] = {}
+            for layer_id, layer in enumerate(layers):
+                for value in dict.fromkeys(_facet_values(layer, facet)):
+                    ids.setdefault(value, []).append(layer_id)
+            self.postings[facet] = {value: np.asarray(v, dtype=np.uint32) for value, v in ids.items()}
+
+    def __len__(self):
+        return len(self.layers)
+
+    def values(self, facet: str) -> List[str]:
+        return sorted(self.postings[facet])
+
+    def mask(self, selection: Dict[str, str], exclude: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Mask of the layers matching every selected facet value (facets set to
+        None or "All", and `exclude`, are ignored). None if nothing is selected.
+        """
+        mask = None
+        for facet, value in selection.items():
+            if facet == exclude or value in (None, "All"):
+                continue
+            ids = self.postings[facet].get(value)
+            value_mask = np.zeros(len(self.layers), dtype=bool)
+            if ids is not None:
+                value_mask[ids] = True
+            mask = value_mask if mask is None else mask & value_mask
+        return mask
+
+    def counts(self, facet: str, selection: Dict[str, str], within: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """
+        {value: count} for `facet` among layers matching the other facets'
+        selections (and `within`, e.g. a search mask). Values with no
+        matching layers are left out.
+        """
+        mask = self.mask(selection, exclude=facet)
+        if within is not None:
+            mask = within if mask is None else mask & within
+        counts = {}
+        for value, ids in self.postings[facet].items():
+            n = len(ids) if mask is None else int(np.count_nonzero(mask[ids]))
+            if n:
+                counts[value] = n
+        return counts
@@ -8,6 +8,11 @@ UPDATED:
 - Added ASH3D fetcher (fetch_ash3d_layers) for USGS volcano ashfall projections.
 - Now imports and exposes fetch_ash3d_layers.
 - fetch_all_layers and GUI/CLI fetch lists now include ASH3D.
+- FETCHERS lists every fetcher with the source name it reports progress
+  under; fetch_all_layers and the GUI both use it.
+- Every fetcher accepts a ProgressBus (see progress.py) as progress_cb and
+  publishes structured progress to it; plain (percent, message) callbacks
+  are still called as before.
 
 ================================================================================
 """
@@ -19,6 +24,7 @@ from .usgs import fetch_usgs_layers
 from .epa import fetch_epa_layers
 from .nasa import fetch_nasa_layers
 from .ash3d import fetch_ash3d_layers  # <-- NEW
+from ..progress import progress_reporter
 
 from .utils import (
     get_series_prefix,
@@ -28,6 +34,18 @@ from .utils import (
     get_optimal_workers
 )
 
+# (progress source name, fetcher) for every source
+FETCHERS = [
+    ("FEMA ArcGIS", fetch_arcgis_layers_all),
+    ("OpenFEMA", fetch_openfema_layers),
+    ("HIFLD", fetch_hifld_layers),
+    ("NOAA", fetch_noaa_layers),
+    ("USGS", fetch_usgs_layers),
+    ("EPA", fetch_epa_layers),
+    ("NASA", fetch_nasa_layers),
+    ("ASH3D", fetch_ash3d_layers),
+]
+
 def fetch_all_layers(progress_cb=None):
     """
     Fetch all layers from all sources in parallel.
@@ -35,26 +53,8 @@ def fetch_all_layers(progress_cb=None):
     """
     from concurrent.futures import ThreadPoolExecutor, as_completed
 
-    fetchers = [
-        fetch_arcgis_layers_all,
-        fetch_openfema_layers,
-        fetch_hifld_layers,
-        fetch_noaa_layers,
-        fetch_usgs_layers,
-        fetch_epa_layers,
-        fetch_nasa_layers,
-        fetch_ash3d_layers,  # <-- NEW
-    ]
-    names = [
-        "FEMA ArcGIS",
-        "OpenFEMA",
-        "HIFLD",
-        "NOAA",
-        "USGS",
-        "EPA",
-        "NASA",
-        "ASH3D",  # <-- NEW
-    ]
+    names = [name for name, _ in FETCHERS]
+    fetchers = [fetcher for _, fetcher in FETCHERS]
     max_workers = min(get_optimal_workers(), len(fetchers))
     all_layers = []
     errors = []
@@ -68,6 +68,9 @@ def fetch_all_layers(progress_cb=None):
         except Exception as e:
             errors.append((name, str(e)))
             print(f"Error in {name}: {e}")
+            report = progress_reporter(progress_cb, name)
+            report.error(str(e))
+            report.finish(f"{name}: Error")
             return []
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -15,6 +15,8 @@ NEW:
 
 import requests
 
+from ..progress import progress_reporter
+
 
 def fetch_ash3d_layers(progress_cb=None, limit=5):
     """
@@ -22,25 +24,27 @@ def fetch_ash3d_layers(progress_cb=None, limit=5):
     Returns a list of layer dicts.
     """
     layers = []
+    report = progress_reporter(progress_cb, "ASH3D")
     try:
-        if progress_cb:
-            progress_cb(0, "Fetching latest ASH3D public runs")
+        report.start("Fetching latest ASH3D public runs")
         runs_url = "https://avo-vsc-ash.wr.usgs.gov/ash3d-api/publicApi/publicruns"
-        resp = requests.get(runs_url, timeout=15)
+        resp = requests.get(runs_url, hooks=report.hooks, timeout=15)
         resp.raise_for_status()
         runs = resp.json()
         runs = runs[:limit]
         total = len(runs)
+        report.set_total(total, "runs")
         for idx, run in enumerate(runs):
             job_cd = run.get("job_cd")
             run_type_cd = run.get("run_type_cd")
             volcano = run.get("volcano", "Unknown Volcano")
             eruption_time = run.get("eruption_time", "")
             if not job_cd or not run_type_cd:
+                report.advance()
                 continue
             geojson_url = f"https://avo-vsc-ash.wr.usgs.gov/ash3d-api/mapApi/geojson/{job_cd}/{run_type_cd}?units=english"
             try:
-                geojson_resp = requests.get(geojson_url, timeout=15)
+                geojson_resp = requests.get(geojson_url, hooks=report.hooks, timeout=15)
                 geojson_resp.raise_for_status()
                 geojson = geojson_resp.json()
                 layers.append({
@@ -56,12 +60,11 @@ def fetch_ash3d_layers(progress_cb=None, limit=5):
                 })
             except Exception as e:
                 print(f"Error fetching ASH3D GeoJSON for {job_cd}/{run_type_cd}: {e}")
-            if progress_cb:
-                progress_cb(int(((idx+1)/total)*100), f"ASH3D: {idx+1}/{total} runs")
-        if progress_cb:
-            progress_cb(100, f"ASH3D: {len(layers)} layers")
+                report.error(f"{job_cd}/{run_type_cd}: {e}")
+            report.advance()
+        report.finish(f"ASH3D: {len(layers)} layers")
     except Exception as e:
         print(f"Error fetching ASH3D public runs: {e}")
-        if progress_cb:
-            progress_cb(100, "ASH3D: Error")
+        report.error(str(e))
+        report.finish("ASH3D: Error")
     return layers
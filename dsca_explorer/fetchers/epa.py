@@ -25,6 +25,7 @@ AFTER:
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..config import EPA_BASE
+from ..progress import progress_reporter
 from .utils import get_optimal_workers
 
 def fetch_epa_layers(progress_cb=None, states=None):
@@ -38,11 +39,13 @@ def fetch_epa_layers(progress_cb=None, states=None):
     layers = []
     errors = []
     max_workers = get_optimal_workers()
+    report = progress_reporter(progress_cb, "EPA")
+    report.set_total(len(states), "states")
 
     def fetch_state(state):
         url = f"{EPA_BASE}/WATER_SYSTEM/STATE/{state}/ROWS/0:10/JSON"
         try:
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             state_layers = []
@@ -64,24 +67,22 @@ def fetch_epa_layers(progress_cb=None, states=None):
             return state_layers
         except Exception as e:
             errors.append((state, str(e)))
+            report.error(f"{state}: {e}")
             return []
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(fetch_state, state): state for state in states}
-        total = len(states)
         for idx, future in enumerate(as_completed(futures)):
             state = futures[future]
             state_layers = future.result()
             layers.extend(state_layers)
-            if progress_cb:
-                progress_cb(int(((idx+1)/total)*100), f"EPA: {idx+1}/{total} states")
+            report.advance()
     
     if errors:
         for state, err in errors:
             print(f"Error fetching EPA water systems for {state}: {err}")
-        if progress_cb:
-            progress_cb(100, f"EPA: Error(s) in {len(errors)} state(s)")
-    elif progress_cb:
-        progress_cb(100, f"EPA: {len(layers)} layers")
+        report.finish(f"EPA: Error(s) in {len(errors)} state(s)")
+    else:
+        report.finish(f"EPA: {len(layers)} layers")
 
     return layers
@@ -17,6 +17,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 
 from ..config import DOC_URLS, FEMA_ENDPOINTS, OPENFEMA_API
+from ..progress import progress_reporter
 from .utils import get_optimal_workers, get_series_prefix
 
 
@@ -25,9 +26,11 @@ def fetch_arcgis_layers_all(progress_cb=None):
     errors = []
     total = len(FEMA_ENDPOINTS)
     max_workers = get_optimal_workers()
+    report = progress_reporter(progress_cb, "FEMA ArcGIS")
+    report.set_total(total, "endpoints")
 
     def fetch_and_process(base_url):
-        arc_layers = fetch_arcgis_layers(base_url)
+        arc_layers = fetch_arcgis_layers(base_url, hooks=report.hooks)
         for l in arc_layers:
             l["source"] = "FEMA"  # Standardized
             l["documentation"] = DOC_URLS.get(l["type"], DOC_URLS["MapServer"])
@@ -43,22 +46,21 @@ def fetch_arcgis_layers_all(progress_cb=None):
                 layers.extend(arc_layers)
             except Exception as e:
                 errors.append((base_url, str(e)))
-            if progress_cb:
-                progress_cb(int(((idx+1)/total)*100), f"FEMA: {idx+1}/{total} endpoints")
+                report.error(f"{base_url}: {e}")
+            report.advance()
 
     if errors:
         for base_url, err in errors:
             print(f"Error fetching ArcGIS layers from {base_url}: {err}")
-        if progress_cb:
-            progress_cb(100, f"FEMA: Error(s) in {len(errors)} endpoint(s)")
-    elif progress_cb:
-        progress_cb(100, f"FEMA: {len(layers)} layers")
+        report.finish(f"FEMA: Error(s) in {len(errors)} endpoint(s)")
+    else:
+        report.finish(f"FEMA: {len(layers)} layers")
     return {'layers': layers, 'count': len(layers)}
 
-def fetch_arcgis_layers(base_url):
+def fetch_arcgis_layers(base_url, hooks=None):
     layers = []
     try:
-        res = requests.get(f"{base_url}?f=json", timeout=15)
+        res = requests.get(f"{base_url}?f=json", hooks=hooks, timeout=15)
         res.raise_for_status()
         data = res.json()
         services = data.get("services", [])
@@ -71,7 +73,7 @@ def fetch_arcgis_layers(base_url):
                 continue
             svc_url = f"{base_url}/{svc_name.split('/')[-1]}/{svc_type}"
             try:
-                svc_res = requests.get(f"{svc_url}?f=json", timeout=10)
+                svc_res = requests.get(f"{svc_url}?f=json", hooks=hooks, timeout=10)
                 svc_res.raise_for_status()
                 svc_data = svc_res.json()
                 for lyr in svc_data.get("layers", []):
@@ -95,14 +97,15 @@ def fetch_arcgis_layers(base_url):
 
 def fetch_openfema_layers(progress_cb=None):
     layers = []
+    report = progress_reporter(progress_cb, "OpenFEMA")
     try:
-        if progress_cb:
-            progress_cb(0, "Fetching OpenFEMA datasets")
+        report.start("Fetching OpenFEMA datasets")
         url = OPENFEMA_API
-        res = requests.get(url, timeout=20)
+        res = requests.get(url, hooks=report.hooks, timeout=20)
         res.raise_for_status()
         datasets = res.json().get("DataSets", [])
         total = len(datasets)
+        report.set_total(total, "datasets")
         for idx, ds in enumerate(datasets):
             endpoint = ds.get("apiEndpoint") or ds.get("accessURL") or ""
             name = ds.get("title") or ds.get("name") or "OpenFEMA Dataset"
@@ -124,12 +127,10 @@ def fetch_openfema_layers(progress_cb=None):
                 "series": series,
                 "source": "FEMA"  # Standardized
             })
-            if progress_cb and total > 0:
-                progress_cb(int(((idx+1)/total)*100), f"OpenFEMA: {idx+1}/{total}")
-        if progress_cb:
-            progress_cb(100, f"OpenFEMA: {len(layers)} layers")
+            report.advance()
+        report.finish(f"OpenFEMA: {len(layers)} layers")
     except Exception as e:
         print(f"Error fetching OpenFEMA layers: {e}")
-        if progress_cb:
-            progress_cb(100, "OpenFEMA: Error")
+        report.error(str(e))
+        report.finish("OpenFEMA: Error")
     return layers
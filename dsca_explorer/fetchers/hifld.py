@@ -26,6 +26,7 @@ import requests
 import urllib3
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..config import HIFLD_BASE_URL, HIFLD_HEADERS
+from ..progress import progress_reporter
 from .utils import infer_category_from_service, get_optimal_workers
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -33,12 +34,14 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 def fetch_hifld_layers(progress_cb=None):
     layers = []
     errors = []
+    report = progress_reporter(progress_cb, "HIFLD")
     try:
-        response = requests.get(HIFLD_BASE_URL, verify=False, headers=HIFLD_HEADERS, timeout=15)
+        response = requests.get(HIFLD_BASE_URL, verify=False, headers=HIFLD_HEADERS, hooks=report.hooks, timeout=15)
         if response.status_code == 200:
             data = response.json()
             services = data.get('services', [])
             total = len(services)
+            report.set_total(total, "services")
             max_workers = get_optimal_workers()
             
             def fetch_service(service):
@@ -47,7 +50,7 @@ def fetch_hifld_layers(progress_cb=None):
                 rest_url = f"{HIFLD_BASE_URL.split('?')[0]}/{service_name}/{service_type}"
                 service_layers = []
                 try:
-                    details = requests.get(f"{rest_url}?f=pjson", verify=False, headers=HIFLD_HEADERS, timeout=10).json()
+                    details = requests.get(f"{rest_url}?f=pjson", verify=False, headers=HIFLD_HEADERS, hooks=report.hooks, timeout=10).json()
                     for layer in details.get('layers', []):
                         layer_name = layer.get('name', 'Unknown Layer')
                         category = details.get('tags', ['Uncategorized'])[0] if 'tags' in details and details['tags'] else infer_category_from_service(rest_url)
@@ -64,6 +67,7 @@ def fetch_hifld_layers(progress_cb=None):
                         })
                 except Exception as e:
                     errors.append((rest_url, str(e)))
+                    report.error(f"{rest_url}: {e}")
                     print(f"Error fetching layers from {rest_url}: {str(e)}")
                 return service_layers
 
@@ -72,16 +76,14 @@ def fetch_hifld_layers(progress_cb=None):
                 for idx, future in enumerate(as_completed(futures)):
                     service_layers = future.result()
                     layers.extend(service_layers)
-                    if progress_cb:
-                        progress_cb(int(((idx+1)/total)*100), f"HIFLD: {idx+1}/{total} services")
-            if progress_cb:
-                progress_cb(100, f"HIFLD: {len(layers)} layers")
+                    report.advance()
+            report.finish(f"HIFLD: {len(layers)} layers")
         else:
             print(f"Failed to load HIFLD data. Status code: {response.status_code}")
-            if progress_cb:
-                progress_cb(100, "HIFLD: Error")
+            report.error(f"Status code {response.status_code}")
+            report.finish("HIFLD: Error")
     except Exception as e:
         print(f"Error fetching HIFLD data: {e}")
-        if progress_cb:
-            progress_cb(100, "HIFLD: Error")
+        report.error(str(e))
+        report.finish("HIFLD: Error")
     return layers
@@ -24,6 +24,7 @@ AFTER:
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..config import NASA_CMR
+from ..progress import progress_reporter
 from .utils import get_optimal_workers
 
 def fetch_nasa_layers(progress_cb=None, keywords=None):
@@ -38,12 +39,14 @@ def fetch_nasa_layers(progress_cb=None, keywords=None):
     errors = []
     max_workers = get_optimal_workers()
     total = len(keywords)
+    report = progress_reporter(progress_cb, "NASA")
+    report.set_total(total, "keywords")
 
     def fetch_keyword(keyword):
         url = f"{NASA_CMR}?keyword={keyword}"
         keyword_layers = []
         try:
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             entries = data.get("feed", {}).get("entry", [])
@@ -64,6 +67,7 @@ def fetch_nasa_layers(progress_cb=None, keywords=None):
                 })
         except Exception as e:
             errors.append((keyword, str(e)))
+            report.error(f"{keyword}: {e}")
             print(f"Error fetching NASA Earthdata for keyword '{keyword}': {e}")
         return keyword_layers
 
@@ -72,15 +76,13 @@ def fetch_nasa_layers(progress_cb=None, keywords=None):
         for idx, future in enumerate(as_completed(futures)):
             keyword_layers = future.result()
             layers.extend(keyword_layers)
-            if progress_cb:
-                progress_cb(int(((idx+1)/total)*100), f"NASA: {idx+1}/{total} keywords")
+            report.advance()
 
     if errors:
         for keyword, err in errors:
             print(f"Error fetching NASA Earthdata for keyword '{keyword}': {err}")
-        if progress_cb:
-            progress_cb(100, f"NASA: Error(s) in {len(errors)} keyword(s)")
-    elif progress_cb:
-        progress_cb(100, f"NASA: {len(layers)} layers")
+        report.finish(f"NASA: Error(s) in {len(errors)} keyword(s)")
+    else:
+        report.finish(f"NASA: {len(layers)} layers")
 
     return layers
@@ -18,12 +18,19 @@ AFTER:
 - Error handling for individual data types is improved.
 - Overall scalability and speed are significantly improved.
 
+UPDATED (v0.4.0):
+-----------------
+- Alerts, stations and radar layers keep their feature geometry in the
+  packed encoding from geometry.py (layer["geometry"], None if absent).
+
 ================================================================================
 """
 
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..config import NOAA_BASE, NOAA_HEADERS, NOAA_TIDES_DEFAULT_DATUM, NOAA_TIDES_DEFAULT_TIMEZONE
+from ..geometry import pack_geometry
+from ..progress import progress_reporter
 from .utils import get_optimal_workers
 
 def fetch_noaa_layers(progress_cb=None):
@@ -32,11 +39,13 @@ def fetch_noaa_layers(progress_cb=None):
     data_types = ["alerts", "stations", "radar", "tides"]
     total = len(data_types)
     max_workers = min(get_optimal_workers(), total)  # Only 4 types
+    report = progress_reporter(progress_cb, "NOAA")
+    report.set_total(total, "data types")
 
     def fetch_alerts():
         result = []
         try:
-            resp = requests.get(f"{NOAA_BASE}/alerts/active", headers=NOAA_HEADERS, timeout=15)
+            resp = requests.get(f"{NOAA_BASE}/alerts/active", headers=NOAA_HEADERS, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for feat in data.get("features", []):
@@ -50,6 +59,7 @@ def fetch_noaa_layers(progress_cb=None):
                     "endpoint": url,
                     "formats": "GeoJSON",
                     "properties": props,
+                    "geometry": pack_geometry(feat.get("geometry")),
                     "description": desc,
                     "url": url,
                     "series": "Active Alerts",
@@ -57,13 +67,14 @@ def fetch_noaa_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("alerts", str(e)))
+            report.error(f"alerts: {e}")
             print(f"Error fetching NOAA alerts: {e}")
         return result
 
     def fetch_stations():
         result = []
         try:
-            resp = requests.get(f"{NOAA_BASE}/stations", headers=NOAA_HEADERS, timeout=15)
+            resp = requests.get(f"{NOAA_BASE}/stations", headers=NOAA_HEADERS, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for feat in data.get("features", []):
@@ -77,6 +88,7 @@ def fetch_noaa_layers(progress_cb=None):
                     "endpoint": url,
                     "formats": "GeoJSON",
                     "properties": props,
+                    "geometry": pack_geometry(feat.get("geometry")),
                     "description": desc,
                     "url": url,
                     "series": "Stations",
@@ -84,13 +96,14 @@ def fetch_noaa_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("stations", str(e)))
+            report.error(f"stations: {e}")
             print(f"Error fetching NOAA stations: {e}")
         return result
 
     def fetch_radar():
         result = []
         try:
-            resp = requests.get(f"{NOAA_BASE}/radar/stations", headers=NOAA_HEADERS, timeout=15)
+            resp = requests.get(f"{NOAA_BASE}/radar/stations", headers=NOAA_HEADERS, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for feat in data.get("features", []):
@@ -104,6 +117,7 @@ def fetch_noaa_layers(progress_cb=None):
                     "endpoint": url,
                     "formats": "GeoJSON",
                     "properties": props,
+                    "geometry": pack_geometry(feat.get("geometry")),
                     "description": desc,
                     "url": url,
                     "series": "Radar Stations",
@@ -111,6 +125,7 @@ def fetch_noaa_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("radar", str(e)))
+            report.error(f"radar: {e}")
             print(f"Error fetching NOAA radar stations: {e}")
         return result
 
@@ -129,6 +144,7 @@ def fetch_noaa_layers(progress_cb=None):
             resp = requests.get(
                 "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter",
                 params=params,
+                hooks=report.hooks,
                 timeout=15
             )
             resp.raise_for_status()
@@ -150,6 +166,7 @@ def fetch_noaa_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("tides", str(e)))
+            report.error(f"tides: {e}")
             print(f"Error fetching NOAA tides: {e}")
         return result
 
@@ -166,14 +183,12 @@ def fetch_noaa_layers(progress_cb=None):
             dt = futures[future]
             result = future.result()
             layers.extend(result)
-            if progress_cb:
-                progress_cb(int(((idx+1)/total)*100), f"NOAA: {idx+1}/{total} data types")
+            report.advance()
 
     if errors:
         for dt, err in errors:
             print(f"Error fetching NOAA {dt}: {err}")
-        if progress_cb:
-            progress_cb(100, f"NOAA: Error(s) in {len(errors)} data type(s)")
-    elif progress_cb:
-        progress_cb(100, f"NOAA: {len(layers)} layers")
+        report.finish(f"NOAA: Error(s) in {len(errors)} data type(s)")
+    else:
+        report.finish(f"NOAA: {len(layers)} layers")
     return layers
\ No newline at end of file
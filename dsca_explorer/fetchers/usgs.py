@@ -2,6 +2,9 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
 
+from ..geometry import pack_geometry
+from ..progress import progress_reporter
+
 
 def fetch_usgs_layers(progress_cb=None):
     """
@@ -20,6 +23,8 @@ def fetch_usgs_layers(progress_cb=None):
     ]
     total = len(data_types)
     max_workers = min(6, total)
+    report = progress_reporter(progress_cb, "USGS")
+    report.set_total(total, "data types")
 
     # Endpoints
     USGS_EQ_BASE = "https://earthquake.usgs.gov/fdsnws/event/1/query"
@@ -30,7 +35,7 @@ def fetch_usgs_layers(progress_cb=None):
         result = []
         try:
             url = f"{USGS_EQ_BASE}?format=geojson&starttime=2024-01-01&minmagnitude=5"
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for feat in data.get("features", []):
@@ -44,6 +49,7 @@ def fetch_usgs_layers(progress_cb=None):
                     "endpoint": eq_url,
                     "formats": "GeoJSON",
                     "properties": props,
+                    "geometry": pack_geometry(feat.get("geometry")),
                     "description": desc,
                     "url": eq_url,
                     "series": "Earthquakes",
@@ -51,6 +57,7 @@ def fetch_usgs_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("earthquakes", str(e)))
+            report.error(f"earthquakes: {e}")
             print(f"Error fetching USGS earthquakes: {e}")
         return result
 
@@ -58,7 +65,7 @@ def fetch_usgs_layers(progress_cb=None):
         result = []
         try:
             url = f"{USGS_WATER_BASE}?sites=01646500&parameterCd=00060&format=json"
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for ts in data.get("value", {}).get("timeSeries", []):
@@ -79,6 +86,7 @@ def fetch_usgs_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("water", str(e)))
+            report.error(f"water: {e}")
             print(f"Error fetching USGS water data: {e}")
         return result
 
@@ -86,7 +94,7 @@ def fetch_usgs_layers(progress_cb=None):
         result = []
         try:
             url = f"{USGS_VOLCANOES_BASE}/getUSVolcanoes"
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for volcano in data:
@@ -110,6 +118,7 @@ def fetch_usgs_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("us_volcanoes", str(e)))
+            report.error(f"us_volcanoes: {e}")
             print(f"Error fetching USGS US volcanoes: {e}")
         return result
 
@@ -117,7 +126,7 @@ def fetch_usgs_layers(progress_cb=None):
         result = []
         try:
             url = f"{USGS_VOLCANOES_BASE}/getMonitoredVolcanoes"
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for volcano in data:
@@ -141,6 +150,7 @@ def fetch_usgs_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("monitored_volcanoes", str(e)))
+            report.error(f"monitored_volcanoes: {e}")
             print(f"Error fetching USGS monitored volcanoes: {e}")
         return result
 
@@ -148,7 +158,7 @@ def fetch_usgs_layers(progress_cb=None):
         result = []
         try:
             url = f"{USGS_VOLCANOES_BASE}/getElevatedVolcanoes"
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for volcano in data:
@@ -172,6 +182,7 @@ def fetch_usgs_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("elevated_volcanoes", str(e)))
+            report.error(f"elevated_volcanoes: {e}")
             print(f"Error fetching USGS elevated volcanoes: {e}")
         return result
 
@@ -179,7 +190,7 @@ def fetch_usgs_layers(progress_cb=None):
         result = []
         try:
             url = f"{USGS_VOLCANOES_BASE}/getCapElevated"
-            resp = requests.get(url, timeout=15)
+            resp = requests.get(url, hooks=report.hooks, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             for volcano in data:
@@ -203,6 +214,7 @@ def fetch_usgs_layers(progress_cb=None):
                 })
         except Exception as e:
             errors.append(("cap_elevated_volcanoes", str(e)))
+            report.error(f"cap_elevated_volcanoes: {e}")
             print(f"Error fetching USGS CAP-elevated volcanoes: {e}")
         return result
 
@@ -221,14 +233,12 @@ def fetch_usgs_layers(progress_cb=None):
             dt = futures[future]
             result = future.result()
             layers.extend(result)
-            if progress_cb:
-                progress_cb(int(((idx+1)/total)*100), f"USGS: {idx+1}/{total} data types")
+            report.advance()
 
     if errors:
         for dt, err in errors:
             print(f"Error fetching USGS {dt}: {err}")
-        if progress_cb:
-            progress_cb(100, f"USGS: Error(s) in {len(errors)} data type(s)")
-    elif progress_cb:
-        progress_cb(100, f"USGS: {len(layers)} layers")
+        report.finish(f"USGS: Error(s) in {len(errors)} data type(s)")
+    else:
+        report.finish(f"USGS: {len(layers)} layers")
     return layers
@@ -0,0 +1,179 @@
+"""
+================================================================================
+DSCA Explorer Geospatial Export Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added streaming geospatial writers for layers that carry a packed geometry
+  (see geometry.py):
+    - write_geojson_seq: GeoJSON text sequence (RFC 8142, .geojsons). Each
+      feature is written on its own record-separator-prefixed line.
+    - write_geopackage: OGC GeoPackage (.gpkg), written with the stdlib
+      sqlite3 module. Features are inserted in batches as standard GPKG
+      geometry blobs (GP header + envelope + ISO WKB, EPSG:4326), and the
+      layer extent is recorded in gpkg_contents.
+  Layers without a geometry are kept with a null geometry, so exports carry
+  the same rows as the tabular formats.
+
+================================================================================
+"""
+
+import json
+import os
+import sqlite3
+import struct
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable
+
+from .geometry import geometry_envelope, geometry_wkb, unpack_geometry
+
+GEO_FORMATS = ("geojsons", "gpkg")
+GPKG_TABLE = "dsca_layers"
+GPKG_BATCH_ROWS = 1_000
+GPKG_COLUMNS = [
+    "source", "series", "name", "type", "endpoint", "domain", "download_url",
+    "documentation", "description", "formats", "properties",
+]
+
+_RS = "\x1e"
+_GPKG_APPLICATION_ID = 0x47504B47  # "GPKG"
+_GPKG_USER_VERSION = 10300  # GeoPackage 1.3
+
+
+def write_geojson_seq(rows: Iterable[Dict[str, Any]], output_path):
+    """
+    Writes rows ({"properties": {...}, "geometry": packed or None}) as an
+    RFC 8142 GeoJSON text sequence, one feature per record.
+    """
+    with open(output_path, "w", encoding="utf-8") as f:
+        for row in rows:
+            feature = {
+                "type": "Feature",
+                "geometry": unpack_geometry(row.get("geometry")),
+                "properties": row.get("properties", {}),
+            }
+            f.write(_RS)
+            f.write(json.dumps(feature, ensure_ascii=False))
+            f.write("\n")
+
+def gpkg_geometry_blob(packed) -> bytes:
+    """Standard GeoPackage binary: GP header, xy envelope and ISO WKB (little-endian)."""
+    envelope = geometry_envelope(packed)
+    if envelope is None:
+        # Empty flag set, no envelope
+        return b"GP" + struct.pack("<BBi", 0, 0b00010001, 4326) + geometry_wkb(packed)
+    header = b"GP" + struct.pack("<BBi", 0, 0b00000011, 4326) + struct.pack("<4d", *envelope)
+    return header + geometry_wkb(packed)
+
+def _init_geopackage(conn):
+    conn.execute(f"PRAGMA application_id = {_GPKG_APPLICATION_ID}")
+    conn.execute(f"PRAGMA user_version = {_GPKG_USER_VERSION}")
+    conn.executescript("""
+        CREATE TABLE gpkg_spatial_ref_sys (
+            srs_name TEXT NOT NULL,
+            srs_id INTEGER NOT NULL PRIMARY KEY,
+            organization TEXT NOT NULL,
+            organization_coordsys_id INTEGER NOT NULL,
+            definition TEXT NOT NULL,
+            description TEXT
+        );
+        CREATE TABLE gpkg_contents (
+            table_name TEXT NOT NULL PRIMARY KEY,
+            data_type TEXT NOT NULL,
+            identifier TEXT UNIQUE,
+            description TEXT DEFAULT '',
+            last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+            min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE,
+            srs_id INTEGER,
+            CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys(srs_id)
+        );
+        CREATE TABLE gpkg_geometry_columns (
+            table_name TEXT NOT NULL,
+            column_name TEXT NOT NULL,
+            geometry_type_name TEXT NOT NULL,
+            srs_id INTEGER NOT NULL,
+            z TINYINT NOT NULL,
+            m TINYINT NOT NULL,
+            CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+            CONSTRAINT fk_gc_tn FOREIGN KEY (table_name) REFERENCES gpkg_contents(table_name),
+            CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys (srs_id)
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", "undefined cartesian coordinate reference system"),
+            ("Undefined geographic SRS", 0, "NONE", 0, "undefined", "undefined geographic coordinate reference system"),
+            ("WGS 84 geodetic", 4326, "EPSG", 4326,
+             'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563,'
+             'AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG","6326"]],PRIMEM["Greenwich",0,'
+             'AUTHORITY["EPSG","8901"]],UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],'
+             'AUTHORITY["EPSG","4326"]]',
+             "longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid"),
+        ],
+    )
+    columns = ", ".join(f'"{c}" TEXT' for c in GPKG_COLUMNS)
+    conn.execute(f'CREATE TABLE "{GPKG_TABLE}" (fid INTEGER PRIMARY KEY AUTOINCREMENT, geom GEOMETRY, {columns})')
+
+def write_geopackage(rows: Iterable[Dict[str, Any]], output_path, batch_rows: int = GPKG_BATCH_ROWS):
+    """
+    Writes rows ({"properties": {...}, "geometry": packed or None}) to a new
+    GeoPackage with one feature table. Rows are inserted in batches.
+    """
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    conn = sqlite3.connect(str(output_path))
+    try:
+        _init_geopackage(conn)
+        placeholders = ", ".join("?" for _ in range(len(GPKG_COLUMNS) + 1))
+        names = ", ".join(f'"{c}"' for c in GPKG_COLUMNS)
+        insert = f'INSERT INTO "{GPKG_TABLE}" (geom, {names}) VALUES ({placeholders})'
+        extent = None
+        has_z = False
+        batch = []
+
+        def flush():
+            conn.executemany(insert, batch)
+            conn.commit()
+            batch.clear()
+
+        for row in rows:
+            packed = row.get("geometry")
+            props = row.get("properties", {})
+            blob = None
+            if packed:
+                blob = gpkg_geometry_blob(packed)
+                has_z = has_z or packed.get("dims", 2) >= 3
+                box = geometry_envelope(packed)
+                if box:
+                    extent = box if extent is None else (
+                        min(extent[0], box[0]), max(extent[1], box[1]),
+                        min(extent[2], box[2]), max(extent[3], box[3]),
+                    )
+            values = [
+                json.dumps(props.get(c), ensure_ascii=False) if isinstance(props.get(c), (dict, list))
+                else props.get(c)
+                for c in GPKG_COLUMNS
+            ]
+            batch.append([blob] + values)
+            if len(batch) >= batch_rows:
+                flush()
+        if batch:
+            flush()
+
+        min_x, max_x, min_y, max_y = extent if extent else (None, None, None, None)
+        conn.execute(
+            "INSERT INTO gpkg_contents (table_name, data_type, identifier, description, last_change,"
+            " min_x, min_y, max_x, max_y, srs_id) VALUES (?, 'features', ?, ?, ?, ?, ?, ?, ?, 4326)",
+            (GPKG_TABLE, GPKG_TABLE, "DSCA Layers Export",
+             datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")[:-4] + "Z",
+             min_x, min_y, max_x, max_y),
+        )
+        conn.execute(
+            "INSERT INTO gpkg_geometry_columns VALUES (?, 'geom', 'GEOMETRY', 4326, ?, 0)",
+            (GPKG_TABLE, 2 if has_z else 0),
+        )
+        conn.commit()
+    finally:
+        conn.close()
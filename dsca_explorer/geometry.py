@@ -0,0 +1,206 @@
+"""
+================================================================================
+DSCA Explorer Geometry Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added a compact geometry encoding for layers built from GeoJSON features
+  (NOAA alerts/stations/radar, USGS earthquakes). All coordinates of a
+  geometry go into one little-endian float64 buffer (base64 in JSON), and
+  nesting is kept as offset lists:
+      {"type": "Polygon", "dims": 2, "coords": "<base64>", "offsets": [[0, 5, 9]]}
+  One string replaces thousands of small lists and floats, both in memory
+  and in the cache.
+- pack_geometry / unpack_geometry convert to and from GeoJSON geometries.
+- geometry_wkb and geometry_envelope produce ISO WKB and bounding boxes
+  straight from the buffer, for the GeoPackage writer.
+
+================================================================================
+"""
+
+import base64
+import struct
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+# Nesting depth of "coordinates" per GeoJSON type (0 = a single position)
+_DEPTH = {
+    "Point": 0,
+    "LineString": 1,
+    "MultiPoint": 1,
+    "Polygon": 2,
+    "MultiLineString": 2,
+    "MultiPolygon": 3,
+}
+
+_WKB_TYPES = {
+    "Point": 1,
+    "LineString": 2,
+    "Polygon": 3,
+    "MultiPoint": 4,
+    "MultiLineString": 5,
+    "MultiPolygon": 6,
+    "GeometryCollection": 7,
+}
+
+
+def _to_buffer(values: array) -> str:
+    if sys.byteorder != "little":
+        values = array("d", values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+def _from_buffer(text: str) -> array:
+    values = array("d")
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+def pack_geometry(geometry) -> Optional[dict]:
+    """Packs a GeoJSON geometry dict; returns None for missing or unsupported geometries."""
+    if not isinstance(geometry, dict):
+        return None
+    gtype = geometry.get("type")
+    if gtype == "GeometryCollection":
+        parts = [pack_geometry(g) for g in geometry.get("geometries") or []]
+        return {"type": gtype, "geometries": [p for p in parts if p]}
+    if gtype not in _DEPTH:
+        return None
+    depth = _DEPTH[gtype]
+    coords = geometry.get("coordinates")
+    if coords is None or (depth == 0 and not coords):
+        return None
+
+    # Flatten nested lists level by level, recording where each part starts
+    level = [coords] if depth == 0 else coords
+    offsets: List[List[int]] = []
+    for _ in range(depth - 1):
+        starts, flat = [0], []
+        for part in level:
+            flat.extend(part)
+            starts.append(len(flat))
+        offsets.append(starts)
+        level = flat
+    positions = level
+    dims = max((len(p) for p in positions), default=2)
+    dims = min(max(dims, 2), 4)
+    values = array("d")
+    for p in positions:
+        values.extend(float(c) for c in p[:dims])
+        values.extend(0.0 for _ in range(dims - len(p)))
+    packed = {"type": gtype, "dims": dims, "coords": _to_buffer(values)}
+    if offsets:
+        packed["offsets"] = offsets
+    return packed
+
+def _positions(packed) -> List[list]:
+    dims = packed["dims"]
+    values = _from_buffer(packed["coords"])
+    return [list(values[i:i + dims]) for i in range(0, len(values), dims)]
+
+def _nest(items, offsets):
+    for starts in reversed(offsets):
+        items = [items[starts[i]:starts[i + 1]] for i in range(len(starts) - 1)]
+    return items
+
+def unpack_geometry(packed) -> Optional[dict]:
+    """Expands a packed geometry back into a GeoJSON geometry dict."""
+    if not packed:
+        return None
+    gtype = packed["type"]
+    if gtype == "GeometryCollection":
+        return {"type": gtype, "geometries": [unpack_geometry(g) for g in packed["geometries"]]}
+    positions = _positions(packed)
+    if _DEPTH[gtype] == 0:
+        coords = positions[0] if positions else []
+    else:
+        coords = _nest(positions, packed.get("offsets", []))
+    return {"type": gtype, "coordinates": coords}
+
+def geometry_envelope(packed) -> Optional[Tuple[float, float, float, float]]:
+    """Returns (min_x, max_x, min_y, max_y), or None for an empty geometry."""
+    if not packed:
+        return None
+    if packed["type"] == "GeometryCollection":
+        boxes = [b for b in (geometry_envelope(g) for g in packed["geometries"]) if b]
+        if not boxes:
+            return None
+        return (min(b[0] for b in boxes), max(b[1] for b in boxes),
+                min(b[2] for b in boxes), max(b[3] for b in boxes))
+    values = _from_buffer(packed["coords"])
+    if not values:
+        return None
+    dims = packed["dims"]
+    xs, ys = values[0::dims], values[1::dims]
+    return min(xs), max(xs), min(ys), max(ys)
+
+def geometry_has_z(packed) -> bool:
+    if not packed:
+        return False
+    if packed["type"] == "GeometryCollection":
+        return any(geometry_has_z(g) for g in packed["geometries"])
+    return packed["dims"] >= 3
+
+def _wkb_header(gtype, has_z) -> bytes:
+    return struct.pack("<BI", 1, _WKB_TYPES[gtype] + (1000 if has_z else 0))
+
+def _wkb_points(values, start, end, dims, out_dims) -> bytes:
+    if dims == out_dims:
+        chunk = values[start * dims:end * dims]
+    else:
+        chunk = array("d")
+        for i in range(start, end):
+            row = values[i * dims:(i + 1) * dims]
+            chunk.extend(row[:out_dims])
+            chunk.extend(0.0 for _ in range(out_dims - len(row)))
+    if sys.byteorder != "little":
+        chunk = array("d", chunk)
+        chunk.byteswap()
+    return chunk.tobytes()
+
+def geometry_wkb(packed, has_z=None) -> bytes:
+    """Encodes a packed geometry as little-endian ISO WKB (XY, or XYZ when has_z)."""
+    if has_z is None:
+        has_z = geometry_has_z(packed)
+    gtype = packed["type"]
+    if gtype == "GeometryCollection":
+        parts = [geometry_wkb(g, has_z) for g in packed["geometries"]]
+        return _wkb_header(gtype, has_z) + struct.pack("<I", len(parts)) + b"".join(parts)
+
+    dims = packed["dims"]
+    out_dims = 3 if has_z else 2
+    values = _from_buffer(packed["coords"])
+    count = len(values) // dims
+    offsets = packed.get("offsets", [])
+    depth = _DEPTH[gtype]
+
+    def point(i):
+        return _wkb_header("Point", has_z) + _wkb_points(values, i, i + 1, dims, out_dims)
+
+    def ring(start, end):
+        return struct.pack("<I", end - start) + _wkb_points(values, start, end, dims, out_dims)
+
+    def polygon(ring_starts):
+        rings = [ring(ring_starts[i], ring_starts[i + 1]) for i in range(len(ring_starts) - 1)]
+        return _wkb_header("Polygon", has_z) + struct.pack("<I", len(rings)) + b"".join(rings)
+
+    if gtype == "Point":
+        return point(0)
+    if gtype == "LineString":
+        return _wkb_header(gtype, has_z) + ring(0, count)
+    if gtype == "MultiPoint":
+        return _wkb_header(gtype, has_z) + struct.pack("<I", count) + b"".join(point(i) for i in range(count))
+    if gtype == "Polygon":
+        return polygon(offsets[0])
+    if gtype == "MultiLineString":
+        starts = offsets[0]
+        lines = [_wkb_header("LineString", has_z) + ring(starts[i], starts[i + 1]) for i in range(len(starts) - 1)]
+        return _wkb_header(gtype, has_z) + struct.pack("<I", len(lines)) + b"".join(lines)
+    if depth == 3:  # MultiPolygon: offsets[0] groups rings into polygons, offsets[1] positions into rings
+        polys, rings = offsets
+        parts = [polygon(rings[polys[i]:polys[i + 1] + 1]) for i in range(len(polys) - 1)]
+        return _wkb_header(gtype, has_z) + struct.pack("<I", len(parts)) + b"".join(parts)
+    raise ValueError(f"Unsupported geometry type: {gtype}")
@@ -1,20 +1,104 @@
 import concurrent.futures
-import json
 import threading
+import time
 import tkinter as tk
 import webbrowser
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 
-from .cache import detect_new_or_updated_layers
+
+from .attributes import prefetch_feature_attributes
+from .cache import (CacheCorruptError, detect_new_or_updated_layers, layer_key, load_cached_data,
+                    load_source_status, quarantine_cache)
+from .columnar import load_layer_snapshot
 from .config import DOC_URLS
-from .export import export_layers
-from .fetchers import (fetch_arcgis_layers_all, fetch_ash3d_layers,
-                       fetch_epa_layers, fetch_hifld_layers, fetch_nasa_layers,
-                       fetch_noaa_layers, fetch_openfema_layers,
-                       fetch_usgs_layers, get_endpoint_name)
+from .derived import DERIVED_KEY, content_digest, derived_fields, normalize_layers
+from .fetchers import FETCHERS, get_endpoint_name
+from .jobs import CANCELLED, DONE, FAILED, ExportJobManager
+from .facets import FacetIndex
+from .jsonview import JsonViewer
+from .progress import ProgressBus
+from .search import SearchIndex
+from .sorting import DEFAULT_SORT, SortIndex, sort_values
+from .storage import LockTimeout
+from .uimonitor import DiagnosticsWindow, UIMonitor
+
+# Layer rows are inserted into the tree a page at a time when their group is
+# expanded or its last row scrolls into view, in slices of at most
+# TREE_SLICE_MS so the event loop keeps running between slices.
+TREE_PAGE_SIZE = 500
+TREE_SLICE_MS = 12
+_PLACEHOLDER_TEXT = "Loading..."
+# Search runs once typing pauses for this long.
+SEARCH_DEBOUNCE_MS = 150
+# Longer descriptions are cut in the details pane.
+DETAILS_DESCRIPTION_LIMIT = 5000
+# Fetch progress is drained from the progress bus on this tick, however
+# often fetchers publish.
+FETCH_PROGRESS_MS = 100
+FETCH_PROGRESS_COLUMNS = 2
+# Clicking a column heading makes it the primary sort column; the columns
+# clicked before it break ties, up to this many in all.
+MAX_SORT_COLUMNS = 3
+# Handlers whose every call is timed by the UI monitor (see Diagnostics).
+MONITORED_HANDLERS = ("apply_filters", "_populate_tree", "show_layer_details", "update_filter_options",
+                      "_apply_tree_delta", "_on_group_open", "sort_by_column")
+
+def _parse_status(status):
+    """load_source_status() output as {source: naive UTC datetime}."""
+    refreshed = {}
+    for source, stamp in status.items():
+        try:
+            refreshed[source] = datetime.fromisoformat(stamp)
+        except (TypeError, ValueError):
+            continue
+    return refreshed
+
+def _format_age(when):
+    seconds = max(0, (datetime.utcnow() - when).total_seconds())
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}h"
+    return f"{int(seconds // 86400)}d"
+
+def _row_values(layer):
+    return (
+        layer.get("display_name", layer.get("name", "")),
+        layer.get("type", ""),
+        layer.get("endpoint", ""),
+        layer.get("formats", "")
+    )
+
+def _format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    return f"{seconds // 60}m {seconds % 60:02d}s"
+
+def _format_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
 
+def _source_progress_text(state):
+    if state.finished:
+        text = state.message
+    else:
+        text = f"{state.done}/{state.total} {state.unit}".rstrip() if state.total else (state.message or "Starting...")
+        eta = state.eta()
+        if eta is not None:
+            text += f", ETA {_format_duration(eta)}"
+    if state.requests:
+        text += f" | {state.requests} req, {_format_bytes(state.bytes)}"
+    if state.errors:
+        text += f" | {len(state.errors)} error(s)"
+    return text
 
 def run_gui():
     root = tk.Tk()
@@ -28,10 +112,49 @@ class DSCARestAPIExplorer:
         self.root.geometry("1450x1100")
         self.all_layers = []
         self.filtered_layers = []
-        self.sort_reverse = False
+        # Layer cache key -> layer and -> position in all_layers, tree row ->
+        # layer cache key, and back
+        self.layers_by_key = {}
+        self.layer_positions = {}
+        self.item_keys = {}
+        self.key_items = {}
+        # Layer cache key -> content digest of the displayed layer (filled in
+        # lazily for snapshot layers), and where the displayed layers came
+        # from: "cache", "fetch" or "snapshot"
+        self.layer_digests = {}
+        self.display_origin = None
+        # (column, reverse) pairs, primary first
+        self.sort_spec = DEFAULT_SORT
+        self.sort_index = None
         self.source_counts = {}
+        # Last refresh per source, and sources still shown from the cache
+        # because no fetch has refreshed them this session
+        self.source_refreshed = {}
+        self.stale_sources = set()
+        self._fetching = False
+        # Set by a fetch that found the cache unreadable; asked about once it ends
+        self._cache_error = None
+        self.progress_bus = None
+        self._fetch_states = {}
+        self._source_bars = {}
         self.last_changes = []
+        self.export_jobs = ExportJobManager()
+        self.group_nodes = {}
+        self.group_layers = {}
+        self._group_pending = {}
+        self._tree_generation = 0
+        self.search_index = None
+        self.facet_index = None
+        self._search_after = None
+        self._polling_exports = False
+        # Wrapped before create_widgets binds them, so every call is timed
+        self.ui_monitor = UIMonitor(self.root)
+        self.ui_monitor.instrument(self, MONITORED_HANDLERS)
+        self._diagnostics = None
         self.create_widgets()
+        self.ui_monitor.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.load_cached_snapshot()
 
     def create_widgets(self):
         main_container = ttk.Frame(self.root, padding=10)
@@ -69,10 +192,17 @@ class DSCARestAPIExplorer:
         button_frame = ttk.Frame(control_frame)
         button_frame.pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="Fetch Layers", command=self.fetch_layers).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Open Snapshot", command=self.open_snapshot).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Select All", command=self.select_all).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Clear", command=self.clear_selection).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Export", command=self.export_selected).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Export Changes", command=self.export_changes).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Cancel Exports", command=self.cancel_exports).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="Diagnostics", command=self.show_diagnostics).pack(side=tk.LEFT, padx=2)
+
+        # One row per source while fetching (see _show_source_progress)
+        self.fetch_progress_frame = ttk.Frame(top_frame)
+        self.fetch_progress_frame.pack(fill=tk.X)
 
         filter_frame = ttk.LabelFrame(top_frame, text="Filters", padding=5)
         filter_frame.pack(fill=tk.X, pady=5)
@@ -98,12 +228,16 @@ class DSCARestAPIExplorer:
         self.type_combo.grid(row=0, column=5, padx=2, sticky=tk.EW)
         self.type_combo.bind("<<ComboboxSelected>>", lambda e: self.update_filter_options())
 
+        self._facet_vars = {"source": self.endpoint_var, "format": self.format_var, "type": self.type_var}
+        self._facet_combos = {"source": self.endpoint_combo, "format": self.format_combo, "type": self.type_combo}
+        self._facet_choices = {facet: {"All": "All"} for facet in self._facet_vars}
+
         # Search filter
         ttk.Label(filter_frame, text="Search:").grid(row=1, column=0, padx=2, sticky=tk.W)
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(filter_frame, textvariable=self.search_var)
         search_entry.grid(row=1, column=1, columnspan=5, padx=2, sticky=tk.EW)
-        search_entry.bind("<KeyRelease>", lambda e: self.apply_filters())
+        search_entry.bind("<KeyRelease>", lambda e: self._schedule_search())
 
         tree_frame = ttk.Frame(top_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
@@ -116,13 +250,17 @@ class DSCARestAPIExplorer:
             ("Endpoint", 500),
             ("Formats", 100)
         ]
+        self._column_headings = {}
         for idx, (col, (heading, width)) in enumerate(zip(columns, col_settings)):
+            self._column_headings[col] = heading
             self.tree.heading(col, text=heading, command=lambda c=col: self.sort_by_column(c))
             self.tree.column(col, width=width, minwidth=width//2)
+        self._update_sort_headings()
 
         vsb = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
         hsb = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self._tree_vsb = vsb
+        self.tree.configure(yscrollcommand=self._on_tree_scroll, xscrollcommand=hsb.set)
         
         self.tree.grid(row=0, column=0, sticky=tk.NSEW)
         vsb.grid(row=0, column=1, sticky=tk.NS)
@@ -130,131 +268,192 @@ class DSCARestAPIExplorer:
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
         self.tree.bind("<<TreeviewSelect>>", self.show_layer_details)
+        self.tree.bind("<<TreeviewOpen>>", self._on_group_open)
         self.tree.bind("<Button-3>", self.show_context_menu)
 
-        self.details_text = scrolledtext.ScrolledText(bottom_frame, wrap=tk.WORD)
-        self.details_text.pack(fill=tk.BOTH, expand=True)
+        details_pane = ttk.PanedWindow(bottom_frame, orient=tk.HORIZONTAL)
+        details_pane.pack(fill=tk.BOTH, expand=True)
+        self.details_text = scrolledtext.ScrolledText(details_pane, wrap=tk.WORD, width=60)
+        self.details_text.tag_configure("url", foreground="blue", underline=True)
+        self.details_text.tag_configure("heading", font=("Arial", 10, "bold"))
+        details_pane.add(self.details_text, weight=1)
+        # Properties are browsed as a tree, rendered only as far as it is expanded
+        self.properties_view = JsonViewer(details_pane)
+        details_pane.add(self.properties_view, weight=2)
+        self._detail_links = 0
 
         self.context_menu = tk.Menu(self.root, tearoff=0)
         self.context_menu.add_command(label="Copy Cell", command=self.copy_cell)
         self.context_menu.add_command(label="Copy Row", command=self.copy_row)
 
-    def update_filter_options(self):
-        selected_source = self.endpoint_var.get()
-        selected_format = self.format_var.get()
-        selected_type = self.type_var.get()
-
-        # Source options: all sources present in layers matching current format and type
-        source_layers = self.all_layers
-        if selected_format != "All":
-            source_layers = [l for l in source_layers if selected_format in l.get("formats", "")]
-        if selected_type != "All":
-            source_layers = [l for l in source_layers if l.get("type") == selected_type]
-        sources = set(l.get("source", "") for l in source_layers if l.get("source", ""))
-        source_values = ["All"] + sorted(sources)
-
-        # Format options: all formats present in layers matching current source and type
-        format_layers = self.all_layers
-        if selected_source != "All":
-            format_layers = [l for l in format_layers if l.get("source") == selected_source]
-        if selected_type != "All":
-            format_layers = [l for l in format_layers if l.get("type") == selected_type]
-        formats = set()
-        for l in format_layers:
-            fmt = l.get("formats", "")
-            if isinstance(fmt, str):
-                for f in fmt.split(","):
-                    formats.add(f.strip())
-            elif isinstance(fmt, list):
-                for f in fmt:
-                    formats.add(str(f).strip())
-        format_values = ["All"] + sorted(f for f in formats if f)
-
-        # Type options: all types present in layers matching current source and format
-        type_layers = self.all_layers
-        if selected_source != "All":
-            type_layers = [l for l in type_layers if l.get("source") == selected_source]
-        if selected_format != "All":
-            type_layers = [l for l in type_layers if selected_format in l.get("formats", "")]
-        types = set(l.get("type", "") for l in type_layers if l.get("type", ""))
-        type_values = ["All"] + sorted(types)
-
-        self.endpoint_combo['values'] = source_values
-        self.format_combo['values'] = format_values
-        self.type_combo['values'] = type_values
-
-        # Reset selection if current value is not in the new list
-        if self.endpoint_var.get() not in source_values:
-            self.endpoint_var.set("All")
-        if self.format_var.get() not in format_values:
-            self.format_var.set("All")
-        if self.type_var.get() not in type_values:
-            self.type_var.set("All")
+    def _facet_selection(self):
+        """Current {facet: value} selection; "All" when a dropdown is unset."""
+        selection = {}
+        for facet, var in self._facet_vars.items():
+            selection[facet] = self._facet_choices[facet].get(var.get(), "All")
+        return selection
 
+    def update_filter_options(self):
+        """Refreshes each dropdown with the values (and counts) left by the other two filters."""
+        self._refresh_filter_choices()
         self.apply_filters()
 
+    def _refresh_filter_choices(self):
+        """Recounts the dropdown values; returns True if a selected value had to be reset."""
+        reset = False
+        facets = self.facet_index
+        if facets is None or facets.layers is not self.all_layers:
+            facets = self.facet_index = FacetIndex(self.all_layers)
+        selection = self._facet_selection()
+        for facet, var in self._facet_vars.items():
+            counts = facets.counts(facet, selection)
+            choices = {"All": "All"}
+            for value in sorted(counts):
+                choices[f"{value} ({counts[value]:,})"] = value
+            self._facet_choices[facet] = choices
+            self._facet_combos[facet]['values'] = list(choices)
+            # Keep the selected value (with its new count), or reset it if it is gone
+            selected = selection[facet]
+            label = next((l for l, v in choices.items() if v == selected), "All")
+            reset = reset or (label == "All" and selected != "All")
+            var.set(label)
+        return reset
+
     def select_all(self):
-        if not hasattr(self, "group_nodes"):
-            return
-        for group_id in self.group_nodes.values():
-            for child in self.tree.get_children(group_id):
-                self.tree.selection_add(child)
+        # Selecting a group stands for all its layers, materialized or not
+        self.tree.selection_set(list(self.group_nodes.values()))
 
     def clear_selection(self):
         self.tree.selection_remove(self.tree.get_children())
 
     def fetch_layers(self):
+        if self._fetching:
+            return
+        self._fetching = True
         self.status_var.set("0%")
         self.progress["mode"] = "determinate"
         self.progress["value"] = 0
         self.progress_label.set("Fetching all sources in parallel...")
-        threading.Thread(target=self._multifetch_layers_thread, daemon=True).start()
+        self.progress_bus = ProgressBus()
+        self._fetch_states = {}
+        for widgets in self._source_bars.values():
+            for widget in widgets[:3]:
+                widget.destroy()
+        self._source_bars = {}
+        threading.Thread(target=self._run_fetch, daemon=True).start()
+        self.root.after(FETCH_PROGRESS_MS, self._poll_fetch_progress)
+
+    def _poll_fetch_progress(self):
+        """Drains the progress bus into the per-source bars and the overall status."""
+        for source, state in self.progress_bus.drain().items():
+            self._fetch_states[source] = state
+            self._show_source_progress(state)
+        states = self._fetch_states
+        finished = sum(1 for s in states.values() if s.finished)
+        # Once every source is in, the fetch thread owns the status line
+        if finished < len(FETCHERS):
+            fractions = [s.fraction() or 0.0 for s in states.values()]
+            percent = int(sum(fractions) / len(FETCHERS) * 100)
+            self.status_var.set(f"{percent}%")
+            self.progress.config(value=percent)
+            label = f"Fetched {finished}/{len(FETCHERS)} sources..."
+            etas = [s.eta() for s in states.values() if not s.finished]
+            if etas and None not in etas:
+                label += f" ETA {_format_duration(max(etas))}"
+            self.progress_label.set(label)
+        if self._fetching:
+            self.root.after(FETCH_PROGRESS_MS, self._poll_fetch_progress)
+
+    def _show_source_progress(self, state):
+        widgets = self._source_bars.get(state.source)
+        if widgets is None:
+            idx = len(self._source_bars)
+            row, col = divmod(idx, FETCH_PROGRESS_COLUMNS)
+            frame = self.fetch_progress_frame
+            label = ttk.Label(frame, text=state.source, width=12)
+            label.grid(row=row, column=col * 3, sticky=tk.W, padx=(0, 4))
+            bar = ttk.Progressbar(frame, orient=tk.HORIZONTAL, mode="determinate", maximum=100, length=120)
+            bar.grid(row=row, column=col * 3 + 1, padx=2)
+            text = tk.StringVar()
+            detail = ttk.Label(frame, textvariable=text, font=("Arial", 9))
+            detail.grid(row=row, column=col * 3 + 2, sticky=tk.W, padx=(4, 12))
+            widgets = self._source_bars[state.source] = (label, bar, detail, text)
+        _, bar, detail, text = widgets
+        fraction = state.fraction()
+        bar["value"] = 0 if fraction is None else fraction * 100
+        text.set(_source_progress_text(state))
+        detail.configure(foreground="red" if state.errors else "")
+
+    def _run_fetch(self):
+        try:
+            self._multifetch_layers_thread()
+        finally:
+            self._fetching = False
+            if self._cache_error:
+                self.root.after(0, self._confirm_cache_rebuild, self._cache_error)
+                self._cache_error = None
+
+    def _confirm_cache_rebuild(self, err):
+        """Offers to move an unreadable cache aside and fetch again, which rebuilds it."""
+        if not messagebox.askyesno(
+            "Cache Unreadable",
+            f"The layer cache could not be read, so this fetch was not saved.\n{err}\n\n"
+            "Move the cache aside and rebuild it from a new fetch? Every layer will be reported as new.",
+        ):
+            return
+        try:
+            moved = quarantine_cache()
+        except (OSError, LockTimeout) as e:
+            messagebox.showerror("Cache Unreadable", f"Could not move the cache aside: {e}")
+            return
+        if moved:
+            self.status_var.set(f"Unreadable cache moved to {moved}")
+        self.fetch_layers()
 
     def _multifetch_layers_thread(self):
-        fetch_funcs = [
-            fetch_arcgis_layers_all,
-            fetch_openfema_layers,
-            fetch_hifld_layers,
-            fetch_noaa_layers,
-            fetch_usgs_layers,
-            fetch_epa_layers,
-            fetch_nasa_layers,
-            fetch_ash3d_layers,
-        ]
         layers = []
-        total_fetchers = len(fetch_funcs)
-        completed_fetchers = 0
+        bus = self.progress_bus
 
-        def progress_cb(percent, message):
-            # This callback can be called by fetchers, but we update only on fetcher completion below
-            pass
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=total_fetchers) as executor:
-            futures = [executor.submit(f, progress_cb) for f in fetch_funcs]
+        # Fetchers publish their progress to the bus; the UI drains it on a tick
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(FETCHERS)) as executor:
+            futures = {executor.submit(fetcher, bus): name for name, fetcher in FETCHERS}
             for future in concurrent.futures.as_completed(futures):
-                result = future.result()
-                completed_fetchers += 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    name = futures[future]
+                    print(f"Error in {name}: {e}")
+                    report = bus.reporter(name)
+                    report.error(str(e))
+                    report.finish(f"{name}: Error")
+                    continue
                 if isinstance(result, dict):
                     layers.extend(result['layers'])
                 elif isinstance(result, list):
                     layers.extend(result)
-                percent = int((completed_fetchers / total_fetchers) * 100)
-                self.root.after(0, lambda p=percent: self.status_var.set(f"{p}%"))
-                self.root.after(0, lambda p=percent: self.progress.config(value=p))
-                self.root.after(0, lambda c=completed_fetchers, t=total_fetchers: self.progress_label.set(f"Fetched {c}/{t} sources..."))
 
-        # Build dynamic source counts
-        source_counts = {}
-        for layer in layers:
-            src = layer.get("source", "Unknown")
-            source_counts[src] = source_counts.get(src, 0) + 1
-        self.all_layers = layers
-        self.source_counts = source_counts
-        self.root.after(0, self._update_ui_after_fetch)
+        self.root.after(0, lambda: self.progress_label.set("Checking for changes..."))
 
         # Detect changes and group by source
-        changes = detect_new_or_updated_layers(layers)
-        self.last_changes = changes
+        try:
+            changes = detect_new_or_updated_layers(layers)
+        except LockTimeout as e:
+            err = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Cache Busy", f"Another fetch is updating the cache.\n{err}"))
+            changes = None
+        except CacheCorruptError as e:
+            self._cache_error = str(e)
+            changes = None
+
+        # Apply the fetch to the displayed layers as a delta, then precompute
+        # derived display/export fields for the layers that are new objects
+        fetched = layers
+        displayed = self.layers_by_key
+        layers, digests = self._merge_refreshed(fetched, displayed, self.layer_digests)
+        normalize_layers([l for l in layers if DERIVED_KEY not in l])
+        # Markers to set or clear: this fetch's changes and the last fetch's
+        marked = {c.layer_id for c in changes or []} | {c.layer_id for c in self.last_changes}
+        changes = self.last_changes = changes or []
 
         # Build a map from layer_id to change type
         change_map = {}
@@ -263,8 +462,7 @@ class DSCARestAPIExplorer:
 
         # Mark display_name for each layer (for treeview)
         for layer in layers:
-            key = f"{layer.get('source','')}|{layer.get('endpoint','')}|{layer.get('name','')}"
-            change_type = change_map.get(key)
+            change_type = change_map.get(layer_key(layer))
             if change_type == "NEW":
                 layer["display_name"] = f"[NEW] {layer['name']}"
             elif change_type == "UPDATED":
@@ -272,6 +470,20 @@ class DSCARestAPIExplorer:
             else:
                 layer["display_name"] = layer["name"]
 
+        indexed = self._index_layers(layers)
+        # Rows to redraw: layers that are not the displayed object, displayed
+        # layers that are gone, and rows whose marker changes
+        by_key = indexed[1]
+        affected = {key for key, layer in by_key.items() if displayed.get(key) is not layer}
+        affected |= displayed.keys() - by_key.keys()
+        affected |= marked
+        status = load_source_status()
+        refreshed = {l.get("source", "") for l in fetched}
+        self.root.after(0, self._apply_fetch, layers, indexed, digests, refreshed, status, displayed, affected)
+
+        # Warm the attribute cache in the background so exports only write files
+        prefetch_feature_attributes(fetched)
+
         # Group changes by source for summary popup
         changes_by_source = defaultdict(list)
         for c in changes:
@@ -282,15 +494,16 @@ class DSCARestAPIExplorer:
         for source, source_changes in changes_by_source.items():
             new = sum(1 for c in source_changes if c.change_type == "NEW")
             updated = sum(1 for c in source_changes if c.change_type == "UPDATED")
-            if new or updated:
-                msg += f"{source}: "
-                if new:
-                    msg += f"{new} new"
-                if new and updated:
-                    msg += ", "
-                if updated:
-                    msg += f"{updated} updated"
-                msg += "\n"
+            removed = sum(1 for c in source_changes if c.change_type == "REMOVED")
+            parts = []
+            if new:
+                parts.append(f"{new} new")
+            if updated:
+                parts.append(f"{updated} updated")
+            if removed:
+                parts.append(f"{removed} removed")
+            if parts:
+                msg += f"{source}: {', '.join(parts)}\n"
 
         msg += (
             "\nRemember, this is thrown together by a non-nerd! If a real nerd wants to take over, "
@@ -300,41 +513,195 @@ class DSCARestAPIExplorer:
         if msg.strip() and changes:
             self.root.after(0, lambda: messagebox.showinfo("Change Summary", msg))
 
-    def _update_ui_after_fetch(self):
+    def _merge_refreshed(self, fetched, displayed, displayed_digests):
+        """
+        The displayed layers with the fetched sources swapped in, and their
+        content digests. A fetched layer whose content equals the displayed
+        one keeps the displayed object (and derived fields); sources missing
+        from the fetch, e.g. a failed fetcher, keep their displayed layers.
+        The comparison is against what is displayed, not the change records,
+        since the display need not match the cache (an opened snapshot, or a
+        cache another worker has updated since).
+        """
+        refreshed = {l.get("source", "") for l in fetched}
+        merged, digests = [], {}
+        for key, layer in displayed.items():
+            if layer.get("source", "") not in refreshed:
+                merged.append(layer)
+                digests[key] = displayed_digests.get(key)
+        for layer in fetched:
+            key = layer_key(layer)
+            digest = content_digest(layer)
+            old = displayed.get(key)
+            if old is not None:
+                old_digest = displayed_digests.get(key) or content_digest(old)
+                if old_digest == digest:
+                    layer = old
+            merged.append(layer)
+            digests[key] = digest
+        return merged, digests
+
+    def _index_layers(self, layers):
+        """Source counts, key lookup and facet/search/sort indexes for a layer list; safe off the UI thread."""
+        source_counts = {}
+        for layer in layers:
+            src = layer.get("source", "Unknown")
+            source_counts[src] = source_counts.get(src, 0) + 1
+        positions = {layer_key(l): i for i, l in enumerate(layers)}
+        by_key = {key: layers[i] for key, i in positions.items()}
+        return source_counts, by_key, positions, FacetIndex(layers), SearchIndex(layers), SortIndex(layers)
+
+    def _set_layers(self, layers, indexed, affected=None):
+        """
+        Shows a new layer list. With `affected`, the keys of the layers that
+        differ from the displayed list (which it otherwise shares objects
+        with), only those rows and the filter counts are updated.
+        """
+        previous = self.layers_by_key
+        (self.source_counts, self.layers_by_key, self.layer_positions,
+         self.facet_index, self.search_index, self.sort_index) = indexed
+        self.all_layers = layers
+        self._update_ui_after_fetch(previous, affected)
+
+    def _apply_fetch(self, layers, indexed, digests, refreshed, status, displayed, affected):
+        # The delta only holds against the layers it was computed from, and
+        # only if those came from the cache or a fetch
+        if displayed is not self.layers_by_key or self.display_origin == "snapshot":
+            affected = None
+        self.source_refreshed = _parse_status(status)
+        self.stale_sources -= refreshed
+        self.layer_digests = digests
+        self.display_origin = "fetch"
+        self._set_layers(layers, indexed, affected)
+
+    def load_cached_snapshot(self):
+        """Shows the persisted layer cache right away, then revalidates it with a live fetch."""
+        self.status_var.set("Loading cached layers...")
+        threading.Thread(target=self._cached_snapshot_thread, daemon=True).start()
+
+    def _cached_snapshot_thread(self):
+        layers = list(load_cached_data().values())
+        if not layers:
+            self.root.after(0, self.fetch_layers)
+            return
+        normalize_layers(layers)
+        for layer in layers:
+            layer["display_name"] = layer["name"]
+        indexed = self._index_layers(layers)
+        digests = {key: content_digest(layer) for key, layer in indexed[1].items()}
+        self.root.after(0, self._show_cached_snapshot, layers, indexed, digests, load_source_status())
+
+    def _show_cached_snapshot(self, layers, indexed, digests, status):
+        if not self.all_layers:  # unless a fetch or snapshot got there first
+            self.source_refreshed = _parse_status(status)
+            self.stale_sources = set(indexed[0])
+            self.layer_digests = digests
+            self.display_origin = "cache"
+            self._set_layers(layers, indexed)
+        self.fetch_layers()
+
+    def open_snapshot(self):
+        """Loads a Parquet/Feather layer export in place of a live fetch."""
+        file_path = filedialog.askopenfilename(filetypes=[("Parquet", "*.parquet"), ("Feather", "*.feather")])
+        if not file_path:
+            return
+        try:
+            layers = load_layer_snapshot(file_path)
+        except Exception as e:
+            messagebox.showerror("Open Snapshot", str(e))
+            return
+        normalize_layers(layers)
+        for layer in layers:
+            layer["display_name"] = layer["name"]
+        self.last_changes = []
+        self.stale_sources = set()
+        self.layer_digests = {}
+        self.display_origin = "snapshot"
+        self._set_layers(layers, self._index_layers(layers))
+
+    def _update_ui_after_fetch(self, previous=None, affected=None):
         total = sum(self.source_counts.values())
         if total == 0:
             self.counter_var.set("No layers loaded yet!")
         else:
             counts_str = " | ".join(
-                f"{src}: {count}" for src, count in sorted(self.source_counts.items()) if count > 0
+                f"{src}: {count}{self._staleness(src)}" for src, count in sorted(self.source_counts.items()) if count > 0
             )
             self.counter_var.set(f"{counts_str} | Total: {total}")
         self.progress.stop()
         self.progress["value"] = 100
         self.status_var.set(f"Found {total} layers")
         self.progress_label.set("")
-        self.update_filter_options()
-        self.apply_filters()
+        if affected is None or not self.group_nodes:
+            self.update_filter_options()
+        elif self._refresh_filter_choices():
+            self.apply_filters()  # a selected filter value is gone
+        else:
+            self._apply_tree_delta(previous, affected)
+
+    def _staleness(self, source):
+        """Marker for a source still shown from the cache, with the age of its last refresh."""
+        if source not in self.stale_sources:
+            return ""
+        refreshed = self.source_refreshed.get(source)
+        return f" (cached {_format_age(refreshed)} ago)" if refreshed else " (cached)"
+
+    def _filter_mask(self, search):
+        """
+        Mask over all_layers of the facet and search filters (None when
+        nothing filters), and whether the search could use the index.
+        """
+        index = self.search_index
+        indexed = index is not None and index.layers is self.all_layers
+        facets = self.facet_index
+        if facets is None or facets.layers is not self.all_layers:
+            facets = self.facet_index = FacetIndex(self.all_layers)
+        # Facet and search matches are masks over all_layers; combine, then pick
+        mask = facets.mask(self._facet_selection())
+        if search and indexed:
+            search_mask = index.search_mask(search)
+            mask = search_mask if mask is None else mask & search_mask
+        return mask, indexed
+
+    def _sorted_layers(self, mask):
+        """The layers under mask (all if None) in the current sort order, from the sort index's cached permutation."""
+        index = self.sort_index
+        if index is None or index.layers is not self.all_layers:
+            index = self.sort_index = SortIndex(self.all_layers)
+        return [self.all_layers[i] for i in index.sorted_ids(self.sort_spec, mask)]
+
+    def _row_key(self, layer):
+        """Sort key of a layer in all_layers: its ranks under the current sort, then its position."""
+        pos = self.layer_positions[layer_key(layer)]
+        return self.sort_index.key(pos, self.sort_spec) + (pos,)
 
     def apply_filters(self):
-        endpoint = self.endpoint_var.get()
-        fmt = self.format_var.get()
-        typ = self.type_var.get()
-        search = self.search_var.get().lower()
-        self.filtered_layers = []
-        for layer in self.all_layers:
-            if endpoint != "All" and layer.get("source") != endpoint:
-                continue
-            if fmt != "All" and fmt not in layer.get("formats", ""):
-                continue
-            if typ != "All" and typ != layer.get("type", ""):
-                continue
-            if search and search not in layer.get("name", "").lower():
-                continue
-            self.filtered_layers.append(layer)
+        search = self.search_var.get()
+        mask, indexed = self._filter_mask(search)
+        candidates = self._sorted_layers(mask)
+        if search and not indexed:
+            name_search = search.lower()
+            candidates = [l for l in candidates if name_search in l.get("name", "").lower()]
+        self.filtered_layers = candidates
         self._populate_tree()
 
+    def _schedule_search(self):
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_after = None
+        self.apply_filters()
+
     def _populate_tree(self):
+        """
+        Inserts one node per group with its count. Layer rows are only
+        materialized when a group is expanded (see _on_group_open). Groups
+        keep the layers in filtered_layers order, i.e. the current sort.
+        """
+        # Batches scheduled for the previous tree check this and stop
+        self._tree_generation += 1
         self.tree.delete(*self.tree.get_children())
         groups = {}
         for layer in self.filtered_layers:
@@ -343,56 +710,243 @@ class DSCARestAPIExplorer:
                 groups[group] = []
             groups[group].append(layer)
         self.group_nodes = {}
+        self.group_layers = {}
+        self.item_keys = {}
+        self.key_items = {}
+        self._group_pending = {}
         for group in sorted(groups.keys()):
             group_label = f"{group} ({len(groups[group])})"
             group_id = self.tree.insert("", tk.END, text=group_label, values=("", "", "", ""))
             self.group_nodes[group] = group_id
-            for layer in sorted(groups[group], key=lambda l: l.get("name", "").lower()):
-                self.tree.insert(
-                    group_id,
-                    tk.END,
-                    values=(
-                        layer.get("display_name", layer.get("name", "")),
-                        layer.get("type", ""),
-                        layer.get("endpoint", ""),
-                        layer.get("formats", "")
-                    )
-                )
+            self.group_layers[group_id] = groups[group]
+            # A placeholder child gives the group its expand arrow
+            self.tree.insert(group_id, tk.END, text=_PLACEHOLDER_TEXT, values=("", "", "", ""))
 
-    def show_layer_details(self, event=None):
-        selected = self.tree.selection()
-        if not selected:
-            self.details_text.delete(1.0, tk.END)
+    def _on_group_open(self, event=None):
+        self._expand_group(self.tree.focus())
+
+    def _expand_group(self, group_id):
+        if group_id not in self.group_layers or group_id in self._group_pending:
             return
-        item = self.tree.item(selected[0])
-        values = item["values"]
-        if not values or not values[0]:
-            self.details_text.delete(1.0, tk.END)
+        self.tree.delete(*self.tree.get_children(group_id))
+        self._group_pending[group_id] = [list(self.group_layers[group_id]), 0, 0]
+        self._load_group_page(group_id)
+
+    def _load_group_page(self, group_id):
+        """Allows one more page of the group's rows and starts inserting it."""
+        pending = self._group_pending.get(group_id)
+        if pending is None or pending[2] > pending[1]:
+            return  # fully loaded, or a page is still being inserted
+        layers, inserted, _ = pending
+        if inserted >= len(layers):
+            return
+        pending[2] = min(inserted + TREE_PAGE_SIZE, len(layers))
+        self._insert_slice(group_id, self._tree_generation)
+
+    def _insert_slice(self, group_id, generation):
+        if generation != self._tree_generation or not self.tree.exists(group_id):
+            return
+        pending = self._group_pending[group_id]
+        layers, idx, limit = pending
+        deadline = time.perf_counter() + TREE_SLICE_MS / 1000
+        while idx < limit and time.perf_counter() < deadline:
+            layer = layers[idx]
+            self._insert_row(group_id, tk.END, layer)
+            idx += 1
+        pending[1] = idx
+        if idx < limit:
+            self.root.after(1, self._insert_slice, group_id, generation)
+
+    def _insert_row(self, group_id, index, layer):
+        item = self.tree.insert(group_id, index, values=_row_values(layer))
+        key = layer_key(layer)
+        self.item_keys[item] = key
+        self.key_items[key] = item
+
+    def _delete_row(self, key):
+        item = self.key_items.pop(key, None)
+        if item is not None:
+            self.item_keys.pop(item, None)
+            self.tree.delete(item)
+
+    def _apply_tree_delta(self, previous, affected):
+        """
+        Updates the tree in place for the layers under the `affected` keys:
+        rows are inserted, relabelled or deleted and group counts adjusted,
+        while untouched rows, the selection and the scroll position stay.
+        `previous` maps keys to the layers shown before.
+        """
+        search = self.search_var.get()
+        mask, indexed = self._filter_mask(search)
+        if search and not indexed:
+            self.apply_filters()
             return
-        layer = next((l for l in self.filtered_layers if l.get("display_name", l["name"]) == values[0] and l["endpoint"] == values[2]), None)
+        self.filtered_layers = self._sorted_layers(mask)
+        # Per group: layers to swap in place ({id(old): new}), to drop (ids) and to add
+        replace, remove, add = defaultdict(dict), defaultdict(set), defaultdict(list)
+        members = {}
+
+        def shown(group_id, layer):
+            if group_id not in members:
+                members[group_id] = {id(l) for l in self.group_layers[group_id]}
+            return id(layer) in members[group_id]
+
+        for key in affected:
+            old = previous.get(key)
+            old_group = old.get("series", "Other") if old is not None else None
+            old_gid = self.group_nodes.get(old_group)
+            if old_gid is None or not shown(old_gid, old):
+                old = None
+            pos = self.layer_positions.get(key)
+            new = None if pos is None or (mask is not None and not mask[pos]) else self.all_layers[pos]
+            new_group = new.get("series", "Other") if new is not None else None
+            if old is not None and new is not None and old_group == new_group and sort_values(old, self.sort_spec) == sort_values(new, self.sort_spec):
+                replace[old_gid][id(old)] = new
+                item = self.key_items.get(key)
+                if item is not None:
+                    self.tree.item(item, values=_row_values(new))
+                continue
+            if old is not None:
+                remove[old_gid].add(id(old))
+                self._delete_row(key)
+            if new is not None:
+                add[new_group].append(new)
+
+        for group_id in set(replace) | set(remove):
+            swap, drop = replace[group_id], remove[group_id]
+            self.group_layers[group_id][:] = [swap.get(id(l), l) for l in self.group_layers[group_id] if id(l) not in drop]
+            pending = self._group_pending.get(group_id)
+            if pending is not None:
+                layers, inserted, limit = pending
+                kept = []
+                for idx, layer in enumerate(layers):
+                    if id(layer) in drop:
+                        inserted -= idx < pending[1]
+                        limit -= idx < pending[2]
+                    else:
+                        kept.append(swap.get(id(layer), layer))
+                pending[:] = [kept, inserted, limit]
+        for group, layers in add.items():
+            group_id = self.group_nodes.get(group)
+            if group_id is None:
+                group_id = self._insert_group(group)
+            self._insort(self.group_layers[group_id], layers)
+            pending = self._group_pending.get(group_id)
+            if pending is not None:
+                self._add_pending_rows(group_id, pending, layers)
+        names = {group_id: group for group, group_id in self.group_nodes.items()}
+        for group_id in set(replace) | set(remove) | {self.group_nodes[g] for g in add}:
+            group = names[group_id]
+            count = len(self.group_layers[group_id])
+            if count:
+                self.tree.item(group_id, text=f"{group} ({count})")
+            else:
+                self.tree.delete(group_id)
+                del self.group_nodes[group], self.group_layers[group_id]
+                self._group_pending.pop(group_id, None)
+        selected = self.tree.selection()
+        if selected and self.item_keys.get(selected[0]) in affected:
+            self.show_layer_details()
+
+    def _insert_group(self, group):
+        """Adds an empty, collapsed group node at its sorted position."""
+        index = bisect_left(sorted(self.group_nodes), group)
+        group_id = self.tree.insert("", index, text=f"{group} (0)", values=("", "", "", ""))
+        self.tree.insert(group_id, tk.END, text=_PLACEHOLDER_TEXT, values=("", "", "", ""))
+        self.group_nodes[group] = group_id
+        self.group_layers[group_id] = []
+        return group_id
+
+    def _insort(self, rows, layers):
+        """Inserts layers into rows (sorted by _row_key) one by one; returns each one's index at the time."""
+        keys = [self._row_key(l) for l in rows]
+        indexes = []
+        for layer in layers:
+            key = self._row_key(layer)
+            idx = bisect_right(keys, key)
+            keys.insert(idx, key)
+            rows.insert(idx, layer)
+            indexes.append(idx)
+        return indexes
+
+    def _add_pending_rows(self, group_id, pending, layers):
+        """Merges layers into an expanded group's sorted rows, inserting those that land among the loaded rows."""
+        rows, inserted, limit = pending
+        count = len(rows)
+        for layer, idx in zip(layers, self._insort(rows, layers)):
+            loaded_all = inserted >= count
+            count += 1
+            if idx < inserted or loaded_all:
+                self._insert_row(group_id, idx, layer)
+                inserted += 1
+                limit += 1
+            elif idx < limit:
+                limit += 1
+        pending[1], pending[2] = inserted, limit
+
+    def _on_tree_scroll(self, first, last):
+        self._tree_vsb.set(first, last)
+        # Load the next page of any open group whose last row is on screen
+        for group_id, (layers, inserted, limit) in list(self._group_pending.items()):
+            if inserted < len(layers) and inserted == limit and self.tree.item(group_id, "open"):
+                children = self.tree.get_children(group_id)
+                if children and self.tree.bbox(children[-1]):
+                    self._load_group_page(group_id)
+
+    def _item_layer(self, item):
+        """The layer shown by a tree row, or None for group and placeholder rows."""
+        return self.layers_by_key.get(self.item_keys.get(item))
+
+    def _clear_details(self):
+        text = self.details_text
+        text.delete(1.0, tk.END)
+        for idx in range(self._detail_links):
+            text.tag_delete(f"url{idx}")
+        self._detail_links = 0
+
+    def _insert_detail(self, label, value):
+        """Appends a "label: value" line; http(s) values get their own link tag as they are inserted."""
+        text = self.details_text
+        text.insert(tk.END, f"{label}: ", "heading")
+        value = str(value)
+        if value.startswith(("http://", "https://")):
+            tag = f"url{self._detail_links}"
+            self._detail_links += 1
+            text.insert(tk.END, value, ("url", tag))
+            text.tag_bind(tag, "<Button-1>", lambda e, url=value: webbrowser.open(url))
+        else:
+            text.insert(tk.END, value)
+        text.insert(tk.END, "\n")
+
+    def show_layer_details(self, event=None):
+        """
+        Shows the selected layer: a few fields as text and the properties as a
+        lazily expanded tree, so the cost does not depend on the layer's size.
+        """
+        selected = self.tree.selection()
+        self._clear_details()
+        layer = self._item_layer(selected[0]) if selected else None
         if not layer:
-            self.details_text.delete(1.0, tk.END)
+            self.properties_view.clear()
             return
-        details = f"Name: {layer['name']}\nType: {layer['type']}\nEndpoint: {layer['endpoint']}\nFormats: {layer['formats']}\n"
-        if layer.get("description"):
-            details += f"\nDescription:\n{layer['description']}\n"
+        self._insert_detail("Name", layer['name'])
+        self._insert_detail("Type", layer['type'])
+        self._insert_detail("Endpoint", layer['endpoint'])
+        self._insert_detail("Formats", layer['formats'])
+        if layer.get("url") and layer["url"] != layer["endpoint"]:
+            self._insert_detail("URL", layer["url"])
         if layer.get("dataDictionary"):
-            details += f"\nData Dictionary: {layer['dataDictionary']}\n"
+            self._insert_detail("Data Dictionary", layer['dataDictionary'])
         if layer.get("landingPage"):
-            details += f"\nLanding Page: {layer['landingPage']}\n"
-        details += "\nAll Properties:\n"
-        details += json.dumps(layer.get("properties", {}), indent=2)
-        self.details_text.delete(1.0, tk.END)
-        self.details_text.insert(tk.END, details)
-        self.details_text.tag_configure("url", foreground="blue", underline=True)
-        for key in ["endpoint", "url", "dataDictionary", "landingPage"]:
-            url = layer.get(key)
-            if url and url.startswith("http"):
-                idx = self.details_text.search(url, "1.0", tk.END)
-                if idx:
-                    end = f"{idx}+{len(url)}c"
-                    self.details_text.tag_add("url", idx, end)
-                    self.details_text.tag_bind("url", "<Button-1>", lambda e, url=url: webbrowser.open(url))
+            self._insert_detail("Landing Page", layer['landingPage'])
+        description = derived_fields(layer)["description"]
+        if description:
+            if len(description) > DETAILS_DESCRIPTION_LIMIT:
+                description = (f"{description[:DETAILS_DESCRIPTION_LIMIT]}... "
+                               f"[{len(description) - DETAILS_DESCRIPTION_LIMIT:,} more characters]")
+            self.details_text.insert(tk.END, "\nDescription:\n", "heading")
+            self.details_text.insert(tk.END, description + "\n")
+        self.properties_view.show(layer.get("properties", {}))
 
     def export_selected(self):
         selected = self.tree.selection()
@@ -401,61 +955,124 @@ class DSCARestAPIExplorer:
             return
         layers = []
         for sel in selected:
-            item = self.tree.item(sel)
-            values = item["values"]
-            # If this is a group node (category), export all its children
-            if not values or not values[0]:
-                for child in self.tree.get_children(sel):
-                    child_item = self.tree.item(child)
-                    child_values = child_item["values"]
-                    if not child_values or not child_values[0]:
-                        continue
-                    layer = next((l for l in self.filtered_layers if l.get("display_name", l["name"]) == child_values[0] and l["endpoint"] == child_values[2]), None)
-                    if layer:
-                        layers.append(layer)
+            # If this is a group node (category), export all its layers
+            if sel in self.group_layers:
+                layers.extend(self.group_layers[sel])
             else:
-                layer = next((l for l in self.filtered_layers if l.get("display_name", l["name"]) == values[0] and l["endpoint"] == values[2]), None)
+                layer = self._item_layer(sel)
                 if layer:
                     layers.append(layer)
         if not layers:
             messagebox.showinfo("Export", "No layers selected.")
             return
 
-        formats = [("CSV", "*.csv"), ("Excel", "*.xlsx"), ("JSON", "*.json"), ("Text", "*.txt"), ("Word", "*.docx"), ("PDF", "*.pdf")]
+        formats = [("CSV", "*.csv"), ("Excel", "*.xlsx"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl"), ("Text", "*.txt"), ("Word", "*.docx"), ("PDF", "*.pdf"), ("Parquet", "*.parquet"), ("Feather", "*.feather"), ("GeoJSON Seq", "*.geojsons"), ("GeoPackage", "*.gpkg")]
         filetypes = formats
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=filetypes)
         if not file_path:
             return
 
-        try:
-            export_layers(layers, file_path)
-            messagebox.showinfo("Export", f"Exported {len(layers)} layers to {file_path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        self.export_jobs.submit_layers(layers, file_path)
+        self._start_export_polling()
 
     def export_changes(self):
         if not hasattr(self, "last_changes") or not self.last_changes:
             messagebox.showinfo("Export Changes", "No changes to export. Please fetch layers first.")
             return
 
-        formats = [("CSV", "*.csv"), ("Excel", "*.xlsx"), ("JSON", "*.json"), ("Text", "*.txt"), ("Word", "*.docx"), ("PDF", "*.pdf")]
+        formats = [("CSV", "*.csv"), ("Excel", "*.xlsx"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl"), ("Text", "*.txt"), ("Word", "*.docx"), ("PDF", "*.pdf"), ("Parquet", "*.parquet"), ("Feather", "*.feather")]
         filetypes = formats
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=filetypes)
         if not file_path:
             return
 
-        try:
-            from .export import export_changes as export_changes_func
-            fmt = file_path.split('.')[-1].lower()
-            export_changes_func(self.last_changes, fmt, Path(file_path))
-            messagebox.showinfo("Export Changes", f"Exported {len(self.last_changes)} changes to {file_path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        fmt = file_path.split('.')[-1].lower()
+        compact = messagebox.askyesno(
+            "Export Changes",
+            "Write a compact change log?\n\nNew and removed layers are referenced by digest "
+            "instead of including their full contents.",
+        )
+        appendix = compact and fmt == "xlsx" and messagebox.askyesno(
+            "Export Changes", "Add an appendix sheet with the full contents of new and removed layers?"
+        )
+        self.export_jobs.submit_changes(self.last_changes, fmt, Path(file_path), compact, appendix)
+        self._start_export_polling()
+
+    def cancel_exports(self):
+        if not self.export_jobs.active_jobs():
+            messagebox.showinfo("Cancel Exports", "No exports are running.")
+            return
+        self.export_jobs.cancel_all()
+
+    def _start_export_polling(self):
+        self.status_var.set("Exporting...")
+        if not self._polling_exports:
+            self._polling_exports = True
+            self.root.after(200, self._poll_export_jobs)
+
+    def _poll_export_jobs(self):
+        for job in self.export_jobs.poll():
+            if job.status == DONE:
+                messagebox.showinfo("Export", f"Exported {job.description}")
+            elif job.status == FAILED:
+                messagebox.showerror("Export Error", job.error)
+            elif job.status == CANCELLED:
+                self.status_var.set(f"Export cancelled: {job.description}")
+        active = self.export_jobs.active_jobs()
+        if not active:
+            self._polling_exports = False
+            self.progress_label.set("")
+            if self.status_var.get() == "Exporting...":
+                self.status_var.set("Ready")
+            return
+        # Show the oldest running job; the rest are queued behind it
+        job = active[0]
+        queued = f" (+{len(active) - 1} queued)" if len(active) > 1 else ""
+        self.progress.config(value=job.percent)
+        self.progress_label.set(f"Export: {job.message or 'Waiting...'}{queued}")
+        self.root.after(200, self._poll_export_jobs)
+
+    def show_diagnostics(self):
+        """Opens (or raises) the panel of event-loop lag and handler timings."""
+        if self._diagnostics is not None and self._diagnostics.winfo_exists():
+            self._diagnostics.lift()
+            return
+        self._diagnostics = DiagnosticsWindow(self.root, self.ui_monitor)
+
+    def on_close(self):
+        self.ui_monitor.stop()
+        self.export_jobs.shutdown()
+        self.root.destroy()
 
     def sort_by_column(self, col):
-        self.sort_reverse = not self.sort_reverse
-        self.filtered_layers.sort(key=lambda x: x.get(col, "").lower() if isinstance(x.get(col, ""), str) else str(x.get(col, "")), reverse=self.sort_reverse)
-        self._populate_tree()
+        """
+        Sorts by col within each group. Clicking the primary sort column again
+        reverses it; clicking another column makes it primary and keeps the
+        previous columns as tie-breakers. Expanded groups stay expanded.
+        """
+        primary, reverse = self.sort_spec[0]
+        if col == primary:
+            spec = ((col, not reverse),) + self.sort_spec[1:]
+        else:
+            spec = ((col, False),) + tuple(s for s in self.sort_spec if s[0] != col)
+        self.sort_spec = spec[:MAX_SORT_COLUMNS]
+        self._update_sort_headings()
+        expanded = [group for group, group_id in self.group_nodes.items() if self.tree.item(group_id, "open")]
+        self.apply_filters()
+        for group in expanded:
+            group_id = self.group_nodes.get(group)
+            if group_id is not None:
+                self.tree.item(group_id, open=True)
+                self._expand_group(group_id)
+
+    def _update_sort_headings(self):
+        numbered = len(self.sort_spec) > 1
+        order = {col: (i, reverse) for i, (col, reverse) in enumerate(self.sort_spec)}
+        for col, heading in self._column_headings.items():
+            if col in order:
+                i, reverse = order[col]
+                heading = f"{heading} {'▼' if reverse else '▲'}{i + 1 if numbered else ''}"
+            self.tree.heading(col, text=heading)
 
     def show_context_menu(self, event):
         rowid = self.tree.identify_row(event.y)
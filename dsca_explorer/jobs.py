@@ -0,0 +1,207 @@
+"""
+================================================================================
+DSCA Explorer Export Jobs Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added ExportJobManager, which runs export_layers / export_changes in a
+  pool of worker processes so the Tk event loop never renders or samples
+  itself.
+    - Several exports can be queued at once; they run as workers free up.
+    - Workers report row-level progress over a multiprocessing.Manager
+      queue, and poll() drains it without blocking.
+    - Each job has a Manager Event for cancellation. A queued job is
+      dropped; a running job stops at its next progress check and removes
+      its partial file. XLSX layer exports report and check once per sheet
+      part (workbook.WORKBOOK_PART_ROWS rows), not once per sheet, so a
+      single large source is cancellable too.
+    - Workers and the Manager are started with the "spawn" method, so they
+      never inherit locks held by the GUI's threads at fork time.
+    - Jobs that render in their own process pools (XLSX, PDF, DOCX) share
+      the CPUs: each gets cpu_count // max_workers processes.
+    - shutdown() cancels running jobs and waits (up to SHUTDOWN_TIMEOUT) for
+      them to stop and remove their partial files before the Manager goes
+      away, so workers never see a dead cancel event or queue.
+
+================================================================================
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+from concurrent.futures import CancelledError, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .export import ExportCancelled, export_changes, export_layers
+
+DEFAULT_EXPORT_WORKERS = 2
+# Seconds shutdown() waits for cancelled jobs to clean up.
+SHUTDOWN_TIMEOUT = 30.0
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class ExportJob:
+    job_id: int
+    description: str
+    status: str = PENDING
+    percent: int = 0
+    message: str = ""
+    error: str = ""
+    future: Any = field(default=None, repr=False)
+    cancel_event: Any = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+
+def _run_export(job_id, kind, args, events, cancel_event, processes):
+    """Worker-process entry point; progress goes back through the `events` queue."""
+    def progress_cb(percent, message):
+        events.put((job_id, percent, message))
+
+    events.put((job_id, 0, "Started"))
+    if kind == "layers":
+        export_layers(*args, progress_cb=progress_cb, cancel=cancel_event, processes=processes)
+    elif kind == "changes":
+        records, format, output_path, compact, appendix = args
+        export_changes(records, format, output_path, progress_cb=progress_cb, cancel=cancel_event,
+                       compact=compact, appendix=appendix, processes=processes)
+    else:
+        raise ValueError(f"Unknown export job kind: {kind}")
+
+
+class ExportJobManager:
+    """
+    Queues exports onto worker processes and tracks their progress.
+
+    Usage:
+        jobs = ExportJobManager()
+        job_id = jobs.submit_layers(layers, "out.xlsx")
+        ...
+        for job in jobs.poll():  # call periodically, e.g. from Tk after()
+            print(job.status, job.percent, job.message)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or DEFAULT_EXPORT_WORKERS
+        # Worker budget of each job's own process pools, so concurrent jobs do not oversubscribe
+        self.processes_per_job = max(1, (os.cpu_count() or 1) // self.max_workers)
+        self.jobs: Dict[int, ExportJob] = {}
+        self._ids = itertools.count(1)
+        self._executor = None
+        self._manager = None
+        self._events = None
+        self._changed: Dict[int, ExportJob] = {}
+
+    def _start(self):
+        # Worker processes and the Manager are only started on first use
+        if self._executor is None:
+            # Not fork: the GUI process has fetch, prefetch and monitor threads
+            # whose held locks a forked child would inherit
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._events = self._manager.Queue()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    def _submit(self, kind, args, description) -> int:
+        self._start()
+        job_id = next(self._ids)
+        cancel_event = self._manager.Event()
+        job = ExportJob(job_id, description, cancel_event=cancel_event)
+        job.future = self._executor.submit(_run_export, job_id, kind, args, self._events, cancel_event,
+                                           self.processes_per_job)
+        self.jobs[job_id] = job
+        return job_id
+
+    def submit_layers(self, layers: List[dict], file_path: str) -> int:
+        return self._submit("layers", (layers, file_path), f"{len(layers)} layers -> {file_path}")
+
+    def submit_changes(self, change_records: List[Any], format: str, output_path,
+                       compact: bool = False, appendix: bool = False) -> int:
+        return self._submit(
+            "changes", (list(change_records), format, output_path, compact, appendix),
+            f"{len(change_records)} changes -> {output_path}",
+        )
+
+    def cancel(self, job_id: int):
+        job = self.jobs.get(job_id)
+        if not job or job.finished:
+            return
+        if job.future.cancel():
+            job.status = CANCELLED
+            job.message = "Cancelled"
+            self._changed[job_id] = job
+        else:
+            job.cancel_event.set()
+
+    def cancel_all(self):
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    def active_jobs(self) -> List[ExportJob]:
+        return [j for j in self.jobs.values() if not j.finished]
+
+    def poll(self) -> List[ExportJob]:
+        """
+        Applies queued progress events and finished futures. Returns the jobs
+        whose state changed since the last poll; finished jobs are reported once.
+        """
+        changed, self._changed = self._changed, {}
+        if self._events is not None:
+            while True:
+                try:
+                    job_id, percent, message = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                job = self.jobs.get(job_id)
+                if job and not job.finished:
+                    job.status = RUNNING
+                    job.percent = percent
+                    job.message = message
+                    changed[job_id] = job
+        for job in self.active_jobs():
+            if not job.future.done():
+                continue
+            try:
+                job.future.result()
+                job.status = DONE
+                job.percent = 100
+                job.message = "Done"
+            except (ExportCancelled, CancelledError):
+                job.status = CANCELLED
+                job.message = "Cancelled"
+            except Exception as e:
+                job.status = FAILED
+                job.error = str(e)
+                job.message = "Failed"
+            changed[job.job_id] = job
+        return list(changed.values())
+
+    def shutdown(self, cancel: bool = True, timeout: float = SHUTDOWN_TIMEOUT):
+        """
+        Stops the workers. Running jobs are cancelled (unless not `cancel`)
+        and waited for, so they remove their partial files while the Manager
+        behind their cancel events and progress queue is still up.
+        """
+        if cancel:
+            self.cancel_all()
+        running = [job.future for job in self.active_jobs()]
+        if running:
+            wait(running, timeout=timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._events = None
@@ -0,0 +1,148 @@
+"""
+================================================================================
+DSCA Explorer JSON Viewer Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added JsonViewer, a collapsible tree view of a JSON value for the layer
+  details pane:
+    - Only the nodes on screen exist. A container gets its children when it
+      is expanded, JSON_PAGE_SIZE at a time; larger containers end in a
+      "load more" row. Showing a value costs one page of rows however big
+      the value is.
+    - Rows show a key and a one-line preview (scalars cut at PREVIEW_LENGTH
+      characters, containers as their size), so no value is ever serialized
+      whole for display.
+    - Links (string values starting with http:// or https://) are tagged as
+      their row is created and open in the browser on double-click.
+    - Ctrl+C copies the selected node's value as JSON.
+
+================================================================================
+"""
+
+import json
+import tkinter as tk
+import webbrowser
+from itertools import islice
+from tkinter import ttk
+
+JSON_PAGE_SIZE = 200
+PREVIEW_LENGTH = 200
+_PLACEHOLDER = "…"
+_LINK_PREFIXES = ("http://", "https://")
+
+
+def is_link(value) -> bool:
+    return isinstance(value, str) and value.startswith(_LINK_PREFIXES)
+
+def preview(value) -> str:
+    """One-line summary of a JSON value, never longer than PREVIEW_LENGTH."""
+    if isinstance(value, dict):
+        return f"{{{len(value)} keys}}"
+    if isinstance(value, list):
+        return f"[{len(value)} items]"
+    if isinstance(value, str):
+        text = value[:PREVIEW_LENGTH + 1].replace("\n", " ")
+        return json.dumps(text if len(text) <= PREVIEW_LENGTH else text[:PREVIEW_LENGTH - 1] + "…")
+    return json.dumps(value)
+
+
+class JsonViewer(ttk.Frame):
+    """
+    Lazily rendered tree of a JSON value.
+
+    Usage:
+        viewer = JsonViewer(parent)
+        viewer.show(layer["properties"])
+    """
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.tree = ttk.Treeview(self, columns=("value",), show="tree headings", selectmode="browse")
+        self.tree.heading("#0", text="Key")
+        self.tree.heading("value", text="Value")
+        self.tree.column("#0", width=220, stretch=False)
+        self.tree.column("value", width=400)
+        self.tree.tag_configure("link", foreground="blue")
+        self.tree.tag_configure("more", foreground="gray")
+        vsb = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        vsb.grid(row=0, column=1, sticky=tk.NS)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.tree.bind("<<TreeviewOpen>>", self._on_open)
+        self.tree.bind("<Double-1>", self._on_activate)
+        self.tree.bind("<Return>", self._on_activate)
+        self.tree.bind("<Control-c>", self._copy_value)
+        # Row id -> the JSON value it shows; "load more" row id -> (parent row, container, next index)
+        self._values = {}
+        self._more = {}
+        self._unloaded = set()
+
+    def show(self, value):
+        """Replaces the view with `value`'s top-level entries (or the scalar itself)."""
+        self.tree.delete(*self.tree.get_children())
+        self._values, self._more, self._unloaded = {}, {}, set()
+        if isinstance(value, (dict, list)):
+            self._render_page("", value, 0)
+        else:
+            self._insert_node("", "value", value)
+
+    def clear(self):
+        self.show({})
+
+    def _insert_node(self, parent, key, value):
+        tags = ("link",) if is_link(value) else ()
+        item = self.tree.insert(parent, tk.END, text=key, values=(preview(value),), tags=tags)
+        self._values[item] = value
+        if isinstance(value, (dict, list)) and value:
+            # A placeholder child gives the row its expand arrow
+            self.tree.insert(item, tk.END, text=_PLACEHOLDER)
+            self._unloaded.add(item)
+        return item
+
+    def _render_page(self, parent, container, start):
+        """Inserts up to JSON_PAGE_SIZE children of container from `start`, then a "load more" row if any remain."""
+        end = min(start + JSON_PAGE_SIZE, len(container))
+        if isinstance(container, dict):
+            entries = islice(container.items(), start, end)
+        else:
+            entries = ((f"[{i}]", container[i]) for i in range(start, end))
+        for key, value in entries:
+            self._insert_node(parent, str(key), value)
+        if end < len(container):
+            item = self.tree.insert(parent, tk.END, text=f"Load more ({len(container) - end:,} left)",
+                                    values=("",), tags=("more",))
+            self._more[item] = (parent, container, end)
+
+    def _on_open(self, event=None):
+        item = self.tree.focus()
+        if item not in self._unloaded:
+            return
+        self._unloaded.discard(item)
+        self.tree.delete(*self.tree.get_children(item))
+        self._render_page(item, self._values[item], 0)
+
+    def _on_activate(self, event=None):
+        item = self.tree.focus()
+        more = self._more.pop(item, None)
+        if more is not None:
+            parent, container, start = more
+            self.tree.delete(item)
+            self._render_page(parent, container, start)
+            return "break"
+        value = self._values.get(item)
+        if is_link(value):
+            webbrowser.open(value)
+            return "break"
+
+    def _copy_value(self, event=None):
+        item = self.tree.focus()
+        if item not in self._values:
+            return
+        value = self._values[item]
+        self.clipboard_clear()
+        self.clipboard_append(value if isinstance(value, str) else json.dumps(value, indent=2, ensure_ascii=False))
+        return "break"
@@ -0,0 +1,188 @@
+"""
+================================================================================
+DSCA Explorer Progress Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added ProgressBus, a thread-safe store of structured fetch progress:
+    - Fetchers publish through a ProgressReporter per source: work items
+      done/total, HTTP requests and bytes received (via a requests response
+      hook), errors, and a final message. Reporters may be called from any
+      thread, including a fetcher's own worker pool.
+    - Publishing only updates the source's state under a lock; nothing is
+      queued per event. Consumers call drain() on their own schedule (the GUI
+      does so on a fixed tick) and get one snapshot per source that changed,
+      so bursts of events cost the UI nothing extra.
+    - SourceProgress.eta() estimates the remaining time from the rate so far.
+- progress_reporter(progress_cb, source) gives fetchers one interface for
+  every kind of progress_cb: a ProgressBus, a plain (percent, message)
+  callable as before, or None.
+
+================================================================================
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class SourceProgress:
+    source: str
+    done: int = 0
+    total: int = 0
+    unit: str = ""
+    requests: int = 0
+    bytes: int = 0
+    errors: List[str] = field(default_factory=list)
+    message: str = ""
+    started: float = field(default_factory=time.monotonic)
+    updated: float = field(default_factory=time.monotonic)
+    finished: bool = False
+
+    def fraction(self) -> Optional[float]:
+        """Share of the work done (1.0 once finished), or None while the total is unknown."""
+        if self.finished:
+            return 1.0
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+    def eta(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds left at the rate so far, or None before the first item is done."""
+        if self.finished:
+            return 0.0
+        if not self.done or not self.total:
+            return None
+        elapsed = (now if now is not None else time.monotonic()) - self.started
+        return max(elapsed / self.done * (self.total - self.done), 0.0)
+
+    def copy(self) -> "SourceProgress":
+        return replace(self, errors=list(self.errors))
+
+
+class ProgressReporter:
+    """
+    Publishes one source's progress. All methods are thread-safe.
+    `callback(percent, message)` is the legacy progress_cb, called as the
+    fetchers used to call it; `on_change(reporter)` notifies a bus.
+    """
+
+    def __init__(self, source: str, callback: Optional[Callable] = None,
+                 on_change: Optional[Callable[["ProgressReporter"], None]] = None):
+        self.state = SourceProgress(source)
+        self._callback = callback
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        # For requests.get(..., hooks=reporter.hooks): counts each response and its size
+        self.hooks = {"response": self._on_response}
+
+    def _changed(self, legacy: Optional[tuple] = None):
+        self.state.updated = time.monotonic()
+        if self._on_change is not None:
+            self._on_change(self)
+        if legacy is not None and self._callback is not None:
+            self._callback(*legacy)
+
+    def __call__(self, percent: int, message: str):
+        """Legacy progress_cb signature: only the message is kept, the counts drive the percentage."""
+        with self._lock:
+            self.state.message = message
+            self._changed((percent, message))
+
+    def start(self, message: str):
+        with self._lock:
+            self.state.message = message
+            self._changed((0, message))
+
+    def set_total(self, total: int, unit: str = ""):
+        with self._lock:
+            self.state.total = total
+            self.state.unit = unit
+            self._changed()
+
+    def advance(self, n: int = 1):
+        with self._lock:
+            state = self.state
+            state.done += n
+            message = f"{state.source}: {state.done}/{state.total} {state.unit}".rstrip()
+            percent = int(state.done / state.total * 100) if state.total else 0
+            self._changed((percent, message))
+
+    def error(self, message: str):
+        with self._lock:
+            self.state.errors.append(message)
+            self._changed()
+
+    def finish(self, message: str):
+        with self._lock:
+            self.state.message = message
+            self.state.finished = True
+            self._changed((100, message))
+
+    def _on_response(self, response, *args, **kwargs):
+        size = len(response.content or b"")
+        with self._lock:
+            self.state.requests += 1
+            self.state.bytes += size
+            self._changed()
+
+    def snapshot(self) -> SourceProgress:
+        with self._lock:
+            return self.state.copy()
+
+
+class ProgressBus:
+    """
+    Collects progress from many sources for one consumer.
+
+    Usage:
+        bus = ProgressBus()
+        fetch_noaa_layers(bus)        # the fetcher publishes under "NOAA"
+        for source, state in bus.drain().items(): ...  # changed since the last drain
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reporters: Dict[str, ProgressReporter] = {}
+        self._dirty: Dict[str, ProgressReporter] = {}
+
+    def reporter(self, source: str) -> ProgressReporter:
+        """The reporter for source (one per source per bus)."""
+        with self._lock:
+            reporter = self._reporters.get(source)
+            if reporter is None:
+                reporter = self._reporters[source] = ProgressReporter(source, on_change=self._mark)
+                self._dirty[source] = reporter
+            return reporter
+
+    def _mark(self, reporter: ProgressReporter):
+        with self._lock:
+            self._dirty[reporter.state.source] = reporter
+
+    def drain(self) -> Dict[str, SourceProgress]:
+        """Snapshots of the sources that changed since the last drain."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        return {source: reporter.snapshot() for source, reporter in dirty.items()}
+
+    def snapshot(self) -> Dict[str, SourceProgress]:
+        """Snapshots of every source."""
+        with self._lock:
+            reporters = dict(self._reporters)
+        return {source: reporter.snapshot() for source, reporter in reporters.items()}
+
+
+def progress_reporter(progress_cb, source: str) -> ProgressReporter:
+    """
+    A reporter for a fetcher's progress_cb argument: the bus's reporter for
+    `source` if progress_cb is a ProgressBus, otherwise one that forwards to
+    the (percent, message) callable, if any.
+    """
+    if isinstance(progress_cb, ProgressBus):
+        return progress_cb.reporter(source)
+    if isinstance(progress_cb, ProgressReporter):
+        return progress_cb
+    return ProgressReporter(source, callback=progress_cb)
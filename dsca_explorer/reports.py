@@ -0,0 +1,276 @@
+"""
+================================================================================
+DSCA Explorer Report Rendering Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added write_report, which renders PDF and DOCX reports in chunks:
+    - Rows are bucketed by source (group_key), in any input order, and cut
+      into chunks of at most REPORT_CHUNK_ROWS rows. A source's chunks are
+      merged together, in the order the sources first appear, so each
+      source is one section with one TOC entry.
+    - Chunks render in parallel worker processes, with a bounded number in
+      flight so memory stays flat.
+    - The chunks are merged into one document, in order, with a table of
+      contents: PDF gets a TOC page with page numbers plus bookmarks (via
+      pypdf); DOCX gets a Word TOC field over the section headings.
+- PDF chunks draw each row with one text object per page instead of one
+  drawString call per 100-character slice.
+
+================================================================================
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from pypdf import PdfWriter
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+REPORT_FORMATS = ("pdf", "docx")
+REPORT_CHUNK_ROWS = 2_000
+LINE_WIDTH = 100  # characters per wrapped PDF line
+TOC_LINES_PER_PAGE = 48
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], group_key: Optional[str], chunk_rows: int) -> Iterator[Tuple[int, str, List[dict], bool]]:
+    """
+    Yields (section order, section, rows, continued). Rows are bucketed by
+    section so interleaved sections do not fragment: a bucket is yielded when
+    full, and the partial ones at the end. Each section's chunks come in row
+    order, but sections interleave; sort by section order before merging.
+    """
+    buckets: Dict[str, List[dict]] = {}  # in order of first appearance
+    started = set()
+
+    def take(key):
+        continued = key in started
+        started.add(key)
+        return order[key], key, buckets[key], continued
+
+    order = {}
+    for row in rows:
+        key = str(row.get(group_key, "") or "Other") if group_key else "Layers"
+        bucket = buckets.get(key)
+        if bucket is None:
+            order[key] = len(order)
+            bucket = buckets[key] = []
+        bucket.append(row)
+        if len(bucket) >= chunk_rows:
+            yield take(key)
+            buckets[key] = []
+    for key, bucket in buckets.items():
+        if bucket:
+            yield take(key)
+
+# --- Chunk renderers (run in worker processes) ---
+
+def _wrap(value) -> List[str]:
+    lines = []
+    for line in str(value).splitlines() or [""]:
+        lines.extend(line[i:i + LINE_WIDTH] for i in range(0, max(len(line), 1), LINE_WIDTH))
+    return lines
+
+def render_pdf_chunk(rows, output_path, section, heading_key, columns=None, continued=False) -> int:
+    """Renders one chunk as a standalone PDF; returns its page count."""
+    c = canvas.Canvas(str(output_path), pagesize=letter)
+    width, height = letter
+    y = height - 40
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(40, y, f"{section} (continued)" if continued else section)
+    y -= 30
+    for row in rows:
+        if y < 100:
+            c.showPage()
+            y = height - 40
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(40, y, str(row.get(heading_key, '')))
+        y -= 20
+        lines = []
+        for key in columns or row.keys():
+            if key != heading_key:
+                lines.extend(_wrap(row.get(key, '')))
+        # Emit the row's lines one page-sized text object at a time
+        while lines:
+            room = max(int((y - 48) // 12), 0)
+            if room == 0:
+                c.showPage()
+                y = height - 40
+                continue
+            text = c.beginText(60, y)
+            text.setFont("Helvetica", 10)
+            text.setLeading(12)
+            text.textLines(lines[:room], trim=0)
+            c.drawText(text)
+            y -= 12 * min(room, len(lines))
+            lines = lines[room:]
+        y -= 30
+    pages = c.getPageNumber()
+    c.save()
+    return pages
+
+def render_docx_chunk(rows, output_path, section, heading_key, columns=None, continued=False) -> int:
+    """Renders one chunk as a standalone DOCX; sections are level 1 headings, rows level 2."""
+    doc = Document()
+    if not continued:
+        doc.add_heading(section, level=1)
+    for row in rows:
+        doc.add_heading(str(row.get(heading_key, '')), level=2)
+        for col in columns or row.keys():
+            doc.add_paragraph(f"{col}: {row.get(col, '')}")
+    doc.save(str(output_path))
+    return 0
+
+def _render_chunk(kind, output_path, section, rows, heading_key, columns, continued) -> int:
+    render = render_pdf_chunk if kind == "pdf" else render_docx_chunk
+    return render(rows, output_path, section, heading_key, columns, continued)
+
+# --- Merging ---
+
+def _toc_pdf(title, entries: List[Tuple[str, int]], toc_pages: int) -> BytesIO:
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    width, height = letter
+    y = height - 40
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(40, y, title)
+    y -= 36
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(40, y, "Contents")
+    y -= 20
+    c.setFont("Helvetica", 10)
+    for label, page in entries:
+        if y < 40:
+            c.showPage()
+            c.setFont("Helvetica", 10)
+            y = height - 40
+        c.drawString(60, y, label[:90])
+        c.drawRightString(width - 40, y, str(page + toc_pages + 1))
+        y -= 14
+    c.save()
+    buf.seek(0)
+    return buf
+
+def _merge_pdf(chunks, output_path, title):
+    # Consecutive chunks of one section share a TOC entry and bookmark
+    entries, page = [], 0
+    for section, path, pages, continued in chunks:
+        if not continued:
+            entries.append((section, page))
+        page += pages
+    toc_pages = max(1, math.ceil((len(entries) + 5) / TOC_LINES_PER_PAGE))
+    toc = _toc_pdf(title, entries, toc_pages)
+
+    writer = PdfWriter()
+    writer.append(toc)
+    # The TOC length is estimated up front; correct it if the rendering disagrees
+    toc_pages_actual = len(writer.pages)
+    if toc_pages_actual != toc_pages:
+        writer = PdfWriter()
+        writer.append(_toc_pdf(title, entries, toc_pages_actual))
+    for _, path, _, _ in chunks:
+        writer.append(str(path))
+    for label, start in entries:
+        writer.add_outline_item(label, start + toc_pages_actual)
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+def _add_toc_field(doc):
+    paragraph = doc.add_paragraph()
+    run = paragraph.add_run()
+    begin = OxmlElement("w:fldChar")
+    begin.set(qn("w:fldCharType"), "begin")
+    instr = OxmlElement("w:instrText")
+    instr.set(qn("xml:space"), "preserve")
+    instr.text = 'TOC \\o "1-1" \\h \\z \\u'
+    separate = OxmlElement("w:fldChar")
+    separate.set(qn("w:fldCharType"), "separate")
+    placeholder = OxmlElement("w:t")
+    placeholder.text = "Right-click and choose Update Field to build the table of contents."
+    end = OxmlElement("w:fldChar")
+    end.set(qn("w:fldCharType"), "end")
+    for el in (begin, instr, separate, placeholder, end):
+        run._r.append(el)
+    # Ask Word to refresh fields (and so the TOC page numbers) when the file is opened
+    update = OxmlElement("w:updateFields")
+    update.set(qn("w:val"), "true")
+    doc.settings.element.append(update)
+
+def _merge_docx(chunks, output_path, title):
+    doc = Document()
+    doc.add_heading(title, 0)
+    doc.add_paragraph().add_run("Contents").bold = True
+    _add_toc_field(doc)
+    doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    body = doc.element.body
+    sect_pr = body.sectPr
+    for _, path, _, _ in chunks:
+        for el in list(Document(str(path)).element.body):
+            if el.tag == qn("w:sectPr"):
+                continue
+            sect_pr.addprevious(el)
+    doc.save(str(output_path))
+
+def write_report(
+    rows: Iterable[Dict[str, Any]],
+    output_path,
+    kind: str,
+    title: str,
+    heading_key: str,
+    columns: List[str] = None,
+    group_key: Optional[str] = None,
+    chunk_rows: int = REPORT_CHUNK_ROWS,
+    processes: Optional[int] = None,
+):
+    """
+    Renders rows as a PDF or DOCX report. Chunks are rendered in parallel
+    worker processes (processes defaults to the CPU count; 1 renders inline)
+    and merged with a table of contents over the `group_key` sections.
+    """
+    if kind not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {kind}")
+    output_path = Path(output_path)
+    workers = processes or os.cpu_count() or 1
+    tmpdir = tempfile.mkdtemp(prefix=f".{output_path.name}.", dir=str(output_path.parent.resolve()))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    chunks = []
+    pending = deque()
+    try:
+        for idx, (order, section, chunk, continued) in enumerate(_chunks(rows, group_key, chunk_rows)):
+            path = Path(tmpdir) / f"{idx:06d}.{kind}"
+            args = (kind, path, section, chunk, heading_key, columns, continued)
+            if executor is None:
+                chunks.append((order, section, path, _render_chunk(*args), continued))
+                continue
+            pending.append((order, section, path, continued, executor.submit(_render_chunk, *args)))
+            # Keep a bounded number of chunks in flight so rows are not all held at once
+            while len(pending) > workers * 2:
+                order_, section_, path_, continued_, future = pending.popleft()
+                chunks.append((order_, section_, path_, future.result(), continued_))
+        while pending:
+            order_, section_, path_, continued_, future = pending.popleft()
+            chunks.append((order_, section_, path_, future.result(), continued_))
+        # One contiguous run of chunks per section (the sort is stable, so chunks keep row order)
+        chunks.sort(key=lambda c: c[0])
+        chunks = [c[1:] for c in chunks]
+
+        if kind == "pdf":
+            _merge_pdf(chunks, output_path, title)
+        else:
+            _merge_docx(chunks, output_path, title)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(tmpdir, ignore_errors=True)
@@ -0,0 +1,189 @@
+"""
+================================================================================
+DSCA Explorer Search Index Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added SearchIndex, an in-memory inverted index built once per fetch:
+    - Layers are tokenized over name, description (the derived plain text),
+      series and property field names. Postings (layer ids, i.e. positions
+      in the indexed list) are stored in one flat numpy array with per-token
+      offsets, so a term's matches are gathered in a single vectorized step.
+    - Query terms of three or more characters match any token containing
+      them; candidate tokens come from a trigram index over the vocabulary,
+      so matching never scans the layers themselves. Shorter terms match
+      token prefixes, which are one contiguous slice of the sorted
+      vocabulary and of the postings.
+    - A query matches layers that match every term. Per-term results are
+      boolean masks, combined with &, and cached, so unchanged terms cost
+      nothing on the next keystroke. A term that extends a cached term only
+      re-checks that term's matched tokens.
+    - Terms of FUZZY_MIN_LENGTH or more characters with no substring match
+      fall back to close matches (difflib ratio >= FUZZY_CUTOFF) among
+      tokens sharing trigrams with the term.
+
+================================================================================
+"""
+
+import difflib
+import re
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .derived import derived_fields
+
+_TOKEN = re.compile(r"\w+")
+FUZZY_MIN_LENGTH = 4
+FUZZY_CUTOFF = 0.8
+FUZZY_CANDIDATES = 200
+# Per-term masks kept between queries.
+TERM_CACHE_SIZE = 64
+
+
+def tokenize(text) -> List[str]:
+    return _TOKEN.findall(str(text).lower()) if text else []
+
+def _trigrams(token: str):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+def layer_tokens(layer: dict) -> set:
+    """Searchable tokens of a layer: name, description, series and property field names."""
+    tokens = set(tokenize(layer.get("name", "")))
+    tokens.update(tokenize(derived_fields(layer)["description"]))
+    tokens.update(tokenize(layer.get("series", "")))
+    properties = layer.get("properties")
+    if isinstance(properties, dict):
+        for field in properties:
+            tokens.update(tokenize(field))
+    return tokens
+
+
+class _TermMatch:
+    __slots__ = ("tokens", "mask")
+
+    def __init__(self, tokens: List[int], mask: np.ndarray):
+        self.tokens = tokens
+        self.mask = mask
+
+
+class SearchIndex:
+    """
+    Inverted token index over a list of layers.
+
+    Usage:
+        index = SearchIndex(layers)
+        ids = index.search("flood zon")  # sorted layer positions, or None for an empty query
+    """
+
+    def __init__(self, layers: List[dict]):
+        self.layers = layers
+        postings: Dict[str, List[int]] = {}
+        for layer_id, layer in enumerate(layers):
+            for token in layer_tokens(layer):
+                postings.setdefault(token, []).append(layer_id)
+        self.vocabulary: List[str] = sorted(postings)
+        lengths = np.fromiter((len(postings[t]) for t in self.vocabulary), dtype=np.int64, count=len(self.vocabulary))
+        self.offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.postings = np.fromiter(
+            (i for t in self.vocabulary for i in postings[t]), dtype=np.uint32, count=int(self.offsets[-1])
+        )
+        del postings
+        trigrams: Dict[str, List[int]] = {}
+        for token_id, token in enumerate(self.vocabulary):
+            for gram in _trigrams(token):
+                trigrams.setdefault(gram, []).append(token_id)
+        self.trigrams = {gram: np.asarray(ids, dtype=np.uint32) for gram, ids in trigrams.items()}
+        self._terms: "OrderedDict[str, _TermMatch]" = OrderedDict()
+
+    def __len__(self):
+        return len(self.layers)
+
+    def _candidate_tokens(self, term: str) -> List[int]:
+        """Ids of vocabulary tokens containing term, reusing a cached shorter prefix when possible."""
+        # Terms under three characters are prefix matches, so only longer ones can be narrowed
+        for n in range(len(term) - 1, 2, -1):
+            prior = self._terms.get(term[:n])
+            if prior is not None:
+                return [t for t in prior.tokens if term in self.vocabulary[t]]
+        grams = sorted(_trigrams(term), key=lambda g: len(self.trigrams.get(g, ())))
+        if any(g not in self.trigrams for g in grams):
+            return []
+        candidates = self.trigrams[grams[0]]
+        for gram in grams[1:]:
+            candidates = np.intersect1d(candidates, self.trigrams[gram], assume_unique=True)
+            if not len(candidates):
+                return []
+        return [int(t) for t in candidates if term in self.vocabulary[t]]
+
+    def _fuzzy_tokens(self, term: str) -> List[int]:
+        shared = Counter()
+        for gram in _trigrams(term):
+            for t in self.trigrams.get(gram, ()):
+                shared[int(t)] += 1
+        candidates = [t for t, _ in shared.most_common(FUZZY_CANDIDATES)]
+        matcher = difflib.SequenceMatcher(b=term)
+        close = []
+        for t in candidates:
+            matcher.set_seq1(self.vocabulary[t])
+            if matcher.ratio() >= FUZZY_CUTOFF:
+                close.append(t)
+        return close
+
+    def _gather(self, tokens: List[int]) -> np.ndarray:
+        """Concatenated postings of the given token ids."""
+        if not tokens:
+            return np.empty(0, dtype=np.uint32)
+        ids = np.asarray(tokens, dtype=np.int64)
+        starts = self.offsets[ids]
+        lengths = self.offsets[ids + 1] - starts
+        # Position k of the output reads postings[starts[j] + (k - first output index of token j)]
+        shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return self.postings[shifts + np.arange(int(lengths.sum()), dtype=np.int64)]
+
+    def _match_term(self, term: str) -> _TermMatch:
+        match = self._terms.get(term)
+        if match is not None:
+            self._terms.move_to_end(term)
+            return match
+        mask = np.zeros(len(self.layers), dtype=bool)
+        if len(term) < 3:
+            lo = bisect_left(self.vocabulary, term)
+            hi = bisect_left(self.vocabulary, term + "\uffff", lo)
+            tokens = list(range(lo, hi))
+            mask[self.postings[self.offsets[lo]:self.offsets[hi]]] = True
+        else:
+            tokens = self._candidate_tokens(term)
+            if not tokens and len(term) >= FUZZY_MIN_LENGTH:
+                tokens = self._fuzzy_tokens(term)
+            mask[self._gather(tokens)] = True
+        match = self._terms[term] = _TermMatch(tokens, mask)
+        if len(self._terms) > TERM_CACHE_SIZE:
+            self._terms.popitem(last=False)
+        return match
+
+    def search_mask(self, query: str) -> Optional[np.ndarray]:
+        """Boolean mask over the layers matching every query term, or None for an empty query."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return None
+        mask = self._match_term(terms[0]).mask
+        for term in terms[1:]:
+            mask = mask & self._match_term(term).mask
+        return mask
+
+    def search(self, query: str) -> Optional[np.ndarray]:
+        """Sorted ids of the layers matching every query term, or None for an empty query."""
+        mask = self.search_mask(query)
+        return None if mask is None else np.flatnonzero(mask)
+
+    def matching(self, query: str) -> List[dict]:
+        """Layers matching query (all layers for an empty query)."""
+        found = self.search(query)
+        if found is None:
+            return list(self.layers)
+        return [self.layers[i] for i in found]
@@ -0,0 +1,95 @@
+"""
+================================================================================
+DSCA Explorer Sorting Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added SortIndex, built once per fetch next to the search and facet
+  indexes:
+    - Each sortable column's value is normalized once per layer (lowercased
+      text) and replaced by its rank among the column's distinct values, so
+      sorting compares integers and never re-normalizes strings.
+    - A sort is a list of (column, reverse) pairs, primary first. Its
+      permutation of all layers is computed once with a stable lexsort and
+      cached; the sorted subset for any filter is that permutation with the
+      filtered-out positions dropped, so filter changes do not sort at all.
+    - key() gives the rank tuple of one layer, for inserting rows into an
+      already sorted list.
+
+================================================================================
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SORT_COLUMNS = ("name", "type", "endpoint", "formats")
+DEFAULT_SORT = (("name", False),)
+# Sorts (column lists) whose permutations are kept.
+PERMUTATION_CACHE_SIZE = 8
+
+SortSpec = Tuple[Tuple[str, bool], ...]
+
+
+def sort_value(layer: dict, column: str) -> str:
+    """A layer's normalized value for sorting by column."""
+    value = layer.get(column, "")
+    return value.lower() if isinstance(value, str) else str(value)
+
+def sort_values(layer: dict, spec: SortSpec) -> Tuple[str, ...]:
+    return tuple(sort_value(layer, column) for column, _ in spec)
+
+def _ranks(values: List[str]) -> np.ndarray:
+    lookup = {value: rank for rank, value in enumerate(sorted(set(values)))}
+    return np.fromiter((lookup[v] for v in values), dtype=np.int64, count=len(values))
+
+
+class SortIndex:
+    """
+    Per-column ranks of a list of layers.
+
+    Usage:
+        index = SortIndex(layers)
+        ids = index.sorted_ids((("type", False), ("name", True)), mask)  # positions, sorted
+    """
+
+    def __init__(self, layers: List[dict], columns: Iterable[str] = SORT_COLUMNS):
+        self.layers = layers
+        self.ranks: Dict[str, np.ndarray] = {
+            column: _ranks([sort_value(layer, column) for layer in layers]) for column in columns
+        }
+        self._permutations: "OrderedDict[SortSpec, np.ndarray]" = OrderedDict()
+
+    def __len__(self):
+        return len(self.layers)
+
+    def _lex_keys(self, spec: SortSpec, ids: Optional[np.ndarray] = None) -> List[np.ndarray]:
+        # np.lexsort sorts by the last key first
+        keys = []
+        for column, reverse in reversed(spec):
+            ranks = self.ranks[column] if ids is None else self.ranks[column][ids]
+            keys.append(-ranks if reverse else ranks)
+        return keys
+
+    def permutation(self, spec: SortSpec) -> np.ndarray:
+        """Positions of all layers in `spec` order (stable: ties keep list order)."""
+        spec = tuple(spec)
+        perm = self._permutations.get(spec)
+        if perm is not None:
+            self._permutations.move_to_end(spec)
+            return perm
+        perm = self._permutations[spec] = np.lexsort(self._lex_keys(spec)) if len(self.layers) else np.empty(0, dtype=np.int64)
+        if len(self._permutations) > PERMUTATION_CACHE_SIZE:
+            self._permutations.popitem(last=False)
+        return perm
+
+    def sorted_ids(self, spec: SortSpec, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Positions of the layers in mask (all if None), in `spec` order."""
+        perm = self.permutation(spec)
+        return perm if mask is None else perm[mask[perm]]
+
+    def key(self, position: int, spec: Sequence[Tuple[str, bool]]) -> Tuple[int, ...]:
+        """Sort key of the layer at position; keys of one index compare like the layers sort."""
+        return tuple(-int(self.ranks[c][position]) if r else int(self.ranks[c][position]) for c, r in spec)
@@ -0,0 +1,158 @@
+"""
+================================================================================
+DSCA Explorer Storage Helpers - Change Log
+================================================================================
+
+NEW:
+----
+- Added FileLock, an advisory inter-process lock (fcntl on POSIX, msvcrt on
+  Windows) with a timeout, so several fetch workers on one host can share
+  the same cache files.
+- Added atomic_write, which writes to a temp file in the target directory,
+  fsyncs it and renames it over the target. Readers only ever see the old
+  or the new file, never a half-written one. The new file keeps the
+  target's permissions (or gets the umask default for a new file) rather
+  than the owner-only mode of temp files. An optional check(temp path) runs
+  before the rename and can veto it by raising.
+
+================================================================================
+"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_LOCK_TIMEOUT = 30.0
+
+# The umask can only be read by setting it; do that once, before any threads.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a FileLock cannot be acquired within its timeout."""
+
+
+# Advisory locks are held per open file, so a second FileLock on the same path
+# from the same process would block on itself. Track holders to make it re-entrant.
+_held_locks = {}
+_held_locks_guard = threading.RLock()
+
+
+class FileLock:
+    """
+    Advisory lock on `<path>.lock`, re-entrant within a process.
+
+    Usage:
+        with FileLock(CACHE_FILE, timeout=10):
+            ...
+    """
+
+    def __init__(self, path, timeout=DEFAULT_LOCK_TIMEOUT, poll_interval=0.05):
+        self.lock_path = Path(str(path) + ".lock").resolve()
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def _try_lock(self, fd):
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(self, fd):
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def acquire(self):
+        key = str(self.lock_path)
+        with _held_locks_guard:
+            held = _held_locks.get(key)
+            if held and held["owner"] == threading.get_ident():
+                held["count"] += 1
+                return
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with _held_locks_guard:
+                if key not in _held_locks:
+                    self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                    fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+                    if self._try_lock(fd):
+                        _held_locks[key] = {"fd": fd, "owner": threading.get_ident(), "count": 1}
+                        return
+                    os.close(fd)
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Timed out after {self.timeout}s waiting for {key}")
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        key = str(self.lock_path)
+        with _held_locks_guard:
+            held = _held_locks.get(key)
+            if not held:
+                return
+            held["count"] -= 1
+            if held["count"] == 0:
+                del _held_locks[key]
+                try:
+                    self._unlock(held["fd"])
+                finally:
+                    os.close(held["fd"])
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _file_mode(path: Path) -> int:
+    """Permissions for a rewrite of path: the current file's, or what open() would give a new file."""
+    try:
+        return path.stat().st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+@contextmanager
+def atomic_write(path, mode="wb", encoding=None, check=None):
+    """
+    Yields a file object for a temp file next to `path`; on success the temp
+    file is flushed, fsynced and renamed over `path` with path's permissions
+    (mkstemp creates it owner-only). On error, including an exception from
+    `check(temp_path)` (called after the file is closed, before the rename),
+    it is removed and `path` is left as it was.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if check is not None:
+            check(Path(tmp_name))
+        os.chmod(tmp_name, _file_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
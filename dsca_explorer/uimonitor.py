@@ -0,0 +1,189 @@
+"""
+================================================================================
+DSCA Explorer UI Monitor Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added UIMonitor, which measures how responsive the Tk UI is:
+    - Event-loop lag: a heartbeat is scheduled with after() every
+      HEARTBEAT_MS; how late each beat runs is how long the loop was busy.
+    - Handler timing: instrument(obj, names) wraps methods so every call's
+      wall time is recorded under the method name. Wrapping the instance
+      attribute catches calls from bindings, lambdas and other methods alike.
+    - Each metric keeps its last WINDOW_SIZE samples for p50/p95/p99/max.
+    - Every LOG_INTERVAL_S a summary of the samples since the last one is
+      appended as a JSON line to dsca_ui_metrics.jsonl, which is rotated to
+      dsca_ui_metrics.jsonl.1 once it passes LOG_MAX_BYTES.
+- Added DiagnosticsWindow, a panel listing the live metrics, refreshed once
+  a second while open.
+
+================================================================================
+"""
+
+import functools
+import json
+import math
+import time
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from tkinter import ttk
+from typing import Dict, Iterable, List, Optional
+
+UI_METRICS_FILE = Path("dsca_ui_metrics.jsonl")
+HEARTBEAT_MS = 100
+WINDOW_SIZE = 1000
+LOG_INTERVAL_S = 60
+LOG_MAX_BYTES = 1_000_000
+# Samples at least this long count as stalls.
+SLOW_MS = 100
+PANEL_REFRESH_MS = 1000
+EVENT_LOOP = "event loop lag"
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """q-th percentile (0-100) of an ascending list, nearest rank."""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(q / 100 * len(ordered)) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+def summarize(samples: Iterable[float]) -> dict:
+    """Count, percentiles, max and stalls of samples in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50": round(percentile(ordered, 50), 2),
+        "p95": round(percentile(ordered, 95), 2),
+        "p99": round(percentile(ordered, 99), 2),
+        "max": round(ordered[-1], 2) if ordered else 0.0,
+        "slow": sum(1 for s in ordered if s >= SLOW_MS),
+    }
+
+
+class UIMonitor:
+    """
+    Event-loop lag and handler timings of one Tk application.
+
+    Usage:
+        monitor = UIMonitor(root)
+        monitor.instrument(app, ["apply_filters", "show_layer_details"])
+        monitor.start()
+        monitor.summary()  # {metric: {"count", "p50", "p95", "p99", "max", "slow"}}
+    """
+
+    def __init__(self, root, log_path: Optional[Path] = None, heartbeat_ms: int = HEARTBEAT_MS):
+        self.root = root
+        self.log_path = Path(log_path or UI_METRICS_FILE)
+        self.heartbeat_ms = heartbeat_ms
+        # Metric -> last WINDOW_SIZE samples (ms), and samples since the last log line
+        self.samples: Dict[str, deque] = {}
+        self._unlogged: Dict[str, List[float]] = {}
+        self._expected = None
+        self._after = None
+        self._logged_at = time.monotonic()
+
+    def record(self, name: str, ms: float):
+        window = self.samples.get(name)
+        if window is None:
+            window = self.samples[name] = deque(maxlen=WINDOW_SIZE)
+        window.append(ms)
+        self._unlogged.setdefault(name, []).append(ms)
+
+    def timed(self, name: str, func):
+        """func wrapped to record each call's duration under name."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+
+    def instrument(self, obj, names: Iterable[str]):
+        """Replaces obj's methods `names` by timed wrappers; call it before the methods are bound to widgets."""
+        for name in names:
+            setattr(obj, name, self.timed(name, getattr(obj, name)))
+
+    def start(self):
+        self._expected = time.perf_counter() + self.heartbeat_ms / 1000
+        self._after = self.root.after(self.heartbeat_ms, self._beat)
+
+    def stop(self):
+        """Stops the heartbeat and logs what has not been logged yet."""
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+        self.flush()
+
+    def _beat(self):
+        now = time.perf_counter()
+        self.record(EVENT_LOOP, max(now - self._expected, 0.0) * 1000)
+        if time.monotonic() - self._logged_at >= LOG_INTERVAL_S:
+            self.flush()
+        self._expected = now + self.heartbeat_ms / 1000
+        self._after = self.root.after(self.heartbeat_ms, self._beat)
+
+    def summary(self) -> Dict[str, dict]:
+        """Statistics of each metric's rolling window."""
+        return {name: summarize(window) for name, window in self.samples.items()}
+
+    def flush(self):
+        """Appends one log line summarizing the samples since the last one."""
+        self._logged_at = time.monotonic()
+        unlogged, self._unlogged = self._unlogged, {}
+        if not unlogged:
+            return
+        entry = {"time": datetime.utcnow().isoformat(timespec="seconds"),
+                 "metrics": {name: summarize(samples) for name, samples in unlogged.items()}}
+        try:
+            if self.log_path.exists() and self.log_path.stat().st_size >= LOG_MAX_BYTES:
+                self.log_path.replace(self.log_path.with_name(self.log_path.name + ".1"))
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Warning: could not write UI metrics: {e}")
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Live table of a UIMonitor's metrics."""
+
+    COLUMNS = ("count", "p50", "p95", "p99", "max", "slow")
+    HEADINGS = ("Count", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)", f"≥{SLOW_MS} ms")
+
+    def __init__(self, parent, monitor: UIMonitor):
+        super().__init__(parent)
+        self.title("UI Diagnostics")
+        self.geometry("720x300")
+        self.monitor = monitor
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="tree headings")
+        self.tree.heading("#0", text="Metric")
+        self.tree.column("#0", width=220)
+        for col, heading in zip(self.COLUMNS, self.HEADINGS):
+            self.tree.heading(col, text=heading)
+            self.tree.column(col, width=80, anchor=tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        ttk.Label(self, text=f"Last {WINDOW_SIZE} samples per metric; logged to {monitor.log_path}",
+                  font=("Arial", 9)).pack(anchor=tk.W, padx=5, pady=(0, 5))
+        self._rows = {}
+        self._after = None
+        self._refresh()
+
+    def _refresh(self):
+        for name, stats in sorted(self.monitor.summary().items()):
+            values = tuple(stats[col] for col in self.COLUMNS)
+            item = self._rows.get(name)
+            if item is None:
+                self._rows[name] = self.tree.insert("", tk.END, text=name, values=values)
+            else:
+                self.tree.item(item, values=values)
+        self._after = self.after(PANEL_REFRESH_MS, self._refresh)
+
+    def destroy(self):
+        if self._after is not None:
+            self.after_cancel(self._after)
+            self._after = None
+        super().destroy()
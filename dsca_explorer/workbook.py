@@ -0,0 +1,262 @@
+"""
+================================================================================
+DSCA Explorer Workbook Module - Change Log
+================================================================================
+
+NEW:
+----
+- Added write_workbook, a streaming XLSX writer for partitioned exports:
+    - Each task becomes one sheet. Sheets are built in parallel worker
+      processes, each streaming its rows straight into the sheet's XML
+      (inline strings, no shared-string table), so memory stays flat and no
+      workbook object is held in memory.
+    - The main process packages the finished sheets into one workbook, in
+      task order, with a bold, frozen header row on every sheet.
+- Added sheet_titles, which makes names valid and unique Excel sheet titles,
+  and truncate_cell, which caps text at Excel's cell limit (also used by
+  export.py's openpyxl writers).
+- XLSX_MAX_ROWS is Excel's row limit; callers split partitions at
+  XLSX_MAX_ROWS - 1 data rows per sheet.
+- Sheets are built in parts (row chunks of a known size, at most
+  WORKBOOK_PART_ROWS by convention) rather than whole: each part is one
+  worker task that writes its rows' XML, and the parts are joined when the
+  workbook is packaged. One large sheet is thereby built in parallel, and
+  on_part reports progress (and can stop the export) as every part finishes
+  instead of once per sheet.
+
+================================================================================
+"""
+
+import math
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+XLSX_MAX_ROWS = 1_048_576
+# Rows per sheet part: the unit of parallel work, progress and cancellation.
+WORKBOOK_PART_ROWS = 5_000
+SHEET_TITLE_LENGTH = 31
+# Excel refuses to open workbooks with longer cell text
+XLSX_CELL_LIMIT = 32_767
+_TRUNCATED = "... [truncated]"
+# XML 1.0 cannot carry these control characters at all
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_BAD_TITLE = re.compile(r"[\[\]:*?/\\]")
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Style 0 is the default; style 1 is the bold header
+_STYLES = (
+    f'{_XML_DECL}<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def column_letter(idx: int) -> str:
+    """0-based column index -> Excel column letters (0 -> A, 26 -> AA)."""
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def sheet_titles(names: Iterable[str]) -> List[str]:
+    """Valid, unique (case-insensitively) sheet titles for names, in order."""
+    titles, seen = [], set()
+    for name in names:
+        base = _BAD_TITLE.sub("_", str(name)).strip("'") or "Sheet"
+        title = base[:SHEET_TITLE_LENGTH]
+        n = 2
+        while title.lower() in seen:
+            suffix = f" ({n})"
+            title = base[:SHEET_TITLE_LENGTH - len(suffix)] + suffix
+            n += 1
+        seen.add(title.lower())
+        titles.append(title)
+    return titles
+
+def truncate_cell(text: str) -> str:
+    """Cuts text to XLSX_CELL_LIMIT characters, marking the cut."""
+    if len(text) > XLSX_CELL_LIMIT:
+        return text[:XLSX_CELL_LIMIT - len(_TRUNCATED)] + _TRUNCATED
+    return text
+
+# --- Sheet XML (built in worker processes) ---
+
+def _cell_xml(ref: str, value, style: str = "") -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return f'<c r="{ref}"{style}><v>{value!r}</v></c>'
+    text = truncate_cell(_ILLEGAL_XML.sub("", str(value)))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+_SHEET_END = "</sheetData></worksheet>"
+
+def _sheet_start(columns: List[str]) -> str:
+    header = "".join(_cell_xml(f"{column_letter(i)}1", col, ' s="1"') for i, col in enumerate(columns))
+    return (f'{_XML_DECL}<worksheet xmlns="{_MAIN_NS}"><sheetViews><sheetView workbookViewId="0">'
+            '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+            f'</sheetView></sheetViews><sheetData><row r="1">{header}</row>')
+
+def _write_rows(f, rows: Iterable[Dict[str, Any]], columns: List[str], first_row: int) -> int:
+    """Writes rows as <row> elements numbered from first_row; returns how many."""
+    letters = [column_letter(i) for i in range(len(columns))]
+    count = 0
+    for count, row in enumerate(rows, 1):
+        r = first_row + count - 1
+        if r > XLSX_MAX_ROWS:
+            raise ValueError(f"Sheet exceeds Excel's {XLSX_MAX_ROWS} row limit")
+        f.write(f'<row r="{r}">')
+        f.write("".join(_cell_xml(f"{l}{r}", row.get(col)) for l, col in zip(letters, columns)))
+        f.write("</row>")
+    return count
+
+def write_sheet(rows: Iterable[Dict[str, Any]], columns: List[str], path) -> int:
+    """Streams a header and `rows` into a worksheet XML part; returns the data row count."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_sheet_start(columns))
+        count = _write_rows(f, rows, columns, 2)
+        f.write(_SHEET_END)
+    return count
+
+def _build_part(row_fn: Callable, args: tuple, expected: int, columns: List[str], first_row: int, path) -> int:
+    """Writes one sheet part's rows (no header) to path; returns the row count."""
+    with open(path, "w", encoding="utf-8") as f:
+        count = _write_rows(f, row_fn(*args), columns, first_row)
+    if count != expected:
+        raise ValueError(f"Sheet part yielded {count} rows, expected {expected}")
+    return count
+
+# --- Packaging ---
+
+def _package(sheets: List[Tuple[str, List[Path]]], columns: List[str], output_path):
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(sheets) + 1)
+    )
+    content_types = (
+        f'{_XML_DECL}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        f'{overrides}</Types>'
+    )
+    root_rels = (
+        f'{_XML_DECL}<Relationships xmlns="{_PKG_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    )
+    sheet_entries = "".join(
+        f'<sheet name={quoteattr(title)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, (title, _) in enumerate(sheets, 1)
+    )
+    workbook = (
+        f'{_XML_DECL}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+        f'<sheets>{sheet_entries}</sheets></workbook>'
+    )
+    workbook_rels = (
+        f'{_XML_DECL}<Relationships xmlns="{_PKG_REL_NS}">'
+        + "".join(
+            f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(sheets) + 1)
+        )
+        + f'<Relationship Id="rId{len(sheets) + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    # Level 1 deflate: sheet XML is repetitive, and this step runs in one process
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", root_rels)
+        zf.writestr("xl/workbook.xml", workbook)
+        zf.writestr("xl/_rels/workbook.xml.rels", workbook_rels)
+        zf.writestr("xl/styles.xml", _STYLES)
+        start = _sheet_start(columns).encode("utf-8")
+        for i, (_, parts) in enumerate(sheets, 1):
+            with zf.open(f"xl/worksheets/sheet{i}.xml", "w") as dst:
+                dst.write(start)
+                for path in parts:
+                    with open(path, "rb") as src:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                dst.write(_SHEET_END.encode("utf-8"))
+
+def write_workbook(
+    tasks: Iterable[Tuple[str, Callable, List[Tuple[tuple, int]]]],
+    output_path,
+    columns: List[str],
+    processes: Optional[int] = None,
+    on_part: Optional[Callable[[int], None]] = None,
+):
+    """
+    Writes one sheet per (name, row_fn, parts) task. Each part is an
+    (args, rows) pair: row_fn(*args) yields exactly `rows` row dicts, in a
+    worker process (row_fn must be a module-level function), and the sheet's
+    parts follow each other in order. Keep parts to about WORKBOOK_PART_ROWS
+    rows. processes defaults to the CPU count; 1 builds parts inline.
+    on_part(rows) is called in the main process as each part finishes, in
+    completion order; an exception it raises stops the export.
+    """
+    tasks = [(name, row_fn, list(parts)) for name, row_fn, parts in tasks]
+    if not tasks:
+        tasks = [("Sheet1", iter, [])]
+    for name, _, parts in tasks:
+        if sum(rows for _, rows in parts) >= XLSX_MAX_ROWS:
+            raise ValueError(f"Sheet {name!r} exceeds Excel's {XLSX_MAX_ROWS} row limit")
+    titles = sheet_titles(name for name, _, _ in tasks)
+    output_path = Path(output_path)
+    work = []
+    sheets = []
+    tmpdir = tempfile.mkdtemp(prefix=f".{output_path.name}.", dir=str(output_path.parent.resolve()))
+    for idx, ((_, row_fn, parts), title) in enumerate(zip(tasks, titles), 1):
+        paths = []
+        first_row = 2
+        for part_no, (args, rows) in enumerate(parts):
+            path = Path(tmpdir) / f"sheet{idx}.{part_no}.xml"
+            paths.append(path)
+            work.append((row_fn, args, rows, columns, first_row, path))
+            first_row += rows
+        sheets.append((title, paths))
+    workers = min(processes or os.cpu_count() or 1, len(work))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if executor is None:
+            for item in work:
+                rows = _build_part(*item)
+                if on_part:
+                    on_part(rows)
+        else:
+            for future in as_completed([executor.submit(_build_part, *item) for item in work]):
+                rows = future.result()
+                if on_part:
+                    on_part(rows)
+        _package(sheets, columns, output_path)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(tmpdir, ignore_errors=True)